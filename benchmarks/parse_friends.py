@@ -0,0 +1,96 @@
+"""
+对比好友列表两种解析方式的耗时
+
+- sdk: `vrchatapi` 反序列化为模型对象 -> `.to_dict()` -> pydantic 校验（旧方式）
+- raw: pydantic 直接校验响应体 JSON（`_preload_content=False`）
+
+用法: python benchmarks/parse_friends.py [好友数量] [重复次数]
+"""
+
+import json
+import sys
+import timeit
+
+import nonebot
+
+nonebot.init(driver="~none")
+
+from vrchatapi import ApiClient  # noqa: E402
+
+from nonebot_plugin_vrchat.vrchat import (  # noqa: E402
+    LimitedUserModel,
+    parse_raw_models,
+)
+
+
+class FakeResponse:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+    def getheader(self, name: str, default=None):
+        return "application/json; charset=utf-8" if name == "content-type" else default
+
+
+def make_friend(i: int) -> dict:
+    return {
+        "id": f"usr_{i:08x}-0000-0000-0000-000000000000",
+        "displayName": f"Friend {i}",
+        "bio": "hello " * 20,
+        "bioLinks": [],
+        "currentAvatarImageUrl": f"https://api.vrchat.cloud/api/1/file/file_{i}/1/file",
+        "currentAvatarThumbnailImageUrl": (
+            f"https://api.vrchat.cloud/api/1/image/file_{i}/1/256"
+        ),
+        "currentAvatarTags": [],
+        "developerType": "none",
+        "friendKey": f"key{i}",
+        "isFriend": True,
+        "imageUrl": "",
+        "last_platform": "standalonewindows",
+        "location": f"wrld_{i}:{i}~region(jp)" if i % 3 else "offline",
+        "last_login": "2024-01-01T00:00:00.000Z",
+        "last_activity": "2024-01-01T00:00:00.000Z",
+        "last_mobile": None,
+        "platform": "standalonewindows",
+        "profilePicOverride": "",
+        "profilePicOverrideThumbnail": "",
+        "status": "active",
+        "statusDescription": "status",
+        "tags": [
+            "system_trust_basic",
+            "system_trust_known",
+            "language_zho",
+            "show_social_rank",
+        ],
+        "userIcon": "",
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    number = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    payload = json.dumps([make_friend(i) for i in range(count)]).encode()
+    client = ApiClient()
+
+    def sdk():
+        resp = FakeResponse(payload.decode())
+        objs = client.deserialize(resp, "list[LimitedUserFriend]")
+        return [LimitedUserModel(**x.to_dict()) for x in objs]
+
+    def raw():
+        return parse_raw_models(LimitedUserModel, FakeResponse(payload))
+
+    assert [x.user_id for x in sdk()] == [x.user_id for x in raw()]
+
+    print(f"{count} friends, {len(payload) / 1024:.1f} KiB, best of 5 x {number}")
+    results = {}
+    for name, func in (("sdk", sdk), ("raw", raw)):
+        best = min(timeit.repeat(func, number=number, repeat=5)) / number
+        results[name] = best
+        print(f"{name}: {best * 1000:.2f} ms / page")
+    print(f"raw is {results['sdk'] / results['raw']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
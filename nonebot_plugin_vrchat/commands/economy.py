@@ -1,4 +1,6 @@
+import asyncio
 import time
+from typing import List
 
 from loguru import logger
 from nonebot import on_command
@@ -12,6 +14,7 @@ from ..vrchat import (
     get_current_subscriptions,
     get_current_user_id,
     get_economy_account,
+    get_economy_dashboard,
     get_subscriptions,
     get_tilia_status,
 )
@@ -21,6 +24,24 @@ from .utils import (
     rule_enable,
 )
 
+
+def format_earnings(earnings: dict) -> str:
+    if earnings.get("no_transactions") is None:
+        return Lang.nbp_vrc.economy.no_earnings_info()
+    return Lang.nbp_vrc.economy.earnings_info(
+        balance=earnings.get("balance", 0),
+        no_transactions=earnings.get("no_transactions"),
+        tilia_response=earnings.get("tilia_response"),
+    )
+
+
+def format_tilia_status(status: dict) -> str:
+    return Lang.nbp_vrc.economy.tilia_status_info(
+        online=status.get("economy_online"),
+        state=status.get("economy_state"),
+    )
+
+
 # region 余额查询
 balance_cmd = on_command(
     "vrcbalance",
@@ -37,8 +58,10 @@ async def _(matcher: Matcher, session_id: UserSessionId):
     try:
         client = await get_client(session_id)
         user_id = await get_current_user_id(client)
-        balance = await get_balance(client, user_id)
-        earnings = await get_balance_earnings(client, user_id)
+        balance, earnings = await asyncio.gather(
+            get_balance(client, user_id),
+            get_balance_earnings(client, user_id),
+        )
     except Exception as e:
         await handle_error(matcher, e)
 
@@ -96,17 +119,16 @@ async def _(matcher: Matcher, session_id: UserSessionId):
     logger.info("正在查询当前订阅信息")
     try:
         client = await get_client(session_id)
-        current_subs = await get_current_subscriptions(client)
-        all_subs = await get_subscriptions(client)
+        current_subs, all_subs = await asyncio.gather(
+            get_current_subscriptions(client),
+            get_subscriptions(client),
+        )
     except Exception as e:
         await handle_error(matcher, e)
 
     msg = Lang.nbp_vrc.economy.subscriptions_info(
-        current_count=len(current_subs.get("subscriptions", []))
-        if isinstance(current_subs, dict)
-        else 0,
-        total_count=len(all_subs) if isinstance(all_subs, list) else 0,
-        subscriptions=all_subs if isinstance(all_subs, list) else [],
+        current_count=len(current_subs),
+        total_count=len(all_subs),
     )
     await matcher.finish(msg)
 
@@ -129,13 +151,7 @@ async def _(matcher: Matcher, session_id: UserSessionId):
     except Exception as e:
         await handle_error(matcher, e)
 
-    msg = Lang.nbp_vrc.economy.tilia_status_info(
-        user_id=status.get("user_id", ""),
-        status=status.get("status", ""),
-        created_at=status.get("created_at"),
-        updated_at=status.get("updated_at"),
-    )
-    await matcher.finish(msg)
+    await matcher.finish(format_tilia_status(status))
 
 
 # region 收益查询
@@ -156,18 +172,56 @@ async def _(matcher: Matcher, session_id: UserSessionId):
         earnings = await get_balance_earnings(client, user_id)
     except Exception as e:
         await handle_error(matcher, e)
-    balance = earnings.get("balance", "0")
-    no_transactions = earnings.get("no_transactions")
-    tilia_response = earnings.get("tilia_response")
-    if no_transactions is None:
-        msg = Lang.nbp_vrc.economy.no_earnings_info()
-    else:
-        msg = Lang.nbp_vrc.economy.earnings_info(
-            balance=balance,
-            no_transactions=no_transactions,
-            tilia_response=tilia_response,
+
+    await matcher.finish(format_earnings(earnings))
+
+
+# region 经济总览
+dashboard_cmd = on_command(
+    "vrcdashboard",
+    aliases={"vrc经济总览", "vrc钱包"},
+    rule=rule_enable,
+    priority=20,
+)
+
+
+@dashboard_cmd.handle()
+async def _(matcher: Matcher, session_id: UserSessionId):
+    start_time = time.perf_counter()
+    logger.info("正在查询当前用户经济总览")
+    try:
+        client = await get_client(session_id)
+        dashboard = await get_economy_dashboard(client)
+    except Exception as e:
+        await handle_error(matcher, e)
+
+    end_time = time.perf_counter()
+    logger.debug(f"经济总览查询执行用时：{end_time - start_time:.3f} 秒")
+
+    # 获取失败的部分不显示
+    sections: List[str] = []
+    if (balance := dashboard.balance) is not None:
+        sections.append(
+            Lang.nbp_vrc.economy.balance_info(
+                balance=balance.balance,
+                pending=balance.pending,
+                last_payout=balance.last_payout,
+            ),
         )
-    await matcher.finish(msg)
+    if (earnings := dashboard.earnings) is not None:
+        sections.append(format_earnings(earnings))
+    current_subs = dashboard.current_subscriptions
+    all_subs = dashboard.subscriptions
+    if current_subs is not None or all_subs is not None:
+        sections.append(
+            Lang.nbp_vrc.economy.subscriptions_info(
+                current_count="?" if current_subs is None else len(current_subs),
+                total_count="?" if all_subs is None else len(all_subs),
+            ),
+        )
+    if (status := dashboard.tilia_status) is not None:
+        sections.append(format_tilia_status(status))
+    await matcher.finish("\n\n".join(sections))
 
 
 # region 帮助信息
@@ -0,0 +1,200 @@
+from typing import Dict, List, Optional
+
+from loguru import logger
+from nonebot import on_command
+from nonebot.adapters import Message
+from nonebot.matcher import Matcher
+from nonebot.params import CommandArg
+
+from ..i18n import Lang
+from ..vrchat import (
+    FavoriteSyncPlan,
+    FavoriteSyncResult,
+    FavoriteType,
+    HydratedFavorite,
+    UserModel,
+    get_client,
+    get_hydrated_favorites,
+    sync_favorites,
+)
+from .utils import UserSessionId, handle_error, rule_enable
+
+FAVORITE_TYPE_NAMES: Dict[str, FavoriteType] = {
+    "好友": "friend",
+    "friend": "friend",
+    "世界": "world",
+    "world": "world",
+    "头像": "avatar",
+    "模型": "avatar",
+    "avatar": "avatar",
+}
+
+DRY_RUN_FLAGS = ("预览", "--dry-run")
+
+FAVORITE_TYPE_LABELS: Dict[FavoriteType, str] = {
+    "friend": Lang.nbp_vrc.favorite.type_friend(),
+    "world": Lang.nbp_vrc.favorite.type_world(),
+    "avatar": Lang.nbp_vrc.favorite.type_avatar(),
+}
+
+
+def format_favorite(item: HydratedFavorite) -> str:
+    detail = item.detail
+    if detail is None:
+        return Lang.nbp_vrc.favorite.fetch_failed(target_id=item.favorite.target_id)
+    if isinstance(detail, UserModel):
+        return detail.display_name
+    return detail.name
+
+
+def format_sync_plan(plan: FavoriteSyncPlan) -> str:
+    kept = len(plan.current) - len(plan.to_remove)
+    lines = [
+        Lang.nbp_vrc.favorite.sync_summary(
+            tag=plan.tag,
+            label=FAVORITE_TYPE_LABELS[plan.favorite_type],
+            current=len(plan.current),
+            limit=plan.limit,
+            added=len(plan.to_add),
+            removed=len(plan.to_remove),
+            after=kept + len(plan.to_add),
+        ),
+    ]
+    moved = {x.target_id: ",".join(x.tags) for x in plan.to_move}
+    lines.extend(
+        Lang.nbp_vrc.favorite.sync_move_item(target_id=x, tags=moved[x])
+        if x in moved
+        else f"+ {x}"
+        for x in plan.to_add
+    )
+    lines.extend(f"- {x.target_id}" for x in plan.to_remove)
+    if plan.over_limit:
+        lines.append(Lang.nbp_vrc.favorite.sync_over_limit(count=len(plan.over_limit)))
+        lines.extend(f"  {x}" for x in plan.over_limit)
+    if plan.in_other_groups:
+        lines.append(
+            Lang.nbp_vrc.favorite.sync_in_other_groups(
+                count=len(plan.in_other_groups),
+            ),
+        )
+        lines.extend(
+            Lang.nbp_vrc.favorite.sync_in_other_group_item(target_id=k, tags=v)
+            for k, v in plan.in_other_groups.items()
+        )
+    return "\n".join(lines)
+
+
+def format_sync_result(result: FavoriteSyncResult) -> str:
+    lines = [
+        format_sync_plan(result.plan),
+        Lang.nbp_vrc.favorite.sync_result(
+            added=len(result.added),
+            removed=len(result.removed),
+            failed=len(result.failed),
+        ),
+    ]
+    lines.extend(
+        Lang.nbp_vrc.favorite.sync_failed_item(target_id=k, error=v)
+        for k, v in result.failed.items()
+    )
+    return "\n".join(lines)
+
+
+# region 收藏列表
+favorites_cmd = on_command(
+    "vrcfav",
+    aliases={"vrc收藏", "vrc我的收藏"},
+    rule=rule_enable,
+    priority=20,
+)
+
+
+@favorites_cmd.handle()
+async def _(
+    matcher: Matcher,
+    session_id: UserSessionId,
+    arg_msg: Message = CommandArg(),
+):
+    arg = arg_msg.extract_plain_text().strip().lower()
+    favorite_type: Optional[FavoriteType] = None
+    if arg:
+        if arg not in FAVORITE_TYPE_NAMES:
+            await matcher.finish(Lang.nbp_vrc.favorite.invalid_type())
+        favorite_type = FAVORITE_TYPE_NAMES[arg]
+
+    logger.info(f"正在获取收藏列表：{favorite_type or '全部'}")
+    try:
+        client = await get_client(session_id)
+        items = await get_hydrated_favorites(client, favorite_type)
+    except Exception as e:
+        await handle_error(matcher, e)
+
+    if not items:
+        await matcher.finish(Lang.nbp_vrc.favorite.no_favorites())
+
+    # 按收藏组分组显示
+    groups: Dict[str, List[HydratedFavorite]] = {}
+    ungrouped = Lang.nbp_vrc.favorite.ungrouped()
+    for item in items:
+        tag = item.favorite.tags[0] if item.favorite.tags else ungrouped
+        groups.setdefault(tag, []).append(item)
+
+    msg = f"{Lang.nbp_vrc.favorite.favorites_title(count=len(items))}\n"
+    for tag, group_items in groups.items():
+        label = FAVORITE_TYPE_LABELS[group_items[0].favorite.type]
+        title = Lang.nbp_vrc.favorite.favorite_group_title(
+            label=label,
+            tag=tag,
+            count=len(group_items),
+        )
+        msg += f"\n{title}\n"
+        msg += "".join(
+            f"{i}. {format_favorite(x)}\n" for i, x in enumerate(group_items, 1)
+        )
+
+    await matcher.finish(msg.rstrip())
+
+
+# region 批量收藏
+bulk_favorite_cmd = on_command(
+    "vrcfavadd",
+    aliases={"vrc批量收藏"},
+    rule=rule_enable,
+    priority=20,
+)
+
+
+@bulk_favorite_cmd.handle()
+async def _(
+    matcher: Matcher,
+    session_id: UserSessionId,
+    arg_msg: Message = CommandArg(),
+):
+    args = arg_msg.extract_plain_text().split()
+    dry_run = any(x in DRY_RUN_FLAGS for x in args)
+    args = [x for x in args if x not in DRY_RUN_FLAGS]
+    if len(args) < 3 or args[0].lower() not in FAVORITE_TYPE_NAMES:
+        await matcher.finish(Lang.nbp_vrc.favorite.bulk_usage())
+
+    favorite_type = FAVORITE_TYPE_NAMES[args[0].lower()]
+    tag, *target_ids = args[1:]
+    logger.info(f"正在批量收藏到 {tag}：{len(target_ids)} 项")
+    try:
+        client = await get_client(session_id)
+        result = await sync_favorites(
+            client,
+            favorite_type,
+            tag,
+            target_ids,
+            dry_run=dry_run,
+        )
+    except Exception as e:
+        await handle_error(matcher, e)
+
+    if result.plan.unchanged:
+        await matcher.finish(
+            f"{format_sync_plan(result.plan)}\n{Lang.nbp_vrc.favorite.nothing_to_do()}",
+        )
+    await matcher.finish(
+        format_sync_plan(result.plan) if dry_run else format_sync_result(result),
+    )
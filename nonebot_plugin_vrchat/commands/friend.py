@@ -7,7 +7,7 @@ from nonebot_plugin_alconna.uniseg import UniMessage
 
 from ..i18n import Lang
 from ..message import draw_user_card_overview
-from ..vrchat import get_all_friends, get_client
+from ..vrchat import FriendRecord, get_all_friends, get_client
 from .utils import UserSessionId, handle_error, rule_enable
 
 friend_list = on_command(
@@ -26,7 +26,8 @@ async def _(matcher: Matcher, session_id: UserSessionId):
     try:
         client = await get_client(session_id)
 
-        resp = [x async for x in get_all_friends(client)]
+        # 在获取时转换为 FriendRecord，绘制时不再逐个转换
+        resp = [FriendRecord.from_model(x) async for x in get_all_friends(client)]
     except Exception as e:
         logger.error(f"获取好友列表时发生错误: {e}")
         await handle_error(matcher, e)
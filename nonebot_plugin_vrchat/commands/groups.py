@@ -1,6 +1,7 @@
+import re
 import time
 from datetime import datetime
-from typing import List
+from typing import List, cast
 
 from loguru import logger
 from nonebot import on_command
@@ -8,19 +9,25 @@ from nonebot.adapters import Message
 from nonebot.matcher import Matcher
 from nonebot.params import ArgPlainText, EventMessage
 from nonebot.typing import T_State
+from nonebot_plugin_alconna import UniMessage
 
+from ..config import DATA_DIR
+from ..i18n import Lang
 from ..vrchat import (
     ApiClient,
+    ExportFormat,
     LimitedGroupModel,
+    export_group_members,
     get_client,
-    get_group,
     get_group_announcements,
+    get_group_cached,
     get_group_instances,
     get_group_members,
     get_group_requests,
     get_group_roles,
     join_group,
     leave_group,
+    occupancy_tracker,
     search_groups,
 )
 from .utils import (
@@ -34,6 +41,21 @@ from .utils import (
     rule_enable,
 )
 
+EXPORT_DIR = DATA_DIR / "export"
+EXPORT_MAX_AGE = 24 * 60 * 60
+"""发送失败而留在本地的导出文件的保留时间，单位秒"""
+GROUP_ID_PATTERN = re.compile(r"^grp_[0-9a-f-]+$")
+
+
+def cleanup_exports(max_age: float = EXPORT_MAX_AGE):
+    """删除超过保留时间的导出文件"""
+    if not EXPORT_DIR.exists():
+        return
+    expire_before = time.time() - max_age
+    for path in EXPORT_DIR.iterdir():
+        if path.is_file() and path.stat().st_mtime < expire_before:
+            path.unlink(missing_ok=True)
+
 
 def format_datetime(dt: datetime | str | None) -> str:
     """格式化 datetime 对象为易读字符串"""
@@ -141,7 +163,7 @@ async def _(
 
         group = groups[index]
         try:
-            group_detail = await get_group(client, group.group_id)
+            group_detail = await get_group_cached(client, group.group_id)
         except Exception as e:
             await handle_error(matcher, e)
             return
@@ -189,7 +211,7 @@ async def _(
     try:
         client = await get_client(session_id)
         # 尝试直接使用 arg 作为 group_id
-        group = await get_group(client, arg)
+        group = await get_group_cached(client, arg)
     except Exception:
         # 如果不是有效的 group_id，尝试搜索
         try:
@@ -248,32 +270,90 @@ async def _(
     logger.info(f"正在获取群组成员：{arg}")
     try:
         client = await get_client(session_id)
-        members = await get_group_members(client, arg, n=20)
+        members = [
+            x async for x in get_group_members(client, arg, page_size=20, max_size=20)
+        ]
     except Exception as e:
         await handle_error(matcher, e)
 
     if not members:
         await matcher.finish("该群组没有成员或获取失败")
-    msg = f"群组成员列表 (共 {len(members)} 人)：\n\n"
-    for i, member in enumerate(members[:20], 1):
-        data = member.get("user", {})
-        user_id = data.get("user_id", "未知")
-        display_name = data.get("display_name", "未知")
-        # current_avatar_thumbnail_image_url = data.current_avatar_thumbnail_image_url # 头像
-        # profile_pic_override = data.profile_pic_override # 部分有
-        # thumbnail_url = data.thumbnail_url # 首页图
-
-        msg += f"{i}. 昵称：{display_name}\n"
-        msg += f"   用户 ID: {user_id}\n"
-        msg += f"   加入时间：{format_datetime(member.get('joined_at'))}\n"
-        msg += f"   成员状态：{member.get('membership_status', '未知')}\n"
-        if member.get("is_representing"):
+    msg = f"群组成员列表 (前 {len(members)} 人)：\n\n"
+    for i, member in enumerate(members, 1):
+        msg += f"{i}. 昵称：{member.user.display_name}\n"
+        msg += f"   用户 ID: {member.user_id}\n"
+        msg += f"   加入时间：{format_datetime(member.joined_at)}\n"
+        msg += f"   成员状态：{member.membership_status or '未知'}\n"
+        if member.is_representing:
             msg += "   正在代表群组\n"
         msg += "\n"
+    msg += "发送【vrc导出群组成员】【群组 ID】可导出完整成员列表"
 
     await matcher.finish(msg)
 
 
+# region 导出群组成员
+export_members_cmd = on_command(
+    "vrcgme",
+    aliases={"vrc导出群组成员"},
+    rule=rule_enable,
+    priority=20,
+)
+
+
+register_arg_got_handlers(
+    export_members_cmd,
+    lambda matcher: "请发送群组 ID，可在后面加上 jsonl 导出为 JSON Lines",  # noqa: ARG005
+)
+
+
+@export_members_cmd.handle()
+async def _(
+    matcher: Matcher,
+    session_id: UserSessionId,
+    arg: str = ArgPlainText(KEY_ARG),
+):
+    group_id, _, fmt = arg.strip().partition(" ")
+    fmt = fmt.strip().lower() or "csv"
+    if not group_id:
+        await matcher.reject("请发送群组 ID")
+    # 群组 ID 会用于文件名，只接受合法的格式
+    if not GROUP_ID_PATTERN.match(group_id):
+        await matcher.reject("群组 ID 格式不正确，应以 grp_ 开头")
+    if fmt not in ("csv", "jsonl"):
+        await matcher.finish("导出格式只支持 csv 或 jsonl")
+
+    cleanup_exports()
+    path = EXPORT_DIR / f"{group_id}_{int(time.time())}.{fmt}"
+    logger.info(f"正在导出群组成员：{group_id} -> {path}")
+    await matcher.send("正在导出群组成员，成员较多时需要一些时间")
+    try:
+        client = await get_client(session_id)
+        count = await export_group_members(
+            client,
+            group_id,
+            path,
+            cast("ExportFormat", fmt),
+        )
+    except Exception as e:
+        await handle_error(matcher, e)
+
+    if not count:
+        path.unlink(missing_ok=True)
+        await matcher.finish("该群组没有成员或获取失败")
+
+    try:
+        await UniMessage.file(path=path, name=path.name).send()
+    except Exception as e:
+        logger.warning(f"Failed to send export file: {type(e).__name__}: {e}")
+        await matcher.finish(
+            f"已导出 {count} 名成员，文件保存在：{path}"
+            f"（{EXPORT_MAX_AGE // 3600} 小时后删除）",
+        )
+    path.unlink(missing_ok=True)
+    await matcher.finish(f"已导出 {count} 名成员")
+
+
 # region 群组角色
 group_roles_cmd = on_command(
     "vrcgr",
@@ -481,22 +561,27 @@ async def _(
     logger.info(f"正在获取群组请求：{arg}")
     try:
         client = await get_client(session_id)
-        requests = await get_group_requests(client, arg, n=20)
+        requests = [
+            x async for x in get_group_requests(client, arg, page_size=20, max_size=20)
+        ]
     except Exception as e:
         await handle_error(matcher, e)
 
     if not requests:
         await matcher.finish("该群组没有待处理的请求")
 
-    msg = f"群组请求列表 (共 {len(requests)} 个)：\n\n"
-    for i, req in enumerate(requests[:20], 1):
-        msg += f"{i}. 用户 ID: {req.get('user_id', '未知')}\n"
-        msg += f"   请求时间：{format_datetime(req.get('created_at'))}\n"
-        msg += f"   成员状态：{req.get('membership_status', '未知')}\n"
-        if req.get("has_joined_from_purchase"):
+    msg = f"群组请求列表 (前 {len(requests)} 个)：\n\n"
+    for i, req in enumerate(requests, 1):
+        msg += f"{i}. 昵称：{req.user.display_name}\n"
+        msg += f"   用户 ID: {req.user_id}\n"
+        msg += f"   请求时间：{format_datetime(req.created_at)}\n"
+        msg += f"   成员状态：{req.membership_status or '未知'}\n"
+        if req.has_joined_from_purchase:
             msg += "   通过购买加入\n"
         msg += "\n"
 
+    await matcher.finish(msg.rstrip())
+
 
 # region 群组实例
 group_instances_cmd = on_command(
@@ -535,14 +620,89 @@ async def _(
 
     msg = f"群组实例列表 (共 {len(instances)} 个)：\n\n"
     for i, inst in enumerate(instances[:20], 1):
-        msg += f"{i}. 实例 ID: {inst.get('instance_id', '未知')}\n"
-        msg += f"   位置：{inst.get('location', '未知')}\n"
-        msg += f"   成员数：{inst.get('member_count', 0)}\n"
-        world = inst.get("world", {})
-        if isinstance(world, dict):
-            msg += f"   世界名称：{world.get('name', '未知')}\n"
+        msg += f"{i}. 实例 ID: {inst.instance_id}\n"
+        msg += f"   位置：{inst.location}\n"
+        msg += f"   成员数：{inst.member_count}\n"
+        msg += f"   世界名称：{inst.world.get('name', '未知')}\n"
         msg += "\n"
 
+    await matcher.finish(msg.rstrip())
+
+
+# region 群组热门实例
+busiest_instances_cmd = on_command(
+    "vrcgbusy",
+    aliases={"vrc群组热门实例", "vrc群组热门"},
+    rule=rule_enable,
+    priority=20,
+)
+
+register_arg_got_handlers(
+    busiest_instances_cmd,
+    lambda matcher: Lang.nbp_vrc.group.send_group_ids(),  # noqa: ARG005
+)
+
+
+def format_trend(trend: int) -> str:
+    if trend > 0:
+        return f"↑{trend}"
+    if trend < 0:
+        return f"↓{-trend}"
+    return "-"
+
+
+@busiest_instances_cmd.handle()
+async def _(
+    matcher: Matcher,
+    session_id: UserSessionId,
+    arg: str = ArgPlainText(KEY_ARG),
+):
+    group_ids = arg.split()
+    if not group_ids:
+        await matcher.reject(Lang.nbp_vrc.group.send_group_ids())
+
+    try:
+        client = await get_client(session_id)
+        snapshot = await occupancy_tracker.get_snapshot(client, group_ids)
+    except Exception as e:
+        await handle_error(matcher, e)
+
+    if not snapshot.instances:
+        await matcher.finish(Lang.nbp_vrc.group.no_active_instances())
+
+    lines = [
+        Lang.nbp_vrc.group.occupancy_summary(
+            groups=len(set(group_ids)),
+            instances=len(snapshot.instances),
+            users=snapshot.users,
+            updated_at=datetime.fromtimestamp(snapshot.timestamp).strftime("%H:%M:%S"),
+        ),
+        "",
+        Lang.nbp_vrc.group.busiest_worlds_title(),
+    ]
+    lines.extend(
+        Lang.nbp_vrc.group.busiest_world_item(
+            index=i,
+            name=world.name,
+            users=world.users,
+            instances=len(world.instances),
+            peak=world.peak,
+            trend=format_trend(world.trend()),
+        )
+        for i, world in enumerate(snapshot.worlds[:5], 1)
+    )
+    lines.extend(("", Lang.nbp_vrc.group.busiest_instances_title()))
+    lines.extend(
+        Lang.nbp_vrc.group.busiest_instance_item(
+            index=i,
+            name=inst.world.get("name") or Lang.nbp_vrc.words.unknown(),
+            users=inst.member_count,
+            location=inst.location,
+        )
+        for i, inst in enumerate(snapshot.instances[:10], 1)
+    )
+    await matcher.finish("\n".join(lines))
+
 
 # region 群组帮助
 group_help = on_command(
@@ -564,5 +724,7 @@ async def _(matcher: Matcher):
 6、【vrc加入群组】【群组 ID】| 申请加入群组
 7、【vrc离开群组】【群组 ID】| 离开群组
 8、【vrc群组请求】【群组 ID】| 查看入群申请
-9、【vrc群组实例】【群组 ID】| 查看群组实例"""
+9、【vrc群组实例】【群组 ID】| 查看群组实例
+10、【vrc导出群组成员】【群组 ID】【csv/jsonl】| 导出完整成员列表
+11、【vrc群组热门实例】【群组 ID ...】| 汇总多个群组中人数最多的世界与实例"""
     await matcher.finish(msg)
@@ -17,6 +17,7 @@ from ..vrchat import (
     TwoFactorAuthError,
     get_login_info,
     login_via_password,
+    pipeline_manager,
     remove_login_info,
 )
 from .utils import (
@@ -62,7 +63,7 @@ async def _(
         NotLoggedInError: 如果用户未登录则抛出此异常。
     """
     try:
-        login_info = get_login_info(session_id)
+        login_info = await get_login_info(session_id)
         logger.info(f"login_info: {login_info}")
     except NotLoggedInError:
         login_info = None
@@ -133,14 +134,14 @@ async def _(
             await matcher.reject(Lang.nbp_vrc.login.invalid_account())
 
         logger.error(f"Api error when logging in: [{e.status}] {e.reason}")
-        remove_login_info(session_id)
+        await remove_login_info(session_id)
         await matcher.finish(
             Lang.nbp_vrc.general.server_error(status=e.status, reason=e.reason),
         )
 
     except Exception:
         logger.exception("Exception when logging in")
-        remove_login_info(session_id)
+        await remove_login_info(session_id)
         await matcher.finish(Lang.nbp_vrc.general.unknown_error())
 
     state[KEY_CURRENT_USER] = current_user
@@ -169,23 +170,25 @@ async def _(
             await matcher.reject(Lang.nbp_vrc.login.invalid_2fa_code())
 
         logger.error(f"Api error when verifying 2FA code: [{e.status}] {e.reason}")
-        remove_login_info(session_id)
+        await remove_login_info(session_id)
         await matcher.finish(
             Lang.nbp_vrc.general.server_error(status=e.status, reason=e.reason),
         )
 
     except Exception:
         logger.exception("Exception when verifying 2FA code")
-        remove_login_info(session_id)
+        await remove_login_info(session_id)
         await matcher.finish(Lang.nbp_vrc.general.unknown_error())
 
     state[KEY_CURRENT_USER] = current_user
 
 
 @vrc_login.handle()
-async def _(matcher: Matcher, state: T_State):
+async def _(matcher: Matcher, state: T_State, session_id: UserSessionId):
     current_user: CurrentUser = state[KEY_CURRENT_USER]
     state[KEY_CURRENT_USER] = current_user
+    if env_config.vrchat_pipeline:
+        await pipeline_manager.start(session_id)
     await matcher.finish(
         Lang.nbp_vrc.login.logged_in(name=current_user.display_name),
     )
@@ -13,15 +13,20 @@ from vrchatapi.exceptions import NotFoundException
 from ..i18n.model import Lang
 from ..message import draw_notification_card
 from ..vrchat import (
+    NotificationModel,
+    NotificationStore,
     accept_friend_request,
     get_client,
-    get_notifications,
+    get_notification_store,
     mark_notification_as_read,
+    pipeline_manager,
+    sync_notifications,
 )
 from ..vrchat.notifications import delete_notification
 from .utils import (
     KEY_CLIENT,
     KEY_NOTIF_RESP,
+    KEY_NOTIF_STORE,
     UserSessionId,
     handle_error,
     rule_enable,
@@ -29,7 +34,7 @@ from .utils import (
 )
 
 if TYPE_CHECKING:
-    from vrchatapi import ApiClient, Notification
+    from vrchatapi import ApiClient
 
 logger.info(rule_enable)
 show_notic = on_command(
@@ -54,18 +59,22 @@ async def _(
     if tag and tag.isdigit():
         num = int(tag)
         if 0 < num <= 100:
-            n = tag
+            n = num
     try:
         client = await get_client(session_id)
-        resp = get_notifications(client, n=n)
+        store = get_notification_store(session_id)
+        # pipeline 已连接且同步过一次时，本地通知列表由推送保持最新
+        if not (pipeline_manager.get(session_id) and store.cursor):
+            await sync_notifications(client, store)
     except Exception as e:
         await handle_error(matcher, e)
-    logger.debug(str(resp))
-    if len(resp) == 0:
+    resp = store.latest(n)
+    if not resp:
         await UniMessage.text(Lang.nbp_vrc.notif.no_request).finish()
     state[KEY_NOTIF_RESP] = resp
     state[KEY_CLIENT] = client
-    pic = await draw_notification_card(resp)
+    state[KEY_NOTIF_STORE] = store
+    pic = await draw_notification_card(resp, client)
     if pic:
         logger.info("通知列表成功")
 
@@ -81,7 +90,8 @@ async def _(
 @show_notic.handle()
 async def _(matcher: Matcher, state: T_State, message: Message = EventMessage()):
     client: ApiClient = state[KEY_CLIENT]
-    resp: List[Notification] = state[KEY_NOTIF_RESP]
+    resp: List[NotificationModel] = state[KEY_NOTIF_RESP]
+    store: NotificationStore = state[KEY_NOTIF_STORE]
     arg = message.extract_plain_text().strip()
 
     logger.debug(f"收到参数: {arg!r}")
@@ -89,23 +99,30 @@ async def _(matcher: Matcher, state: T_State, message: Message = EventMessage())
     index, tag = await split_chinese_digits(arg)
     if index == "0":
         await UniMessage.text("退出交互").finish()
+    if not index or not (0 < int(index) <= len(resp)):
+        await matcher.reject(Lang.nbp_vrc.general.invalid_ordinal_range())
     logger.debug(f"收到参数: {index!r} |{tag}")
     ntf = resp[int(index) - 1]
     try:
         if ntf.type == "friendRequest":
             if tag == Lang.nbp_vrc.notif.accept:
-                await accept_friend_request(client, ntf.id)
+                await accept_friend_request(client, ntf.notification_id)
+                store.remove(ntf.notification_id)
                 await UniMessage.text(Lang.nbp_vrc.notif.accept_resp).finish()
             elif tag == Lang.nbp_vrc.notif.ignore:
-                await mark_notification_as_read(client, ntf.id)
+                await mark_notification_as_read(client, ntf.notification_id)
+                store.mark_read(ntf.notification_id)
                 await UniMessage.text(Lang.nbp_vrc.notif.ignore_resp).finish()
             elif tag == Lang.nbp_vrc.notif.deny:
-                await delete_notification(client, ntf.id)
+                await delete_notification(client, ntf.notification_id)
+                store.remove(ntf.notification_id)
                 await UniMessage.text(Lang.nbp_vrc.notif.deny_resp).finish()
             else:
                 await UniMessage.text(Lang.nbp_vrc.notif.error_handle).finish()
     except NotFoundException as e:
         if e.status == 404:
+            # 已在其他地方处理过，本地也不再保留
+            store.remove(ntf.notification_id)
             await UniMessage.text(Lang.nbp_vrc.notif.processed).finish()
         else:
             await handle_error(matcher, e)
@@ -18,8 +18,9 @@ from ..vrchat import (
     friend,
     get_friend_status,
     get_or_random_client,
-    get_user,
+    get_user_cached,
     search_users,
+    user_index,
 )
 from .utils import (
     KEY_ARG,
@@ -60,11 +61,25 @@ async def _(
     logger.info(f"正在查询{arg}")
     try:
         client, is_me = await get_or_random_client(session_id)
-        resp = [x async for x in search_users(client, arg, max_size=10)]
     except Exception as e:
         await handle_error(matcher, e)
 
+    index = user_index.of(client)
+    # 此账号最近见过名称完全相同的用户时直接使用，不请求搜索接口
+    if resp := index.exact(arg):
+        logger.debug(f"Using {len(resp)} exact match(es) from local index")
+    else:
+        try:
+            resp = [x async for x in search_users(client, arg, max_size=10)]
+        except Exception as e:
+            # 请求失败时使用此账号见过的用户作为备用结果
+            if not (resp := index.search(arg)):
+                await handle_error(matcher, e)
+            logger.warning(f"Search failed, using local index: {type(e).__name__}")
+
     if not resp:
+        if names := index.complete(arg):
+            await matcher.finish(Lang.nbp_vrc.user.did_you_mean(names="\n".join(names)))
         await matcher.finish(Lang.nbp_vrc.user.no_user_found())
 
     state[KEY_CLIENT] = client
@@ -160,7 +175,7 @@ async def _(
 
         user_id = resp[index].user_id
         try:
-            user = await get_user(client, user_id)
+            user = await get_user_cached(client, user_id)
             pic = await draw_user_profile_card(user)
         except Exception as e:
             await handle_error(matcher, e)
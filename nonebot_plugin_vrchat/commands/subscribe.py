@@ -0,0 +1,172 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+from nonebot import on_command
+from nonebot.adapters import Message
+from nonebot.matcher import Matcher
+from nonebot.params import CommandArg
+from nonebot_plugin_alconna import MsgTarget
+
+from ..i18n import Lang
+from ..subscribe import add_subscription, get_subscriptions, remove_subscription
+from ..vrchat import LimitedUserModel, get_all_friends, get_client
+from .utils import (
+    GroupSessionId,
+    UserSessionId,
+    handle_error,
+    rule_enable,
+)
+
+ALL_FRIENDS_KEYWORDS = ("全部", "所有", "all")
+
+
+def split_names(arg: str) -> List[str]:
+    return [x for x in re.split(r"[\s,，]+", arg.strip()) if x]
+
+
+def resolve_friends(
+    friends: List[LimitedUserModel],
+    names: List[str],
+) -> Tuple[Dict[str, str], List[str]]:
+    """
+    将用户输入的好友 ID 或昵称解析为好友 ID
+
+    Returns:
+        Tuple[好友 ID -> 昵称, 未找到的输入]
+    """
+
+    by_id = {x.user_id: x for x in friends}
+    by_name = {x.display_name.casefold(): x for x in friends}
+
+    resolved: Dict[str, str] = {}
+    missing: List[str] = []
+    for name in names:
+        user = by_id.get(name) or by_name.get(name.casefold())
+        if user:
+            resolved[user.user_id] = user.display_name
+        else:
+            missing.append(name)
+    return resolved, missing
+
+
+def join_names(names: Iterable[str]) -> str:
+    return Lang.nbp_vrc.subscribe.name_separator().join(names)
+
+
+def format_missing(missing: List[str]) -> str:
+    return Lang.nbp_vrc.subscribe.friends_not_found(names=join_names(missing))
+
+
+# region 订阅好友
+subscribe_friend = on_command(
+    "vrcfsub",
+    aliases={"vrc订阅好友", "vrc好友订阅"},
+    rule=rule_enable,
+    priority=20,
+)
+
+
+@subscribe_friend.handle()
+async def _(
+    matcher: Matcher,
+    session_id: UserSessionId,
+    group_id: GroupSessionId,
+    target: MsgTarget,
+    arg: Message = CommandArg(),
+):
+    names = split_names(arg.extract_plain_text())
+    if not names:
+        await matcher.finish(Lang.nbp_vrc.subscribe.send_friend_names())
+
+    if any(x.lower() in ALL_FRIENDS_KEYWORDS for x in names):
+        try:
+            await get_client(session_id)
+        except Exception as e:
+            await handle_error(matcher, e)
+        add_subscription(group_id, session_id, target)
+        await matcher.finish(Lang.nbp_vrc.subscribe.subscribed_all())
+
+    try:
+        client = await get_client(session_id)
+        friends = [x async for x in get_all_friends(client)]
+    except Exception as e:
+        await handle_error(matcher, e)
+
+    resolved, missing = resolve_friends(friends, names)
+    if not resolved:
+        await matcher.finish(format_missing(missing))
+
+    logger.info(f"Session {group_id} subscribed friends: {list(resolved)}")
+    add_subscription(group_id, session_id, target, list(resolved))
+    msg = Lang.nbp_vrc.subscribe.subscribed_friends(
+        names=join_names(resolved.values()),
+    )
+    if missing:
+        msg += f"\n{format_missing(missing)}"
+    await matcher.finish(msg)
+
+
+# region 取消订阅好友
+unsubscribe_friend = on_command(
+    "vrcfunsub",
+    aliases={"vrc取消订阅好友", "vrc取消好友订阅"},
+    rule=rule_enable,
+    priority=20,
+)
+
+
+@unsubscribe_friend.handle()
+async def _(
+    matcher: Matcher,
+    session_id: UserSessionId,
+    group_id: GroupSessionId,
+    arg: Message = CommandArg(),
+):
+    names = split_names(arg.extract_plain_text())
+    friend_ids: Optional[List[str]] = None
+    if names and not any(x.lower() in ALL_FRIENDS_KEYWORDS for x in names):
+        sub = get_subscriptions(group_id).get(session_id)
+        if not sub:
+            await matcher.finish(Lang.nbp_vrc.subscribe.no_subscription())
+        try:
+            client = await get_client(session_id)
+            friends = [x async for x in get_all_friends(client)]
+        except Exception as e:
+            await handle_error(matcher, e)
+        resolved, _ = resolve_friends(friends, names)
+        # 也允许直接使用 ID 取消已经不是好友的订阅
+        friend_ids = [*resolved, *(x for x in names if x in sub.friends)]
+
+    if not remove_subscription(group_id, session_id, friend_ids):
+        await matcher.finish(Lang.nbp_vrc.subscribe.no_subscription())
+    await matcher.finish(Lang.nbp_vrc.subscribe.unsubscribed())
+
+
+# region 订阅列表
+subscription_list = on_command(
+    "vrcfsublist",
+    aliases={"vrc好友订阅列表", "vrc订阅好友列表"},
+    rule=rule_enable,
+    priority=20,
+)
+
+
+@subscription_list.handle()
+async def _(matcher: Matcher, session_id: UserSessionId, group_id: GroupSessionId):
+    sub = get_subscriptions(group_id).get(session_id)
+    if not sub:
+        await matcher.finish(Lang.nbp_vrc.subscribe.no_subscription())
+    if sub.all_friends:
+        await matcher.finish(Lang.nbp_vrc.subscribe.subscribed_all_tip())
+
+    try:
+        client = await get_client(session_id)
+        friends = {x.user_id: x.display_name async for x in get_all_friends(client)}
+    except Exception as e:
+        await handle_error(matcher, e)
+
+    lines = [f"{i}. {friends.get(x, x)}" for i, x in enumerate(sub.friends, 1)]
+    await matcher.finish(
+        "\n".join([Lang.nbp_vrc.subscribe.subscribed_list_title(), *lines]),
+    )
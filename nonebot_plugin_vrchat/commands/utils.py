@@ -1,8 +1,6 @@
-from pathlib import Path
 from typing import Callable, List, NoReturn, Type, Union
 from typing_extensions import Annotated
 
-import aiofiles
 from nonebot.adapters import Message
 from nonebot.log import logger
 from nonebot.matcher import Matcher
@@ -13,6 +11,7 @@ from vrchatapi import ApiClient, Notification
 
 from ..config import session_config
 from ..i18n import Lang
+from ..storage import message_store
 from ..vrchat import (
     ApiException,
     LimitedGroupModel,
@@ -26,11 +25,6 @@ from ..vrchat.notifications import (
     mark_notification_as_read,
 )
 
-try:
-    import ujson as json
-except ImportError:
-    import json
-
 UserSessionId = Annotated[str, SessionId(SessionIdType.USER, include_bot_id=False)]
 GroupSessionId = Annotated[str, SessionId(SessionIdType.GROUP, include_bot_id=False)]
 
@@ -46,6 +40,7 @@ KEY_VERIFY_CODE = "verify_code"
 KEY_CURRENT_USER = "current_user"
 KEY_SEARCH_RESP = "search_resp"
 KEY_NOTIF_RESP = "notif_resp"
+KEY_NOTIF_STORE = "notif_store"
 KEY_WORLD_RESP = "world_resp"
 
 
@@ -98,30 +93,27 @@ async def save_to_file(
     msg: Union[LimitedUserModel, list[LimitedUserModel], dict, list],
     name: str = "msg_id",
 ):
-    msg_path = Path(f"data/vrchat/{name}/") / f"{msg_id}.json"
-    msg_path.parent.mkdir(parents=True, exist_ok=True)
+    """保存消息 ID 对应的查询结果，过期后自动清理"""
 
     # 处理为json格式
     def to_dict(obj):
         if hasattr(obj, "model_dump"):
-            return obj.model_dump()
+            return obj.model_dump(mode="json")
         if hasattr(obj, "dict"):
             return obj.dict()
         return obj
 
     data = [to_dict(x) for x in msg] if isinstance(msg, list) else to_dict(msg)
-
-    async with aiofiles.open(msg_path, "w", encoding="utf-8") as f:
-        await f.write(json.dumps(data, ensure_ascii=False, indent=4))
+    await message_store.set(name, str(msg_id), data)
 
 
-async def read_to_file(msg_id: Union[str, int]) -> Union[dict, list, None]:
-    msg_path = Path("data/vrchat/msg_id/") / f"{msg_id}.json"
-    logger.debug(f"Reading message from {msg_path}")
-    if not msg_path.exists():
-        return None
-    async with aiofiles.open(msg_path, "r", encoding="utf-8") as f:
-        return json.loads(await f.read())
+async def read_to_file(
+    msg_id: Union[str, int],
+    name: str = "msg_id",
+) -> Union[dict, list, None]:
+    """读取消息 ID 对应的查询结果，不存在或已过期时返回 `None`"""
+    logger.debug(f"Reading message {msg_id} from {name}")
+    return await message_store.get(name, str(msg_id))
 
 
 async def parse_index(arg: str, resp: List[LimitedUserModel], matcher: Matcher) -> int:
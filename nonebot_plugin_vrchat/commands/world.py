@@ -1,3 +1,4 @@
+from loguru import logger
 from nonebot import on_command
 from nonebot.adapters import Message
 from nonebot.matcher import Matcher
@@ -6,8 +7,16 @@ from nonebot_plugin_alconna import UniMessage
 from vrchatapi import ApiClient
 
 from ..i18n import Lang
-from ..message.world import draw_world_card_overview
-from ..vrchat import LimitedWorldModel, get_or_random_client, get_world, search_worlds
+from ..message.world import draw_recent_locations_card, draw_world_card_overview
+from ..vrchat import (
+    LimitedWorldModel,
+    get_client,
+    get_or_random_client,
+    get_world,
+    resolve_recent_locations,
+    search_worlds,
+    world_index,
+)
 from .utils import (
     KEY_ARG,
     KEY_CLIENT,
@@ -45,11 +54,27 @@ async def _(
 
     try:
         client, _ = await get_or_random_client(session_id)
-        worlds = [x async for x in search_worlds(client, arg, max_size=10)]
     except Exception as e:
         await handle_error(matcher, e)
 
+    index = world_index.of(client)
+    # 此账号最近见过名称完全相同的世界时直接使用，不请求搜索接口
+    if worlds := index.exact(arg):
+        logger.debug(f"Using {len(worlds)} exact match(es) from local index")
+    else:
+        try:
+            worlds = [x async for x in search_worlds(client, arg, max_size=10)]
+        except Exception as e:
+            # 请求失败时使用此账号见过的世界作为备用结果
+            if not (worlds := index.search(arg)):
+                await handle_error(matcher, e)
+            logger.warning(f"Search failed, using local index: {type(e).__name__}")
+
     if not worlds:
+        if names := index.complete(arg):
+            await matcher.finish(
+                Lang.nbp_vrc.world.did_you_mean(names="\n".join(names)),
+            )
         await matcher.finish(Lang.nbp_vrc.world.no_world_found())
     state[KEY_WORLD_RESP] = worlds
     state[KEY_CLIENT] = client
@@ -77,3 +102,26 @@ async def _(matcher: Matcher, state: T_State, message: Message = EventMessage())
         world = resp[index - 1]
         worlds = await get_world(client, resp[index - 1].world_id)
         print(worlds)
+
+
+recent_locations = on_command(
+    "vrcrl",
+    aliases={"vrc最近位置", "vrc最近访问"},
+    rule=rule_enable,
+    priority=20,
+)
+
+
+@recent_locations.handle()
+async def _(matcher: Matcher, session_id: UserSessionId):
+    try:
+        client = await get_client(session_id)
+        entries = await resolve_recent_locations(client)
+    except Exception as e:
+        await handle_error(matcher, e)
+
+    if not entries:
+        await matcher.finish(Lang.nbp_vrc.world.no_recent_locations())
+
+    pic = await draw_recent_locations_card(entries)
+    await UniMessage.image(raw=pic).finish()
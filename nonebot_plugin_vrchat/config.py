@@ -1,9 +1,13 @@
+import asyncio
+import json
+import threading
 from datetime import timedelta
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
 from nonebot import get_driver
-from pydantic import BaseModel, Field, PrivateAttr
+from nonebot.utils import run_sync
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
 from .utils import dump_yaml, load_yaml
 
@@ -11,10 +15,16 @@ DATA_DIR = Path.cwd() / "data" / "vrchat"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 PLUGIN_CONFIG_PATH = DATA_DIR / "config.yml"
-SESSION_CONFIG_PATH = DATA_DIR / "session_config.yml"
+SESSION_CONFIG_PATH = DATA_DIR / "session_config.json"
+LEGACY_SESSION_CONFIG_PATH = DATA_DIR / "session_config.yml"
+SESSION_CONFIG_SAVE_DELAY = 1.0
+SUBSCRIBE_CONFIG_PATH = DATA_DIR / "subscribe.yml"
 
 
 class ConfigBaseModel(BaseModel):
+    # 从文件读取的值通过 setattr 写入，需要校验才能还原嵌套的模型
+    model_config = ConfigDict(validate_assignment=True)
+
     _path: Path = PrivateAttr()
 
     def __init__(self, **kwargs):
@@ -48,9 +58,18 @@ class EnvConfig(BaseModel):
     session_expire_timeout: timedelta
     vrchat_img: str = "default"
     vrchat_avatar: bool = True
+    vrchat_subscribe_interval: int = 60
+    """好友订阅轮询间隔，单位秒"""
+    vrchat_subscribe_send_interval: float = 1.0
+    """好友订阅推送时每条消息之间的最小间隔，单位秒"""
+    vrchat_pipeline: bool = True
+    """是否为已登录的账号连接 VRChat pipeline，接收好友与通知的实时推送"""
+    vrchat_pipeline_url: str = "wss://pipeline.vrchat.cloud/"
+    """pipeline 的 websocket 地址，可以指向本地的模拟服务器进行测试"""
 
 
-env_config = EnvConfig.model_validate(dict(get_driver().config))
+driver = get_driver()
+env_config = EnvConfig.model_validate(dict(driver.config))
 
 
 class PluginConfig(ConfigBaseModel):
@@ -70,9 +89,31 @@ class SessionConfig(BaseModel):
 default_session_config = SessionConfig()
 
 
-class SessionConfigManager(ConfigBaseModel):
-    _path: Path = PrivateAttr(default=SESSION_CONFIG_PATH)
-    sessions: Dict[str, SessionConfig] = Field(default_factory=dict)
+class SessionConfigManager:
+    """
+    会话配置，全部保存在内存中
+
+    修改后不会立即写入文件，而是在 `SESSION_CONFIG_SAVE_DELAY` 秒内合并为一次，
+    在线程中序列化为 JSON 并原子替换文件；YAML 只用于导入与导出
+    """
+
+    def __init__(
+        self,
+        path: Path = SESSION_CONFIG_PATH,
+        legacy_yaml_path: Optional[Path] = LEGACY_SESSION_CONFIG_PATH,
+    ) -> None:
+        self._path = path
+        self.sessions: Dict[str, SessionConfig] = {}
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._save_task: Optional["asyncio.Task[None]"] = None
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        if path.exists():
+            self.load_dict(json.loads(path.read_text(encoding="utf-8")))
+        elif legacy_yaml_path and legacy_yaml_path.exists():
+            self.import_yaml(legacy_yaml_path)
+            self.save_sync()
 
     def __getitem__(self, session_id: str) -> SessionConfig:
         return self.sessions[session_id]
@@ -112,5 +153,72 @@ class SessionConfigManager(ConfigBaseModel):
                 return self.sessions[session], session
         return default_session_config, None
 
+    def load_dict(self, data: Dict[str, Any]):
+        self.sessions = {
+            k: SessionConfig.model_validate(v)
+            for k, v in (data.get("sessions") or {}).items()
+        }
+
+    def dump_dict(self) -> Dict[str, Any]:
+        return {"sessions": {k: v.model_dump() for k, v in self.sessions.items()}}
+
+    def import_yaml(self, path: Path):
+        """从 YAML 文件导入会话配置，会覆盖当前配置"""
+        self.load_dict(load_yaml(path) or {})
+        self.save()
+
+    def export_yaml(self, path: Path):
+        """将当前会话配置导出为 YAML 文件"""
+        dump_yaml(path, self.dump_dict())
+
+    def save(self):
+        """在一段时间后保存，期间的多次修改只会写入一次"""
+
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save_sync()
+            return
+
+        if not self._save_handle:
+            self._save_handle = loop.call_later(
+                SESSION_CONFIG_SAVE_DELAY,
+                self._schedule_save,
+            )
+
+    def _schedule_save(self):
+        self._save_handle = None
+        self._save_task = asyncio.create_task(self.flush())
+
+    def _write(self, content: str):
+        with self._lock:
+            tmp_path = self._path.with_suffix(f"{self._path.suffix}.tmp")
+            tmp_path.write_text(content, encoding="utf-8")
+            tmp_path.replace(self._path)
+
+    def save_sync(self):
+        self._dirty = False
+        self._write(json.dumps(self.dump_dict(), ensure_ascii=False))
+
+    async def flush(self):
+        """立即保存尚未写入的修改"""
+
+        if self._save_handle:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if not self._dirty:
+            return
+
+        self._dirty = False
+        # 在事件循环中生成快照，之后的修改不会影响本次写入
+        content = json.dumps(self.dump_dict(), ensure_ascii=False)
+        await run_sync(self._write)(content)
+
 
 session_config = SessionConfigManager()
+
+
+@driver.on_shutdown
+async def _():
+    await session_config.flush()
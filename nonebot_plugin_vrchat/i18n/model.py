@@ -85,6 +85,7 @@ class NbpVrcUser:
     searched_user_tip: LangItem = LangItem("nbp_vrc", "user.searched_user_tip")
     reply_index: LangItem = LangItem("nbp_vrc", "user.reply_index")
     reply_index_add: LangItem = LangItem("nbp_vrc", "user.reply_index_add")
+    did_you_mean: LangItem = LangItem("nbp_vrc", "user.did_you_mean")
 
 
 class NbpVrcWorld:
@@ -92,6 +93,8 @@ class NbpVrcWorld:
     no_world_found: LangItem = LangItem("nbp_vrc", "world.no_world_found")
     searched_world_tip: LangItem = LangItem("nbp_vrc", "world.searched_world_tip")
     searched_world_info: LangItem = LangItem("nbp_vrc", "world.searched_world_info")
+    no_recent_locations: LangItem = LangItem("nbp_vrc", "world.no_recent_locations")
+    did_you_mean: LangItem = LangItem("nbp_vrc", "world.did_you_mean")
 
 
 class NbpVrcLocale:
@@ -127,6 +130,71 @@ class NbpVrcEconomy:
     help: LangItem = LangItem("nbp_vrc", "economy.help")
 
 
+class NbpVrcGroup:
+    send_group_ids: LangItem = LangItem("nbp_vrc", "group.send_group_ids")
+    no_active_instances: LangItem = LangItem("nbp_vrc", "group.no_active_instances")
+    occupancy_summary: LangItem = LangItem("nbp_vrc", "group.occupancy_summary")
+    busiest_worlds_title: LangItem = LangItem("nbp_vrc", "group.busiest_worlds_title")
+    busiest_world_item: LangItem = LangItem("nbp_vrc", "group.busiest_world_item")
+    busiest_instances_title: LangItem = LangItem(
+        "nbp_vrc",
+        "group.busiest_instances_title",
+    )
+    busiest_instance_item: LangItem = LangItem(
+        "nbp_vrc",
+        "group.busiest_instance_item",
+    )
+
+
+class NbpVrcFavorite:
+    invalid_type: LangItem = LangItem("nbp_vrc", "favorite.invalid_type")
+    no_favorites: LangItem = LangItem("nbp_vrc", "favorite.no_favorites")
+    favorites_title: LangItem = LangItem("nbp_vrc", "favorite.favorites_title")
+    favorite_group_title: LangItem = LangItem(
+        "nbp_vrc",
+        "favorite.favorite_group_title",
+    )
+    ungrouped: LangItem = LangItem("nbp_vrc", "favorite.ungrouped")
+    fetch_failed: LangItem = LangItem("nbp_vrc", "favorite.fetch_failed")
+    type_friend: LangItem = LangItem("nbp_vrc", "favorite.type_friend")
+    type_world: LangItem = LangItem("nbp_vrc", "favorite.type_world")
+    type_avatar: LangItem = LangItem("nbp_vrc", "favorite.type_avatar")
+    bulk_usage: LangItem = LangItem("nbp_vrc", "favorite.bulk_usage")
+    nothing_to_do: LangItem = LangItem("nbp_vrc", "favorite.nothing_to_do")
+    sync_summary: LangItem = LangItem("nbp_vrc", "favorite.sync_summary")
+    sync_move_item: LangItem = LangItem("nbp_vrc", "favorite.sync_move_item")
+    sync_over_limit: LangItem = LangItem("nbp_vrc", "favorite.sync_over_limit")
+    sync_in_other_groups: LangItem = LangItem(
+        "nbp_vrc",
+        "favorite.sync_in_other_groups",
+    )
+    sync_in_other_group_item: LangItem = LangItem(
+        "nbp_vrc",
+        "favorite.sync_in_other_group_item",
+    )
+    sync_result: LangItem = LangItem("nbp_vrc", "favorite.sync_result")
+    sync_failed_item: LangItem = LangItem("nbp_vrc", "favorite.sync_failed_item")
+
+
+class NbpVrcSubscribe:
+    send_friend_names: LangItem = LangItem("nbp_vrc", "subscribe.send_friend_names")
+    friends_not_found: LangItem = LangItem("nbp_vrc", "subscribe.friends_not_found")
+    name_separator: LangItem = LangItem("nbp_vrc", "subscribe.name_separator")
+    subscribed_all: LangItem = LangItem("nbp_vrc", "subscribe.subscribed_all")
+    subscribed_friends: LangItem = LangItem("nbp_vrc", "subscribe.subscribed_friends")
+    no_subscription: LangItem = LangItem("nbp_vrc", "subscribe.no_subscription")
+    unsubscribed: LangItem = LangItem("nbp_vrc", "subscribe.unsubscribed")
+    subscribed_all_tip: LangItem = LangItem("nbp_vrc", "subscribe.subscribed_all_tip")
+    subscribed_list_title: LangItem = LangItem(
+        "nbp_vrc",
+        "subscribe.subscribed_list_title",
+    )
+    presence_title: LangItem = LangItem("nbp_vrc", "subscribe.presence_title")
+    presence_online: LangItem = LangItem("nbp_vrc", "subscribe.presence_online")
+    presence_location: LangItem = LangItem("nbp_vrc", "subscribe.presence_location")
+    presence_offline: LangItem = LangItem("nbp_vrc", "subscribe.presence_offline")
+
+
 class NbpVrc:
     words = NbpVrcWords
     time = NbpVrcTime
@@ -138,6 +206,9 @@ class NbpVrc:
     locale = NbpVrcLocale
     notif = NbpVrcNotif
     economy = NbpVrcEconomy
+    group = NbpVrcGroup
+    favorite = NbpVrcFavorite
+    subscribe = NbpVrcSubscribe
 
 
 class Lang(LangModel):
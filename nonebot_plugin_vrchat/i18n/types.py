@@ -41,6 +41,7 @@ class I18NUser(BaseModel):
     send_user_name: str
     no_user_found: str
     searched_user_tip: str
+    did_you_mean: str
 
 
 class I18NWorld(BaseModel):
@@ -48,6 +49,8 @@ class I18NWorld(BaseModel):
     no_world_found: str
     searched_world_tip: str
     searched_world_info: str
+    no_recent_locations: str
+    did_you_mean: str
 
 
 class I18NLocale(BaseModel):
@@ -56,6 +59,22 @@ class I18NLocale(BaseModel):
     locale_changed: str
 
 
+class I18NSubscribe(BaseModel):
+    send_friend_names: str
+    friends_not_found: str
+    name_separator: str
+    subscribed_all: str
+    subscribed_friends: str
+    no_subscription: str
+    unsubscribed: str
+    subscribed_all_tip: str
+    subscribed_list_title: str
+    presence_title: str
+    presence_online: str
+    presence_location: str
+    presence_offline: str
+
+
 class I18N(BaseModel):
     metadata: I18NMetadata
     general: I18NGeneral
@@ -64,3 +83,4 @@ class I18N(BaseModel):
     user: I18NUser
     world: I18NWorld
     locale: I18NLocale
+    subscribe: I18NSubscribe
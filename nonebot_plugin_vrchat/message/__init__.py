@@ -2,4 +2,5 @@
 from .friend import draw_user_card_overview as draw_user_card_overview
 from .friend import draw_user_profile_card as draw_user_profile_card
 from .notifications import draw_notification_card as draw_notification_card
+from .world import draw_recent_locations_card as draw_recent_locations_card
 from .world import draw_world_card_overview as draw_world_card_overview
@@ -1,12 +1,14 @@
+from collections.abc import Sequence
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 from nonebot import logger
 from nonebot_plugin_htmlrender import template_to_pic as t2p
 
 from ..config import env_config
-from ..vrchat import ApiClient, LimitedUserModel, UserModel
+from ..vrchat import ApiClient, FriendRecord, LimitedUserModel, UserModel
 from .utils import (
     OFFLINE_STATUSES as OFFLINE,
 )
@@ -39,7 +41,7 @@ template_path = str(Path(__file__).parent / "templates")
 
 
 async def draw_user_card_overview(
-    users: List[LimitedUserModel],
+    users: Sequence[Union[LimitedUserModel, FriendRecord]],
     group: bool = True,
     client: Optional[ApiClient] = None,
     title: str = "好友列表",
@@ -51,7 +53,10 @@ async def draw_user_card_overview(
 
     logger.debug("开始处理每个用户信息")
     # user_processing_start = time.perf_counter()
-    for idx, user in enumerate(users):
+    records = (
+        x if isinstance(x, FriendRecord) else FriendRecord.from_model(x) for x in users
+    )
+    for idx, user in enumerate(records):
         # 计算location_content
         if user.status in OFFLINE:
             if user.last_login:
@@ -78,15 +83,15 @@ async def draw_user_card_overview(
                 "display_name": user.display_name,
                 "current_avatar_thumbnail_image_url": user.current_avatar_thumbnail_image_url,
                 "trust": user.trust,
+                "trust_rank": user.trust_rank,
             },
         )
 
     # 排序
     if group:
         user_dict = {k: raw_user_dict[k] for k in S_DESC if k in raw_user_dict}
-        trust_keys = list(T_COLORS.keys())
         for li in user_dict.values():
-            li.sort(key=lambda x: trust_keys.index(x["trust"]), reverse=True)
+            li.sort(key=itemgetter("trust_rank"), reverse=True)
     else:
         user_dict = {"unknown": [x for y in raw_user_dict.values() for x in y]}
 
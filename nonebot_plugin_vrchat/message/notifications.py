@@ -1,18 +1,85 @@
+import asyncio
+from collections.abc import Iterable
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 
 from loguru import logger
 from nonebot_plugin_htmlrender import template_to_pic as t2p
-from vrchatapi import Notification
 
+from ..config import env_config
+from ..vrchat import ApiClient, NotificationModel, get_users
+from .utils import get_thumbnail_data_url
 from .utils import td_format as td_fmt
 
+DEFAULT_AVATAR = "default.png"
+AVATAR_RESOLVE_BUDGET = 3.0
+"""解析全部发送者头像的总时间预算，单位秒，超时的头像使用默认头像"""
+AVATAR_RESOLVE_CONCURRENCY = 8
+AVATAR_THUMBNAIL_SIZE = (96, 96)
+
+
+async def resolve_user_avatars(
+    client: ApiClient,
+    user_ids: Iterable[str],
+    budget: float = AVATAR_RESOLVE_BUDGET,
+) -> Dict[str, str]:
+    """
+    并发解析一批用户的头像，相同用户与相同图片只解析一次
+
+    用户信息与图片都经过缓存，在时间预算内未完成或失败的用户不会出现在结果中
+
+    Args:
+        client: ApiClient 实例
+        user_ids: 用户 ID
+        budget: 总时间预算，单位秒
+
+    Returns:
+        用户 ID -> 头像 data URL
+    """
+
+    ret: Dict[str, str] = {}
+
+    async def resolve_url(url: str, uids: List[str]):
+        try:
+            data_url = await get_thumbnail_data_url(url, AVATAR_THUMBNAIL_SIZE)
+        except Exception as e:
+            logger.debug(f"Failed to resolve avatar {url}: {type(e).__name__}: {e}")
+            return
+        ret.update(dict.fromkeys(uids, data_url))
+
+    async def resolve():
+        users = await get_users(client, user_ids, AVATAR_RESOLVE_CONCURRENCY)
+        urls: Dict[str, List[str]] = {}
+        for uid, user in users.items():
+            url = (
+                user.user_icon
+                or user.profile_pic_override_thumbnail
+                or user.current_avatar_thumbnail_image_url
+            )
+            if url:
+                urls.setdefault(url, []).append(uid)
+            else:
+                ret[uid] = DEFAULT_AVATAR
+        await asyncio.gather(*(resolve_url(k, v) for k, v in urls.items()))
+
+    try:
+        await asyncio.wait_for(resolve(), budget)
+    except asyncio.TimeoutError:
+        logger.debug(f"Avatars not fully resolved within {budget}s")
+    return ret
+
 
 async def draw_notification_card(
-    ntfs: List[Notification],
-    # client: Optional[ApiClient] = None,
+    ntfs: List[NotificationModel],
+    client: Optional[ApiClient] = None,
 ):
+    avatars = (
+        await resolve_user_avatars(client, (x.sender_user_id for x in ntfs))
+        if client and env_config.vrchat_avatar
+        else {}
+    )
+
     templates = []
     for index, ntf in enumerate(ntfs):
         time_now = datetime.now(timezone.utc)
@@ -22,17 +89,15 @@ async def draw_notification_card(
         templates.append(
             {
                 "type": ntf.type,
-                # 读取头像太慢，用默认头像
-                # "avatar": await id_to_avatar(client,ntf.sender_user_id),
-                "avatar": "default.png",
+                "avatar": avatars.get(ntf.sender_user_id, DEFAULT_AVATAR),
                 "td": td[:-2],
                 "message": ntf.message,
                 "sender_username": ntf.sender_username,
                 "index": index + 1,
             },
         )
-    # 渲染图片
-    logger.info(templates)
+    # 渲染图片，模板数据中含有头像 data URL，不直接输出到日志
+    logger.debug(f"Rendering {len(templates)} notification(s)")
     return await t2p(
         template_path=str(Path(__file__).parent / "templates"),
         template_name="ntf.html",
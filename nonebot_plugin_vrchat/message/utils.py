@@ -19,9 +19,11 @@ from ..i18n.model import Lang
 from ..vrchat import (
     ApiClient,
     LimitedUserModel,
+    Location,
     NormalizedStatusType,
     TrustType,
-    get_world,
+    get_world_cached,
+    parse_location,
 )
 
 T = TypeVar("T")
@@ -168,47 +170,42 @@ async def fetch_image_bytes(url: str, timeout: float = 3.0) -> Optional[bytes]:
         return None
 
 
+def format_location_prefix(loc: Location) -> str:
+    """实例类型的描述，例如 `好友+`"""
+    if loc.access_type == "group":
+        if loc.group_access_type == "members":
+            return LOCATION_GROUP_PREFIX
+        if loc.group_access_type == "plus":
+            return LOCATION_GROUP_PLUS_PREFIX
+        return LOCATION_GROUP_PUB_PREFIX
+    if loc.access_type == "private":
+        if loc.can_request_invite:
+            return LOCATION_INVITE_PLUS_PREFIX
+        return LOCATION_INVITE_PREFIX
+    if loc.access_type == "friends":
+        return LOCATION_FRIENDS_PREFIX
+    if loc.access_type == "hidden":
+        return LOCATION_FRIENDS_PLUS_PREFIX
+    return LOCATION_PUB_PREFIX
+
+
 async def format_location(client: Optional[ApiClient], location: Optional[str]):
     if not location:
         return ""
-    if location == "traveling":
+
+    loc = parse_location(location)
+    if loc.is_offline:
+        return ""
+    if loc.is_traveling:
         return LOCATION_TRAVELING_TIP
-    if location == "private":
+    if loc.is_private:
         return LOCATION_PRIVATE_TIP
 
-    world_id = location.split(":")[0]
-    # logger.debug(f"location: {location}, world_id: {world_id}")
-    region = (
-        location[location.find("region(") + 7 : location.find(")")].upper()
-        if "region(" in location
-        else None
-    )
-
-    if "group" in location:
-        if "groupAccessType(members)" in location:
-            prefix = LOCATION_GROUP_PREFIX
-        elif "groupAccessType(plus)" in location:
-            prefix = LOCATION_GROUP_PLUS_PREFIX
-        else:  # elif "groupAccessType(public)" in location:
-            prefix = LOCATION_GROUP_PUB_PREFIX
-
-    elif "private" in location:
-        if "canRequestInvite" in location:
-            prefix = LOCATION_INVITE_PLUS_PREFIX
-        else:
-            prefix = LOCATION_INVITE_PREFIX
-
-    elif "friends" in location:
-        prefix = LOCATION_FRIENDS_PREFIX
-
-    elif "hidden" in location:
-        prefix = LOCATION_FRIENDS_PLUS_PREFIX
-
-    else:
-        prefix = LOCATION_PUB_PREFIX
+    world_id = loc.world_id
+    prefix = format_location_prefix(loc)
     try:
-        if client is not None:
-            world = await get_world(client, world_id)
+        if client is not None and world_id:
+            world = await get_world_cached(client, world_id)
             world_name = world.name
         else:
             world_name = UNKNOWN_WORLD_TIP
@@ -219,8 +216,8 @@ async def format_location(client: Optional[ApiClient], location: Optional[str]):
         )
 
     ret = f"{prefix} |"
-    if region:
-        ret = f"{ret} {region} |"
+    if loc.region:
+        ret = f"{ret} {loc.region.upper()} |"
     return f"{ret}\n{world_name}"
 
 
@@ -292,7 +289,7 @@ async def get_image_or_default(
     return f"{base64.b64encode(img).decode('utf-8')}"
 
 
-@alru_cache()
+@alru_cache(maxsize=256, ttl=3600)
 async def get_url_bytes(
     url: str,
     default_size: Optional[Tuple[int, int]] = None,
@@ -322,6 +319,12 @@ async def get_url_bytes(
         return img_bytes
 
 
+async def get_thumbnail_data_url(url: str, size: Tuple[int, int]) -> str:
+    """获取缩小后的 PNG 图片并转为 data URL，图片经过 `get_url_bytes` 缓存"""
+    img_bytes = await get_url_bytes(url, size)
+    return f"data:image/png;base64,{base64.b64encode(img_bytes).decode()}"
+
+
 def cols_get(cols: int):
     if cols <= 6:
         return 1
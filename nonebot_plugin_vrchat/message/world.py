@@ -4,7 +4,8 @@ from typing import List
 from loguru import logger
 from nonebot_plugin_htmlrender import template_to_pic as t2p
 
-from ..vrchat import LimitedUserModel
+from ..vrchat import LimitedUserModel, RecentLocation
+from .utils import UNKNOWN_WORLD_TIP, format_location_prefix
 
 
 async def draw_world_card_overview(
@@ -31,3 +32,36 @@ async def draw_world_card(
         template_name="world_list.html",
         templates={"worlds": templates},
     )
+
+
+async def draw_recent_locations_card(
+    entries: List[RecentLocation],
+    title: str = "最近访问的位置",
+) -> bytes:
+    """
+    绘制最近访问位置的卡片
+
+    Args:
+        entries: `resolve_recent_locations` 的结果
+        title: 标题
+    """
+
+    templates = []
+    for loc, world in entries:
+        templates.append(
+            {
+                "world_name": world.name if world else UNKNOWN_WORLD_TIP,
+                "thumbnail": world.thumbnail_image_url if world else "default.png",
+                "author_name": world.author_name if world else "",
+                "capacity": world.capacity if world else 0,
+                "instance_name": loc.name or "",
+                "access": format_location_prefix(loc),
+                "region": loc.region.upper() if loc.region else "",
+            },
+        )
+    logger.debug(f"Rendering {len(templates)} recent location(s)")
+    return await t2p(
+        template_path=str(Path(__file__).parent / "templates"),
+        template_name="recent_locations.html",
+        templates={"title": title, "entries": templates},
+    )
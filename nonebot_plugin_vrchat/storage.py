@@ -0,0 +1,280 @@
+import asyncio
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from nonebot import get_driver, logger
+from nonebot.utils import run_sync
+
+from .config import DATA_DIR
+
+try:
+    import ujson as json
+except ImportError:
+    import json
+
+DB_PATH = DATA_DIR / "storage.db"
+LEGACY_MESSAGE_DIR = DATA_DIR / "msg_id"
+
+MESSAGE_TTL = 3 * 24 * 60 * 60
+"""消息映射的默认有效期，单位秒"""
+FLUSH_DELAY = 0.5
+"""写入缓冲的最长等待时间，单位秒"""
+FLUSH_SIZE = 64
+"""写入缓冲达到此数量时立即写入"""
+PURGE_INTERVAL = 60 * 60
+"""清理过期数据的最小间隔，单位秒"""
+
+driver = get_driver()
+
+
+def dump_compressed(data: Any) -> bytes:
+    return zlib.compress(json.dumps(data, ensure_ascii=False).encode("u8"))
+
+
+def load_compressed(raw: bytes) -> Any:
+    return json.loads(zlib.decompress(raw).decode("u8"))
+
+
+class SQLiteDatabase:
+    """
+    对 `sqlite3` 的简单异步包装
+
+    连接使用 WAL 模式，所有操作在线程池中执行，并通过锁保证同一时间只有一个线程访问连接
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if not self._conn:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn = conn
+        return self._conn
+
+    def execute_sync(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        with self._lock, self.conn:
+            return self.conn.execute(sql, params).fetchall()
+
+    def executemany_sync(self, sql: str, params: Iterable[Sequence[Any]]):
+        with self._lock, self.conn:
+            self.conn.executemany(sql, params)
+
+    def executescript_sync(self, sql: str):
+        with self._lock, self.conn:
+            self.conn.executescript(sql)
+
+    async def execute(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        return await run_sync(self.execute_sync)(sql, params)
+
+    async def executemany(self, sql: str, params: Iterable[Sequence[Any]]):
+        await run_sync(self.executemany_sync)(sql, list(params))
+
+    def close(self):
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
+
+database = SQLiteDatabase(DB_PATH)
+
+
+class MessageStore:
+    """
+    消息 ID 到查询结果的映射，带有效期
+
+    写入先进入内存缓冲，在 `FLUSH_DELAY` 秒后或缓冲达到 `FLUSH_SIZE` 条时批量写入数据库，
+    数据使用 zlib 压缩后的 JSON 保存
+    """
+
+    def __init__(self, db: SQLiteDatabase) -> None:
+        self.db = db
+        self._pending: Dict[Tuple[str, str], Tuple[bytes, float]] = {}
+        self._flushing: List[Dict[Tuple[str, str], Tuple[bytes, float]]] = []
+        """正在写入数据库的缓冲，写入完成前仍从这里读取"""
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional["asyncio.Task[None]"] = None
+        self._last_purge = 0.0
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def init_sync(self):
+        with self._init_lock:
+            if not self._initialized:
+                self._init_table()
+                migrate_legacy_messages(self)
+                self._initialized = True
+
+    def _init_table(self):
+        self.db.executescript_sync(
+            """
+            CREATE TABLE IF NOT EXISTS message_map (
+                namespace TEXT NOT NULL,
+                msg_id TEXT NOT NULL,
+                data BLOB NOT NULL,
+                expire_at REAL NOT NULL,
+                PRIMARY KEY (namespace, msg_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_message_map_expire
+                ON message_map (expire_at);
+            """,
+        )
+
+    async def set(
+        self,
+        namespace: str,
+        msg_id: str,
+        data: Any,
+        ttl: float = MESSAGE_TTL,
+    ):
+        """
+        写入消息映射
+
+        Args:
+            namespace: 命名空间
+            msg_id: 消息 ID
+            data: 可被 JSON 序列化的数据
+            ttl: 有效期，单位秒
+        """
+
+        self._pending[(namespace, msg_id)] = (
+            dump_compressed(data),
+            time.time() + ttl,
+        )
+        if len(self._pending) >= FLUSH_SIZE:
+            await self.flush()
+        elif not self._flush_handle:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(FLUSH_DELAY, self._schedule_flush)
+
+    async def get(self, namespace: str, msg_id: str) -> Any:
+        """读取消息映射，不存在或已过期时返回 `None`"""
+
+        now = time.time()
+        key = (namespace, msg_id)
+        pending = self._pending.get(key) or next(
+            (x[key] for x in reversed(self._flushing) if key in x),
+            None,
+        )
+        if pending:
+            raw, expire_at = pending
+            return load_compressed(raw) if expire_at > now else None
+
+        await run_sync(self.init_sync)()
+        rows = await self.db.execute(
+            "SELECT data FROM message_map "
+            "WHERE namespace = ? AND msg_id = ? AND expire_at > ?",
+            (namespace, msg_id, now),
+        )
+        return load_compressed(rows[0][0]) if rows else None
+
+    def _schedule_flush(self):
+        self._flush_handle = None
+        self._flush_task = asyncio.create_task(self.flush())
+
+    def write_sync(self, pending: Dict[Tuple[str, str], Tuple[bytes, float]]):
+        """将缓冲中的数据写入数据库，并按间隔清理过期数据"""
+
+        self.init_sync()
+        if pending:
+            self.db.executemany_sync(
+                "INSERT OR REPLACE INTO message_map "
+                "(namespace, msg_id, data, expire_at) VALUES (?, ?, ?, ?)",
+                (
+                    (ns, msg_id, raw, expire_at)
+                    for (ns, msg_id), (raw, expire_at) in pending.items()
+                ),
+            )
+
+        now = time.time()
+        if now - self._last_purge >= PURGE_INTERVAL:
+            self._last_purge = now
+            self.db.execute_sync(
+                "DELETE FROM message_map WHERE expire_at <= ?",
+                (now,),
+            )
+
+    async def flush(self):
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, {}
+        self._flushing.append(pending)
+        try:
+            await run_sync(self.write_sync)(pending)
+        except Exception:
+            logger.exception("Failed to flush message store")
+            # 放回缓冲，等待下一次写入时重试，期间写入的新数据优先
+            self._pending = {**pending, **self._pending}
+        finally:
+            self._flushing.remove(pending)
+
+
+message_store = MessageStore(database)
+
+
+def migrate_legacy_messages(store: MessageStore):
+    """
+    将旧版本 `data/vrchat/msg_id/` 下每条消息一个的 JSON 文件导入数据库，导入后删除原文件
+
+    原文件的修改时间视为写入时间，已超过有效期的文件直接删除；
+    无法解析的文件重命名为 `*.json.broken` 保留
+    """
+
+    if not LEGACY_MESSAGE_DIR.is_dir():
+        return
+
+    now = time.time()
+    rows: List[Tuple[str, str, bytes, float]] = []
+    files = list(LEGACY_MESSAGE_DIR.glob("*.json"))
+    # 已导入或已过期、可以删除的文件
+    done: List[Path] = []
+    for path in files:
+        expire_at = path.stat().st_mtime + MESSAGE_TTL
+        if expire_at <= now:
+            done.append(path)
+            continue
+        try:
+            data = json.loads(path.read_text(encoding="u8"))
+        except Exception:
+            logger.warning(f"Renamed broken legacy message file: {path.name}.broken")
+            path.replace(path.with_name(f"{path.name}.broken"))
+            continue
+        rows.append(
+            (LEGACY_MESSAGE_DIR.name, path.stem, dump_compressed(data), expire_at),
+        )
+        done.append(path)
+
+    store.db.executemany_sync(
+        "INSERT OR IGNORE INTO message_map "
+        "(namespace, msg_id, data, expire_at) VALUES (?, ?, ?, ?)",
+        rows,
+    )
+    for path in done:
+        path.unlink(missing_ok=True)
+    try:
+        LEGACY_MESSAGE_DIR.rmdir()
+    except OSError:
+        logger.warning(f"Legacy message directory not empty: {LEGACY_MESSAGE_DIR}")
+
+    logger.info(
+        f"Migrated {len(rows)} of {len(files)} legacy message file(s) to {DB_PATH.name}",
+    )
+
+
+@driver.on_shutdown
+async def _():
+    await message_store.flush()
+    database.close()
@@ -0,0 +1,235 @@
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from nonebot import get_driver, logger
+from nonebot_plugin_alconna import Target, UniMessage
+from pydantic import BaseModel, Field, PrivateAttr
+
+from .config import SUBSCRIBE_CONFIG_PATH, ConfigBaseModel, env_config
+from .i18n import Lang
+from .message.utils import format_location as fmt_loc
+from .vrchat import (
+    ApiClient,
+    NotLoggedInError,
+    PresenceEvent,
+    PresenceSnapshot,
+    build_presence_snapshot,
+    diff_presence,
+    get_client,
+    get_friends,
+    list_logged_in_sessions,
+    pipeline_manager,
+)
+
+MAX_LINES_PER_MESSAGE = 20
+
+driver = get_driver()
+
+
+class FriendSubscription(BaseModel):
+    """一个会话对某个账号好友动态的订阅"""
+
+    target: Dict[str, Any]
+    """推送目标，`Target.dump()` 的结果"""
+    friends: List[str] = Field(default_factory=list)
+    """关注的好友 ID"""
+    all_friends: bool = False
+    """是否关注该账号的全部好友"""
+
+
+class SubscribeConfig(ConfigBaseModel):
+    _path: Path = PrivateAttr(default=SUBSCRIBE_CONFIG_PATH)
+
+    subscriptions: Dict[str, Dict[str, FriendSubscription]] = Field(
+        default_factory=dict,
+    )
+    """Group SessionID -> 订阅者 User SessionID -> 订阅信息"""
+
+
+subscribe_config = SubscribeConfig()
+
+# 订阅者 User SessionID -> 上一次的好友在线状态快照
+_snapshots: Dict[str, PresenceSnapshot] = {}
+_poll_task: Optional["asyncio.Task[None]"] = None
+
+
+def get_subscriptions(group_id: str) -> Dict[str, FriendSubscription]:
+    """获取会话中的全部订阅，键为订阅者 User SessionID"""
+    return subscribe_config.subscriptions.get(group_id, {})
+
+
+def add_subscription(
+    group_id: str,
+    owner: str,
+    target: Target,
+    friend_ids: Optional[List[str]] = None,
+) -> FriendSubscription:
+    """
+    添加订阅，已存在时合并关注的好友
+
+    Args:
+        group_id: 会话 Group SessionID
+        owner: 订阅者 User SessionID，使用此账号的好友列表
+        target: 推送目标
+        friend_ids: 关注的好友 ID，为 `None` 时关注全部好友
+
+    Returns:
+        合并后的订阅信息
+    """
+
+    subs = subscribe_config.subscriptions.setdefault(group_id, {})
+    sub = subs.get(owner) or FriendSubscription(target=target.dump())
+    sub.target = target.dump()
+    if friend_ids is None:
+        sub.all_friends = True
+    else:
+        sub.friends = list(dict.fromkeys([*sub.friends, *friend_ids]))
+    subs[owner] = sub
+    subscribe_config.save()
+    return sub
+
+
+def remove_subscription(
+    group_id: str,
+    owner: str,
+    friend_ids: Optional[List[str]] = None,
+) -> bool:
+    """
+    取消订阅
+
+    Args:
+        group_id: 会话 Group SessionID
+        owner: 订阅者 User SessionID
+        friend_ids: 取消关注的好友 ID，为 `None` 时取消该订阅者在此会话的全部订阅
+
+    Returns:
+        是否存在对应的订阅
+    """
+
+    subs = subscribe_config.subscriptions.get(group_id)
+    if not subs or owner not in subs:
+        return False
+
+    sub = subs[owner]
+    if friend_ids is None:
+        del subs[owner]
+    else:
+        sub.friends = [x for x in sub.friends if x not in friend_ids]
+        if not sub.friends and not sub.all_friends:
+            del subs[owner]
+
+    if not subs:
+        del subscribe_config.subscriptions[group_id]
+    subscribe_config.save()
+    return True
+
+
+async def format_presence_event(client: ApiClient, event: PresenceEvent) -> str:
+    if event.type == "offline":
+        return Lang.nbp_vrc.subscribe.presence_offline(name=event.display_name)
+
+    assert event.new
+    location = await fmt_loc(client, event.new.location)
+    if event.type == "online":
+        return Lang.nbp_vrc.subscribe.presence_online(
+            name=event.display_name,
+            location=location,
+        )
+    return Lang.nbp_vrc.subscribe.presence_location(
+        name=event.display_name,
+        location=location,
+    )
+
+
+async def send_batched(target: Target, lines: List[str]):
+    """将多条动态合并为少量消息发送，每条消息之间保持最小间隔"""
+    title = Lang.nbp_vrc.subscribe.presence_title()
+    for i in range(0, len(lines), MAX_LINES_PER_MESSAGE):
+        chunk = lines[i : i + MAX_LINES_PER_MESSAGE]
+        try:
+            await UniMessage.text("\n".join([title, *chunk])).send(target=target)
+        except Exception:
+            logger.exception(f"Failed to push friend presence to {target}")
+            return
+        await asyncio.sleep(env_config.vrchat_subscribe_send_interval)
+
+
+async def poll_owner(owner: str, subs: List[FriendSubscription]):
+    """获取一个订阅者的好友状态，与上一次快照对比后推送给订阅了它的会话"""
+
+    old = _snapshots.get(owner)
+    pipeline = pipeline_manager.get(owner)
+    if pipeline:
+        # pipeline 已在本地维护好友状态，无需再请求接口
+        client = pipeline.client
+        new = pipeline.friends.snapshot(old)
+    else:
+        client = await get_client(owner)
+        users = [x async for x in get_friends(client, offline=False)]
+        new = build_presence_snapshot(users, old)
+    _snapshots[owner] = new
+    if old is None:
+        return  # 首次获取只作为基准，不推送
+
+    events = diff_presence(old, new)
+    if not events:
+        return
+
+    # 同一个事件可能推送给多个会话，只格式化一次
+    formatted: Dict[PresenceEvent, str] = {}
+    for sub in subs:
+        watched = None if sub.all_friends else set(sub.friends)
+        lines: List[str] = []
+        for event in events:
+            if watched is not None and event.user_id not in watched:
+                continue
+            if event not in formatted:
+                formatted[event] = await format_presence_event(client, event)
+            lines.append(formatted[event])
+        if lines:
+            await send_batched(Target.load(sub.target), lines)
+
+
+async def poll_once():
+    owners: Dict[str, List[FriendSubscription]] = {}
+    for subs in subscribe_config.subscriptions.values():
+        for owner, sub in subs.items():
+            owners.setdefault(owner, []).append(sub)
+
+    for owner in set(_snapshots) - set(owners):
+        del _snapshots[owner]
+
+    for owner, subs in owners.items():
+        try:
+            await poll_owner(owner, subs)
+        except NotLoggedInError:
+            logger.warning(f"Subscription owner is not logged in: {owner}")
+        except Exception:
+            logger.exception(f"Error when polling friend presence: {owner}")
+
+
+async def poll_loop():
+    while True:
+        await poll_once()
+        await asyncio.sleep(env_config.vrchat_subscribe_interval)
+
+
+@driver.on_startup
+async def _():
+    global _poll_task
+    if env_config.vrchat_pipeline:
+        for session_id in await list_logged_in_sessions():
+            try:
+                await pipeline_manager.start(session_id)
+            except NotLoggedInError:
+                logger.warning(f"Found cookies but has no login info: {session_id}")
+    if env_config.vrchat_subscribe_interval > 0:
+        _poll_task = asyncio.create_task(poll_loop())
+
+
+@driver.on_shutdown
+async def _():
+    if _poll_task:
+        _poll_task.cancel()
+    await pipeline_manager.stop_all()
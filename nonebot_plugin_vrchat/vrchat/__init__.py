@@ -31,17 +31,28 @@ from vrchatapi.exceptions import (
 
 # from vrchatapi.models.current_user import CurrentUser
 from .avatars import *
+from .cache import *
 from .client import *
+from .current_user import *
+from .download import *
 from .economy import *
+from .export import *
+from .favorite_sync import *
 from .favorites import *
 from .files import *
 from .friend import *
 from .groups import *
 from .instances import *
 from .inventory import *
+from .location import *
 from .login import *
+from .name_index import *
 from .notifications import *
+from .occupancy import *
+from .pipeline import *
+from .presence import *
 from .types import *
+from .upload import *
 from .users import *
 from .utils import *
 from .world import *
@@ -1,16 +1,21 @@
-from collections.abc import AsyncIterable, Awaitable
-from typing import TYPE_CHECKING, cast
+from collections.abc import AsyncIterable, Awaitable, Iterable
+from typing import TYPE_CHECKING, Dict, Optional, cast
 from typing_extensions import Unpack
 
 from nonebot.utils import run_sync
 from vrchatapi import ApiClient, Avatar, AvatarsApi, LimitedWorld
 
+from .cache import EntityCache, search_cache
+from .current_user import get_current_user_id
 from .types import AvatarModel, AvatarStyleModel, LimitedAvatarModel
 from .utils import (
+    HasDataProtocol,
     IterPFKwargs,
     auto_parse_iterator_return,
+    auto_parse_raw_return,
     auto_parse_return,
     iter_pagination_func,
+    parse_raw_models,
     user_agent,
 )
 
@@ -40,19 +45,25 @@ def search_avatars(
     client.user_agent = user_agent
     api = AvatarsApi(client)
 
-    @auto_parse_iterator_return(LimitedAvatarModel)
     @iter_pagination_func(**pf_kwargs)
-    async def iterator(page_size: int, offset: int) -> list[LimitedWorld]:
-        return await cast(
-            "Awaitable[list[LimitedWorld]]",
-            run_sync(api.search_avatars)(search=keyword, n=page_size, offset=offset),
+    @search_cache.cached_page("avatars", keyword)
+    async def iterator(page_size: int, offset: int):
+        resp = await cast(
+            "Awaitable[HasDataProtocol]",
+            run_sync(api.search_avatars)(
+                search=keyword,
+                n=page_size,
+                offset=offset,
+                _preload_content=False,
+            ),
         )
+        return parse_raw_models(LimitedAvatarModel, resp)
 
     return iterator()
 
 
-@auto_parse_return(AvatarModel)
-async def get_avatar(client: ApiClient, avatar_id: str) -> Avatar:
+@auto_parse_raw_return(AvatarModel)
+async def get_avatar(client: ApiClient, avatar_id: str) -> HasDataProtocol:
     """
     通过头像 ID 获取头像信息
 
@@ -66,22 +77,70 @@ async def get_avatar(client: ApiClient, avatar_id: str) -> Avatar:
     client.user_agent = user_agent
     api = AvatarsApi(client)
     return await cast(
-        "Awaitable[Avatar]",
-        run_sync(api.get_avatar)(avatar_id=avatar_id),
+        "Awaitable[HasDataProtocol]",
+        run_sync(api.get_avatar)(avatar_id=avatar_id, _preload_content=False),
     )
 
 
+GET_AVATARS_CONCURRENCY = 8
+
+avatar_cache: EntityCache[AvatarModel] = EntityCache(
+    get_avatar,
+    ttl=600,
+    maxsize=2048,
+)
+"""头像信息缓存，按查看者区分"""
+
+
+async def get_avatar_cached(client: ApiClient, avatar_id: str) -> AvatarModel:
+    """
+    通过头像 ID 获取头像信息，优先使用缓存
+
+    Args:
+        client: ApiClient 实例
+        avatar_id: 头像 ID
+
+    Returns:
+        头像信息
+
+    Raises:
+        NotFoundException: 头像不存在，此结果同样会被缓存
+    """
+    return await avatar_cache.get(client, avatar_id)
+
+
+async def get_avatars(
+    client: ApiClient,
+    avatar_ids: Iterable[str],
+    concurrency: int = GET_AVATARS_CONCURRENCY,
+) -> Dict[str, AvatarModel]:
+    """
+    批量获取头像信息，优先使用缓存，未命中的头像并发请求
+
+    Args:
+        client: ApiClient 实例
+        avatar_ids: 头像 ID，重复的 ID 只会请求一次
+        concurrency: 最大并发请求数
+
+    Returns:
+        头像 ID -> 头像信息，按传入顺序排列，不存在或获取失败的头像不会出现在结果中
+    """
+    return await avatar_cache.get_many(client, avatar_ids, concurrency)
+
+
 @auto_parse_return(AvatarModel)
-async def get_own_avatar(client: ApiClient, user_id: str) -> Avatar:
+async def get_own_avatar(client: ApiClient, user_id: Optional[str] = None) -> Avatar:
     """
     获取当前用户装备的头像信息
 
     Args:
         client: ApiClient 实例
+        user_id: 当前用户 ID，为 `None` 时使用缓存的当前用户信息
 
     Returns:
         当前用户装备的头像信息
     """
+    user_id = user_id or await get_current_user_id(client)
     client.user_agent = user_agent
     api = AvatarsApi(client)
     return await cast(
@@ -132,13 +191,15 @@ async def update_avatar(
     """
     client.user_agent = user_agent
     api = AvatarsApi(client)
-    return await cast(
+    result = await cast(
         "Awaitable[Avatar]",
         run_sync(api.update_avatar)(
             avatar_id=avatar_id,
             update_avatar_request=update_avatar_request,
         ),
     )
+    avatar_cache.invalidate(avatar_id)
+    return result
 
 
 async def delete_avatar(client: ApiClient, avatar_id: str) -> bool:
@@ -155,6 +216,7 @@ async def delete_avatar(client: ApiClient, avatar_id: str) -> bool:
     client.user_agent = user_agent
     api = AvatarsApi(client)
     await run_sync(api.delete_avatar)(avatar_id=avatar_id)
+    avatar_cache.invalidate(avatar_id)
     return True
 
 
@@ -0,0 +1,292 @@
+import asyncio
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Awaitable, Iterable, Iterator
+from functools import wraps
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from nonebot import logger
+from vrchatapi import ApiClient
+from vrchatapi.exceptions import NotFoundException, UnauthorizedException
+
+from .utils import PaginationCallable
+
+K = TypeVar("K")
+V = TypeVar("V")
+T = TypeVar("T")
+
+EntityCacheKey = Tuple[str, str]
+"""(查看者用户名, 实体 ID)"""
+
+
+class TTLCache(Generic[K, V]):
+    """
+    带过期时间与容量上限的内存缓存
+
+    超出容量时淘汰最久未使用的条目，过期条目在读取时惰性删除
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024) -> None:
+        """
+        Args:
+            ttl: 条目有效期，单位秒
+            maxsize: 最大条目数
+        """
+
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: K) -> Optional[V]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expire_at, value = item
+        if expire_at <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None):
+        """
+        写入缓存
+
+        Args:
+            key: 键
+            value: 值
+            ttl: 单独指定此条目的有效期，为 `None` 时使用默认有效期
+        """
+
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __iter__(self) -> Iterator[K]:
+        """遍历所有条目的键，可能包含未清理的过期条目，遍历期间可以修改缓存"""
+        return iter(list(self._data))
+
+    def pop(self, key: K) -> Optional[V]:
+        item = self._data.pop(key, None)
+        return item[1] if item else None
+
+    def clear(self):
+        self._data.clear()
+
+
+def get_viewer_key(client: ApiClient) -> str:
+    """区分缓存查看者的键，使用登录用户名"""
+    return client.configuration.username or ""
+
+
+class EntityCache(Generic[V]):
+    """
+    按查看者区分的实体缓存，用于用户、群组等通过 ID 获取的数据
+
+    好友状态、成员状态等字段对不同查看者不同，所以缓存键包含查看者；
+    返回 404 的 ID 同样会被缓存一段较短的时间，避免重复请求；
+    同一查看者对同一 ID 的并发请求共用一个获取任务
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[ApiClient, str], Awaitable[V]],
+        ttl: float = 300,
+        maxsize: int = 2048,
+        not_found_ttl: float = 60,
+    ) -> None:
+        """
+        Args:
+            fetch: 未命中缓存时调用的获取函数
+            ttl: 条目有效期，单位秒
+            maxsize: 最大条目数
+            not_found_ttl: 不存在的 ID 的缓存有效期，单位秒
+        """
+
+        self.fetch = fetch
+        self.cache: TTLCache[EntityCacheKey, V] = TTLCache(ttl=ttl, maxsize=maxsize)
+        self.missing: TTLCache[EntityCacheKey, bool] = TTLCache(
+            ttl=not_found_ttl,
+            maxsize=maxsize // 2,
+        )
+        self._pending: Dict[EntityCacheKey, "asyncio.Task[V]"] = {}
+
+    def peek(self, client: ApiClient, entity_id: str) -> Optional[V]:
+        """只读取缓存，不发起请求"""
+        return self.cache.get((get_viewer_key(client), entity_id))
+
+    def set(self, client: ApiClient, entity_id: str, value: V):
+        self.cache.set((get_viewer_key(client), entity_id), value)
+
+    def invalidate(self, entity_id: str):
+        """从所有查看者的缓存中移除此 ID，正在进行的获取任务的结果也不会再写入缓存"""
+        for cache in (self.cache, self.missing):
+            for key in [x for x in cache if x[1] == entity_id]:
+                cache.pop(key)
+        for key in [x for x in self._pending if x[1] == entity_id]:
+            del self._pending[key]
+
+    async def get(self, client: ApiClient, entity_id: str) -> V:
+        """
+        获取实体，优先使用缓存
+
+        Raises:
+            NotFoundException: 实体不存在，此结果同样会被缓存
+        """
+
+        key = (get_viewer_key(client), entity_id)
+        if (value := self.cache.get(key)) is not None:
+            return value
+        if self.missing.get(key):
+            raise NotFoundException(status=404, reason="Not Found (cached)")
+
+        if not (task := self._pending.get(key)):
+            task = asyncio.create_task(self._fetch(client, key))
+            self._pending[key] = task
+        # 外部取消等待时不取消共用的获取任务
+        return await asyncio.shield(task)
+
+    async def _fetch(self, client: ApiClient, key: EntityCacheKey) -> V:
+        task = asyncio.current_task()
+        # 获取期间缓存被移除（例如实体被修改）时结果不再写入缓存
+        try:
+            value = await self.fetch(client, key[1])
+        except NotFoundException:
+            if self._pending.get(key) is task:
+                self.missing.set(key, True)
+            raise
+        else:
+            if self._pending.get(key) is task:
+                self.cache.set(key, value)
+            return value
+        finally:
+            if self._pending.get(key) is task:
+                del self._pending[key]
+
+    async def get_many(
+        self,
+        client: ApiClient,
+        entity_ids: Iterable[str],
+        concurrency: int = 8,
+    ) -> Dict[str, V]:
+        """
+        批量获取实体，未命中缓存的 ID 并发请求
+
+        Args:
+            client: ApiClient 实例
+            entity_ids: 实体 ID，重复的 ID 只会请求一次
+            concurrency: 最大并发请求数
+
+        Returns:
+            ID -> 实体，按传入顺序排列，不存在或获取失败的 ID 不会出现在结果中
+
+        Raises:
+            UnauthorizedException: 登录已失效
+        """
+
+        sem = asyncio.Semaphore(concurrency)
+
+        async def fetch(entity_id: str) -> Optional[V]:
+            async with sem:
+                try:
+                    return await self.get(client, entity_id)
+                except NotFoundException:
+                    return None
+                except UnauthorizedException:
+                    raise
+                except Exception as e:
+                    logger.debug(f"Failed to get {entity_id}: {type(e).__name__}: {e}")
+                    return None
+
+        ids = [x for x in dict.fromkeys(entity_ids) if x]
+        values = await asyncio.gather(*(fetch(x) for x in ids))
+        return {k: v for k, v in zip(ids, values) if v is not None}
+
+
+SearchCacheKey = Tuple[str, str, int, int]
+"""(搜索类型, 规范化后的关键词, 单页数量, 偏移量)"""
+
+
+def normalize_query(keyword: str) -> str:
+    """规范化搜索关键词：NFKC 归一化、忽略大小写并合并空白"""
+    return " ".join(unicodedata.normalize("NFKC", keyword).casefold().split())
+
+
+class SearchCache:
+    """
+    搜索结果缓存，以页为单位缓存各个 `search_*` 的结果
+
+    缓存在所有账号间共享，相同的关键词在有效期内只会请求一次，
+    结果中与查看者相关的字段（如 `is_friend`）可能来自其他账号的查询
+    """
+
+    def __init__(self, ttl: float = 120, maxsize: int = 512) -> None:
+        """
+        Args:
+            ttl: 条目有效期，单位秒
+            maxsize: 最多缓存的页数
+        """
+
+        self.cache: TTLCache[SearchCacheKey, List[Any]] = TTLCache(
+            ttl=ttl,
+            maxsize=maxsize,
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存命中统计"""
+
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "pages": len(self.cache),
+        }
+
+    def clear(self):
+        self.cache.clear()
+        self.hits = self.misses = 0
+
+    def cached_page(self, search_type: str, keyword: str):
+        """
+        用于装饰 `PaginationCallable` 的装饰器，为每一页的结果加上缓存，
+        应放在 `iter_pagination_func` 内侧
+
+        Args:
+            search_type: 搜索类型，如 `users`、`worlds`
+            keyword: 搜索关键词
+        """
+
+        query = normalize_query(keyword)
+
+        def decorator(func: PaginationCallable[T]) -> PaginationCallable[T]:
+            @wraps(func)
+            async def wrapper(page_size: int, offset: int) -> Optional[List[T]]:
+                key = (search_type, query, page_size, offset)
+                if (cached := self.cache.get(key)) is not None:
+                    self.hits += 1
+                    return cached
+
+                self.misses += 1
+                resp = await func(page_size, offset)
+                self.cache.set(key, list(resp or ()))
+                return resp
+
+            return wrapper
+
+        return decorator
+
+
+search_cache = SearchCache()
@@ -1,13 +1,23 @@
-from http.cookiejar import LWPCookieJar
-from typing import Optional
-
-from nonebot import logger
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from contextlib import suppress
+from http.cookiejar import Cookie, LWPCookieJar
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from nonebot import get_driver, logger
 from nonebot.utils import run_sync
 from pydantic import BaseModel
 from vrchatapi import ApiClient, Configuration, NotificationsApi
 from vrchatapi.exceptions import UnauthorizedException
 
 from ..config import DATA_DIR
+from ..storage import SQLiteDatabase
+from .current_user import invalidate_current_user
+from .name_index import user_index, world_index
 from .utils import user_agent
 
 # 关闭 `vrchatapi` 的客户端侧数据校验，这部分交给 pydantic 就行了
@@ -22,6 +32,28 @@ _last_usable_client: Optional[ApiClient] = None
 # 用户登录信息文件夹
 PLAYER_PATH = DATA_DIR / "player"
 PLAYER_PATH.mkdir(parents=True, exist_ok=True)
+CREDENTIAL_DB_PATH = PLAYER_PATH / "credentials.db"
+COOKIE_FLUSH_INTERVAL = 30.0
+"""检查并保存 Cookies 变化的间隔，单位秒"""
+
+COOKIE_ATTRS = (
+    "version",
+    "name",
+    "value",
+    "port",
+    "port_specified",
+    "domain",
+    "domain_specified",
+    "domain_initial_dot",
+    "path",
+    "path_specified",
+    "secure",
+    "expires",
+    "discard",
+    "comment",
+    "comment_url",
+    "rfc2109",
+)
 
 
 class NotLoggedInError(Exception):
@@ -35,27 +67,174 @@ class LoginInfo(BaseModel):
     password: str
 
 
-def save_client_cookies(client: ApiClient, session_id: str):
+def dump_cookies(cookies: Iterable[Cookie]) -> str:
+    """将 Cookies 序列化为 JSON"""
+    return json.dumps(
+        [
+            {**{k: getattr(x, k) for k in COOKIE_ATTRS}, "rest": x._rest}  # noqa: SLF001
+            for x in cookies
+        ],
+    )
+
+
+def load_cookies(raw: str) -> List[Cookie]:
+    """从 JSON 反序列化 Cookies，已过期的 Cookies 会被忽略"""
+    now = time.time()
+    cookies = [Cookie(**x) for x in json.loads(raw)]
+    return [x for x in cookies if not x.is_expired(now)]
+
+
+class CredentialStore:
+    """
+    保存所有用户登录信息与 Cookies 的 SQLite 数据库
+
+    每个用户一行，登录信息与 Cookies 在同一事务中写入，所有操作都在线程池中执行
+    """
+
+    def __init__(self, db: SQLiteDatabase) -> None:
+        self.db = db
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def init_sync(self):
+        with self._init_lock:
+            if not self._initialized:
+                self.db.executescript_sync(
+                    """
+                    CREATE TABLE IF NOT EXISTS credentials (
+                        session_id TEXT PRIMARY KEY,
+                        username TEXT NOT NULL,
+                        password TEXT NOT NULL,
+                        cookies TEXT,
+                        updated_at REAL NOT NULL
+                    );
+                    """,
+                )
+                migrate_legacy_credentials(self)
+                self._initialized = True
+
+    async def execute(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        await run_sync(self.init_sync)()
+        return await self.db.execute(sql, params)
+
+    async def save(
+        self,
+        session_id: str,
+        login_info: LoginInfo,
+        cookies: Optional[str] = None,
+    ):
+        await self.execute(
+            "INSERT INTO credentials "
+            "(session_id, username, password, cookies, updated_at) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (session_id) DO UPDATE SET "
+            "username = excluded.username, password = excluded.password, "
+            "cookies = excluded.cookies, updated_at = excluded.updated_at",
+            (
+                session_id,
+                login_info.username,
+                login_info.password,
+                cookies,
+                time.time(),
+            ),
+        )
+
+    async def save_cookies_many(self, items: Iterable[Tuple[str, Optional[str]]]):
+        """批量更新多个用户的 Cookies，用户不存在时忽略"""
+        await run_sync(self.init_sync)()
+        now = time.time()
+        await self.db.executemany(
+            "UPDATE credentials SET cookies = ?, updated_at = ? WHERE session_id = ?",
+            ((cookies, now, session_id) for session_id, cookies in items),
+        )
+
+
+credential_store = CredentialStore(SQLiteDatabase(CREDENTIAL_DB_PATH))
+
+
+def migrate_legacy_credentials(store: CredentialStore):
+    """将旧版本每个用户一个的 `.json` 登录信息与 `.cookies` 文件导入数据库，导入后删除原文件"""
+
+    rows: List[Tuple[str, str, str, Optional[str], float]] = []
+    migrated: List[Path] = []
+    for info_path in PLAYER_PATH.glob("*.json"):
+        session_id = info_path.stem
+        cookie_path = info_path.with_suffix(".cookies")
+        try:
+            info = LoginInfo.model_validate_json(info_path.read_text(encoding="utf-8"))
+            cookies = None
+            if cookie_path.exists():
+                cookie_jar = LWPCookieJar(filename=cookie_path)
+                cookie_jar.load()
+                cookies = dump_cookies(cookie_jar)
+        except Exception:
+            logger.exception(f"Failed to migrate legacy login info: {session_id}")
+            continue
+        rows.append(
+            (
+                session_id,
+                info.username,
+                info.password,
+                cookies,
+                info_path.stat().st_mtime,
+            ),
+        )
+        migrated.extend((info_path, cookie_path))
+
+    if not rows:
+        return
+
+    store.db.executemany_sync(
+        "INSERT OR IGNORE INTO credentials "
+        "(session_id, username, password, cookies, updated_at) VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    for path in migrated:
+        path.unlink(missing_ok=True)
+    logger.info(
+        f"Migrated {len(rows)} legacy login info(s) to {CREDENTIAL_DB_PATH.name}",
+    )
+
+
+async def save_login_info(
+    session_id: str,
+    login_info: LoginInfo,
+    client: Optional[ApiClient] = None,
+):
     """
-    保存 ApiClient 的 Cookies 到文件
+    保存用户登录信息
 
     Args:
-        client: ApiClient 实例
         session_id: 用户 SessionID
+        login_info: 登录信息
+        client: 传入时同时保存其 Cookies
     """
 
-    path = PLAYER_PATH / f"{session_id}.cookies"
+    cookies = dump_cookies(client.rest_client.cookie_jar) if client else None
+    await credential_store.save(session_id, login_info, cookies)
+    if client:
+        # 登录成功的实例直接放入池中，后续请求复用其 Cookies
+        _client_pool[session_id] = client
+        cookie_persistence.track(session_id, client, cookies)
+
 
-    cookie_jar = LWPCookieJar(filename=path)
-    for cookie in client.rest_client.cookie_jar:
-        cookie_jar.set_cookie(cookie)
+async def save_client_cookies(client: ApiClient, session_id: str):
+    """
+    保存 ApiClient 的 Cookies
+
+    Args:
+        client: ApiClient 实例
+        session_id: 用户 SessionID
+    """
 
-    cookie_jar.save()
+    cookies = dump_cookies(client.rest_client.cookie_jar)
+    await credential_store.save_cookies_many([(session_id, cookies)])
+    cookie_persistence.saved(session_id, cookies)
 
 
-def load_cookies_to_client(client: ApiClient, session_id: str):
+async def load_cookies_to_client(client: ApiClient, session_id: str) -> str:
     """
-    从文件加载用户 Cookies 到 ApiClient
+    加载用户 Cookies 到 ApiClient
 
     Args:
         client: ApiClient 实例
@@ -63,20 +242,24 @@ def load_cookies_to_client(client: ApiClient, session_id: str):
 
     Raises:
         NotLoggedInError: 用户 Cookies 不存在
+
+    Returns:
+        数据库中保存的 Cookies
     """
 
-    path = PLAYER_PATH / f"{session_id}.cookies"
-    if not path.exists():
+    rows = await credential_store.execute(
+        "SELECT cookies FROM credentials WHERE session_id = ?",
+        (session_id,),
+    )
+    if not rows or not rows[0][0]:
         raise NotLoggedInError
 
-    cookie_jar = LWPCookieJar(filename=path)
-    cookie_jar.load()
-
-    for cookie in cookie_jar:
+    for cookie in load_cookies(rows[0][0]):
         client.rest_client.cookie_jar.set_cookie(cookie)
+    return rows[0][0]
 
 
-def remove_cookies(session_id: str):
+async def remove_cookies(session_id: str):
     """
     删除已保存的用户 Cookies 信息
 
@@ -84,12 +267,25 @@ def remove_cookies(session_id: str):
         session_id: 用户 SessionID
     """
 
-    path = PLAYER_PATH / f"{session_id}.cookies"
-    if path.exists():
-        path.unlink()
+    drop_pooled_client(session_id)
+    await credential_store.save_cookies_many([(session_id, None)])
 
 
-def get_login_info(session_id: str) -> LoginInfo:
+async def list_logged_in_sessions() -> List[str]:
+    """
+    获取所有保存了 Cookies 的用户 SessionID
+
+    Returns:
+        用户 SessionID 列表
+    """
+
+    rows = await credential_store.execute(
+        "SELECT session_id FROM credentials WHERE cookies IS NOT NULL",
+    )
+    return [x[0] for x in rows]
+
+
+async def get_login_info(session_id: str) -> LoginInfo:
     """
     获取用户登录信息
 
@@ -103,27 +299,122 @@ def get_login_info(session_id: str) -> LoginInfo:
         用户登录信息
     """
 
-    info_path = PLAYER_PATH / f"{session_id}.json"
-    if not info_path.exists():
+    rows = await credential_store.execute(
+        "SELECT username, password FROM credentials WHERE session_id = ?",
+        (session_id,),
+    )
+    if not rows:
         raise NotLoggedInError
-    return LoginInfo.model_validate_json(info_path.read_text(encoding="utf-8"))
+    username, password = rows[0]
+    return LoginInfo(username=username, password=password)
 
 
-def remove_login_info(session_id: str):
+async def remove_login_info(session_id: str):
     """
-    删除已保存的用户登录信息
+    删除已保存的用户登录信息与 Cookies，并关闭账号的 pipeline 连接
 
     Args:
         session_id: 用户 SessionID
+    """
 
-    Returns:
-        用户登录信息
+    from .pipeline import pipeline_manager
+
+    await pipeline_manager.stop(session_id)
+    drop_pooled_client(session_id)
+    with suppress(NotLoggedInError):
+        username = (await get_login_info(session_id)).username
+        invalidate_current_user(username)
+        user_index.drop(username)
+        world_index.drop(username)
+    await credential_store.execute(
+        "DELETE FROM credentials WHERE session_id = ?",
+        (session_id,),
+    )
+
+
+class CookiePersistenceManager:
+    """
+    定期检查池中 ApiClient 的 Cookies 是否发生变化（例如服务器轮换了 auth Cookie），
+    将发生变化的 Cookies 合并为一批写入数据库
     """
 
-    info_path = PLAYER_PATH / f"{session_id}.json"
-    if info_path.exists():
-        info_path.unlink()
-    remove_cookies(session_id)
+    def __init__(self, interval: float = COOKIE_FLUSH_INTERVAL) -> None:
+        self.interval = interval
+        self.clients: Dict[str, ApiClient] = {}
+        self._saved: Dict[str, str] = {}
+        """用户 SessionID -> 最后一次写入数据库的 Cookies"""
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def track(self, session_id: str, client: ApiClient, saved: Optional[str] = None):
+        """
+        开始跟踪 ApiClient 的 Cookies
+
+        Args:
+            session_id: 用户 SessionID
+            client: ApiClient 实例
+            saved: 数据库中当前保存的 Cookies，为 `None` 时以当前 Cookies 为准
+        """
+
+        self.clients[session_id] = client
+        self._saved[session_id] = saved or dump_cookies(client.rest_client.cookie_jar)
+
+    def saved(self, session_id: str, cookies: str):
+        if session_id in self.clients:
+            self._saved[session_id] = cookies
+
+    def forget(self, session_id: str):
+        self.clients.pop(session_id, None)
+        self._saved.pop(session_id, None)
+
+    def collect_changes(self) -> List[Tuple[str, str]]:
+        changes: List[Tuple[str, str]] = []
+        for session_id, client in self.clients.items():
+            cookies = dump_cookies(list(client.rest_client.cookie_jar))
+            if cookies != self._saved.get(session_id):
+                changes.append((session_id, cookies))
+        return changes
+
+    async def flush(self):
+        """立即写入所有发生变化的 Cookies"""
+
+        changes = self.collect_changes()
+        if not changes:
+            return
+        await credential_store.save_cookies_many(changes)
+        for session_id, cookies in changes:
+            self.saved(session_id, cookies)
+        logger.debug(f"Persisted rotated cookies of {len(changes)} session(s)")
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to persist client cookies")
+
+    def start(self):
+        if not self._task or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+
+cookie_persistence = CookiePersistenceManager()
+
+# 用户 SessionID -> 已加载 Cookies 的 ApiClient 实例
+_client_pool: Dict[str, ApiClient] = {}
+
+
+def drop_pooled_client(session_id: str):
+    """从池中移除用户的 ApiClient 实例，之后的 `get_client` 会重新创建"""
+    if client := _client_pool.pop(session_id, None):
+        invalidate_current_user(client.configuration.username or "")
+    cookie_persistence.forget(session_id)
 
 
 async def get_client(
@@ -143,7 +434,10 @@ async def get_client(
     """
 
     load_cookies = not login_info
-    login_info = login_info or get_login_info(session_id)
+    if load_cookies and (client := _client_pool.get(session_id)):
+        return client
+
+    login_info = login_info or (await get_login_info(session_id))
 
     configuration = Configuration(
         username=login_info.username,
@@ -153,7 +447,9 @@ async def get_client(
     client = ApiClient(configuration)
     client.user_agent = user_agent
     if load_cookies:
-        load_cookies_to_client(client, session_id)
+        cookies = await load_cookies_to_client(client, session_id)
+        _client_pool[session_id] = client
+        cookie_persistence.track(session_id, client, cookies)
 
     return client
 
@@ -193,9 +489,8 @@ async def random_client() -> ApiClient:
     if _last_usable_client and (await check_client_usable(_last_usable_client)):
         return _last_usable_client
 
-    # 遍历登录数据目录下所有用户 Cookies 文件
-    for path in PLAYER_PATH.glob("*.cookies"):
-        session_id = path.stem  # 获取不包含扩展名的文件名（即 SessionID）
+    # 遍历所有保存了 Cookies 的用户
+    for session_id in await list_logged_in_sessions():
         try:
             client = await get_client(session_id)
             if await check_client_usable(client):
@@ -206,7 +501,7 @@ async def random_client() -> ApiClient:
             logger.warning(f"Found cookies but has no login info: {session_id}")
         except Exception:
             logger.exception(f"Error when checking client usability: {session_id}")
-        path.unlink()
+        await remove_cookies(session_id)
 
     raise NotLoggedInError
 
@@ -230,3 +525,13 @@ async def get_or_random_client(session_id: str) -> tuple[ApiClient, bool]:
         return await get_client(session_id), True
     except NotLoggedInError:
         return await random_client(), False
+
+
+@get_driver().on_startup
+async def _():
+    cookie_persistence.start()
+
+
+@get_driver().on_shutdown
+async def _():
+    await cookie_persistence.stop()
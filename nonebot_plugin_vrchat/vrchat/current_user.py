@@ -0,0 +1,126 @@
+import asyncio
+import time
+from typing import Awaitable, Dict, Set, Tuple, cast
+
+from nonebot import logger
+from nonebot.utils import run_sync
+from vrchatapi import ApiClient, AuthenticationApi
+from vrchatapi.models.current_user import CurrentUser
+
+from .cache import get_viewer_key
+from .utils import user_agent
+
+CURRENT_USER_TTL = 300
+"""缓存的当前用户信息在此时间内直接使用，单位秒"""
+CURRENT_USER_MAX_STALE = 3600
+"""
+超过 `CURRENT_USER_TTL` 但未超过此时间的缓存仍会直接返回，同时在后台刷新；
+超过此时间后需要等待重新获取，单位秒
+"""
+
+_current_users: Dict[str, Tuple[float, CurrentUser]] = {}
+"""登录用户名 -> (获取时间, 当前用户信息)"""
+_pending: Dict[str, "asyncio.Task[CurrentUser]"] = {}
+"""登录用户名 -> 正在进行的获取任务，相同账号的并发请求共用一个任务"""
+_tasks: Set["asyncio.Task[CurrentUser]"] = set()
+"""所有未完成的获取任务，保持引用避免后台刷新任务在完成前被回收"""
+
+
+def set_current_user(client: ApiClient, current_user: CurrentUser):
+    """写入当前用户信息，登录成功后调用"""
+    if viewer := get_viewer_key(client):
+        _current_users[viewer] = (time.monotonic(), current_user)
+
+
+def invalidate_current_user(username: str):
+    """
+    移除账号的当前用户信息缓存，正在进行的获取任务的结果也不会再写入缓存
+
+    Args:
+        username: 登录用户名
+    """
+    _current_users.pop(username, None)
+    _pending.pop(username, None)
+
+
+async def _fetch_current_user(client: ApiClient) -> CurrentUser:
+    client.user_agent = user_agent
+    api = AuthenticationApi(client)
+    return await cast(
+        "Awaitable[CurrentUser]",
+        run_sync(api.get_current_user)(),
+    )
+
+
+def _refresh(client: ApiClient, viewer: str) -> "asyncio.Task[CurrentUser]":
+    if task := _pending.get(viewer):
+        return task
+
+    async def fetch() -> CurrentUser:
+        try:
+            current_user = await _fetch_current_user(client)
+            # 获取期间缓存被移除（例如退出登录）时不再写入
+            if _pending.get(viewer) is task:
+                set_current_user(client, current_user)
+            return current_user
+        finally:
+            if _pending.get(viewer) is task:
+                del _pending[viewer]
+
+    task = asyncio.create_task(fetch())
+    _pending[viewer] = task
+    # 缓存被移除后 `_pending` 不再引用任务，由 `_tasks` 保持引用直到任务完成
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+
+def _log_refresh_error(task: "asyncio.Task[CurrentUser]"):
+    if not task.cancelled() and (e := task.exception()):
+        logger.debug(f"Failed to refresh current user: {type(e).__name__}: {e}")
+
+
+async def get_current_user(client: ApiClient, refresh: bool = False) -> CurrentUser:
+    """
+    获取当前登录用户的信息，结果按登录账号缓存
+
+    缓存超过 `CURRENT_USER_TTL` 后会先返回缓存并在后台刷新，
+    超过 `CURRENT_USER_MAX_STALE` 后会等待重新获取
+
+    Args:
+        client: ApiClient 实例
+        refresh: 是否忽略缓存，等待重新获取
+
+    Returns:
+        当前登录用户信息
+    """
+
+    viewer = get_viewer_key(client)
+    if not viewer:
+        return await _fetch_current_user(client)
+
+    cached = _current_users.get(viewer)
+    if cached and not refresh:
+        fetched_at, current_user = cached
+        age = time.monotonic() - fetched_at
+        if age < CURRENT_USER_TTL:
+            return current_user
+        if age < CURRENT_USER_MAX_STALE:
+            _refresh(client, viewer).add_done_callback(_log_refresh_error)
+            return current_user
+
+    # 外部取消等待时不取消共用的获取任务
+    return await asyncio.shield(_refresh(client, viewer))
+
+
+async def get_current_user_id(client: ApiClient) -> str:
+    """
+    获取当前登录用户的 ID，使用 `get_current_user` 的缓存
+
+    Args:
+        client: ApiClient 实例
+
+    Returns:
+        当前用户 ID
+    """
+    return (await get_current_user(client)).id
@@ -0,0 +1,206 @@
+import asyncio
+import base64
+import hashlib
+from collections.abc import Iterable
+from pathlib import Path
+from typing import IO, List, NamedTuple, Optional, Union
+
+import aiohttp
+from nonebot import logger
+from nonebot.utils import run_sync
+from vrchatapi import ApiClient
+from yarl import URL
+
+from .files import FileDataType, get_file
+from .types import FileDataModel
+from .utils import user_agent
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_CONCURRENCY = 3
+
+
+class FileIntegrityError(Exception):
+    """下载完成的文件与服务器记录的 MD5 不一致"""
+
+
+class DownloadTask(NamedTuple):
+    file_id: str
+    version: int
+    dest: Path
+    file_type: FileDataType = "file"
+
+
+def _hash_existing_sync(path: Path) -> "hashlib._Hash":
+    md5 = hashlib.md5()  # noqa: S324
+    with path.open("rb") as f:
+        while chunk := f.read(DOWNLOAD_CHUNK_SIZE):
+            md5.update(chunk)
+    return md5
+
+
+class FileDownloader:
+    """
+    文件版本下载器
+
+    数据按块直接写入 `<目标文件>.part`，同时增量计算 MD5，
+    中断后再次下载会通过 HTTP Range 从已下载的位置继续，
+    校验通过后才会重命名为目标文件
+    """
+
+    def __init__(
+        self,
+        client: ApiClient,
+        concurrency: int = DOWNLOAD_CONCURRENCY,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        base_url: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            client: ApiClient 实例，用于获取文件信息与鉴权 Cookies
+            concurrency: `download_many` 同时下载的文件数
+            chunk_size: 每次写入磁盘的数据大小，单位字节
+            base_url: API 地址，为 `None` 时使用 `client` 的配置
+        """
+
+        self.client = client
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.base_url = (base_url or client.configuration.host).rstrip("/")
+
+    def _session(self) -> aiohttp.ClientSession:
+        # 允许 IP 地址，便于使用本地服务器测试
+        jar = aiohttp.CookieJar(unsafe=True)
+        jar.update_cookies(
+            {x.name: x.value or "" for x in self.client.rest_client.cookie_jar},
+            URL(self.base_url),
+        )
+        return aiohttp.ClientSession(
+            cookie_jar=jar,
+            headers={"User-Agent": user_agent},
+        )
+
+    async def get_file_data(
+        self,
+        file_id: str,
+        version: int,
+        file_type: FileDataType = "file",
+    ) -> Optional[FileDataModel]:
+        file = await get_file(self.client, file_id)
+        for x in file.versions:
+            if x.version == version:
+                return getattr(x, file_type)
+        return None
+
+    async def download(
+        self,
+        file_id: str,
+        version: int,
+        dest: Path,
+        file_type: FileDataType = "file",
+        url: Optional[str] = None,
+        md5: Optional[str] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> Path:
+        """
+        下载文件版本
+
+        Args:
+            file_id: 文件 ID
+            version: 版本号
+            dest: 目标文件路径
+            file_type: 要下载的部分
+            url: 下载地址，与 `md5` 均为 `None` 时从文件信息中获取
+            md5: base64 编码的 MD5，为 `None` 时不校验
+            session: 复用的 `aiohttp.ClientSession`
+
+        Returns:
+            目标文件路径
+
+        Raises:
+            FileIntegrityError: 校验失败，已下载的数据会被删除
+        """
+
+        if url is None and md5 is None:
+            data = await self.get_file_data(file_id, version, file_type)
+            url = data.url if data and data.url else None
+            md5 = data.md5 if data else None
+        url = url or f"{self.base_url}/file/{file_id}/{version}/{file_type}"
+
+        if session is None:
+            async with self._session() as session:
+                return await self._download(url, dest, md5, session)
+        return await self._download(url, dest, md5, session)
+
+    async def _download(
+        self,
+        url: str,
+        dest: Path,
+        md5: Optional[str],
+        session: aiohttp.ClientSession,
+    ) -> Path:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        part = dest.with_name(f"{dest.name}.part")
+        offset = part.stat().st_size if part.exists() else 0
+        digest = (
+            await run_sync(_hash_existing_sync)(part) if offset else hashlib.md5()  # noqa: S324
+        )
+
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        async with session.get(url, headers=headers) as resp:
+            if resp.status == 416:
+                # 已下载的部分就是完整文件
+                logger.debug(f"{part.name} already complete")
+            else:
+                resp.raise_for_status()
+                if offset and resp.status != 206:
+                    # 服务器不支持 Range，从头下载
+                    logger.debug(f"Range not supported, restarting {dest.name}")
+                    offset = 0
+                    digest = hashlib.md5()  # noqa: S324
+                if offset:
+                    logger.info(f"Resuming {dest.name} from byte {offset}")
+
+                f: IO[bytes] = await run_sync(part.open)("ab" if offset else "wb")
+                try:
+                    async for chunk in resp.content.iter_chunked(self.chunk_size):
+                        digest.update(chunk)
+                        await run_sync(f.write)(chunk)
+                finally:
+                    await run_sync(f.close)()
+
+        if md5 and base64.b64encode(digest.digest()).decode() != md5:
+            part.unlink(missing_ok=True)
+            raise FileIntegrityError(f"MD5 mismatch for {dest.name}")
+
+        part.replace(dest)
+        return dest
+
+    async def download_many(
+        self,
+        tasks: Iterable[DownloadTask],
+    ) -> List[Union[Path, BaseException]]:
+        """
+        并发下载多个文件版本，同时下载的数量不超过 `concurrency`
+
+        Returns:
+            按传入顺序排列的目标文件路径，失败的任务为对应的异常
+        """
+
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async with self._session() as session:
+
+            async def run(task: DownloadTask) -> Path:
+                async with sem:
+                    return await self.download(
+                        task.file_id,
+                        task.version,
+                        task.dest,
+                        task.file_type,
+                        session=session,
+                    )
+
+            return await asyncio.gather(
+                *(run(x) for x in tasks),
+                return_exceptions=True,
+            )
@@ -1,31 +1,16 @@
-from typing import Awaitable, List, cast
+import asyncio
+from collections.abc import AsyncIterable
+from typing import Awaitable, List, NamedTuple, Optional, cast
+from typing_extensions import Unpack
 
+from nonebot import logger
 from nonebot.utils import run_sync
-from vrchatapi import ApiClient, AuthenticationApi, EconomyApi
+from vrchatapi import ApiClient, EconomyApi
+from vrchatapi.exceptions import UnauthorizedException
 
+from .current_user import get_current_user_id
 from .types import BalanceModel
-
-
-async def get_current_user_id(client: ApiClient) -> str:
-    """获取当前登录用户的 ID
-
-    Args:
-        client: ApiClient 实例
-
-    Returns:
-        当前用户 ID
-    """
-    api = AuthenticationApi(client)
-    current_user = await cast(
-        "Awaitable[object]",
-        run_sync(api.get_current_user)(),
-    )
-    # 使用 to_dict() 方法获取用户 ID
-    if hasattr(current_user, "to_dict"):
-        return current_user.to_dict().get("id", "")
-    if hasattr(current_user, "id"):
-        return current_user.id
-    return ""
+from .utils import IterPFKwargs, iter_pagination_func
 
 
 async def get_balance(client: ApiClient, user_id: str) -> BalanceModel:
@@ -55,7 +40,7 @@ async def get_balance(client: ApiClient, user_id: str) -> BalanceModel:
 
 
 async def get_balance_earnings(client: ApiClient, user_id: str) -> dict:
-    """获取用户收益信息
+    """获取用户收益信息，包含 `balance`、`no_transactions` 与 `tilia_response`
 
     Args:
         client: ApiClient 实例
@@ -67,7 +52,7 @@ async def get_balance_earnings(client: ApiClient, user_id: str) -> dict:
     api = EconomyApi(client)
     result = await cast(
         "Awaitable[object]",
-        run_sync(api.get_balance_earnings)(user_id=user_id),
+        run_sync(api.get_economy_balance)(user_id=user_id),
     )
     return result.to_dict() if hasattr(result, "to_dict") else {}
 
@@ -90,17 +75,11 @@ async def get_economy_account(client: ApiClient, user_id: str) -> dict:
     return result.to_dict() if hasattr(result, "to_dict") else {}
 
 
-async def get_active_licenses(
-    client: ApiClient,
-    n: int = 50,
-    offset: int = 0,
-) -> List[dict]:
-    """获取活跃许可证列表
+async def get_active_licenses(client: ApiClient) -> List[dict]:
+    """获取活跃许可证列表，接口不分页
 
     Args:
         client: ApiClient 实例
-        n: 返回数量
-        offset: 偏移量
 
     Returns:
         许可证列表
@@ -108,13 +87,9 @@ async def get_active_licenses(
     api = EconomyApi(client)
     result = await cast(
         "Awaitable[list]",
-        run_sync(api.get_active_licenses)(n=n, offset=offset),
-    )
-    return (
-        [item.to_dict() if hasattr(item, "to_dict") else item for item in result]
-        if isinstance(result, list)
-        else []
+        run_sync(api.get_active_licenses)(),
     )
+    return [x.to_dict() if hasattr(x, "to_dict") else x for x in result or []]
 
 
 async def get_license_group(client: ApiClient, license_group_id: str) -> dict:
@@ -156,40 +131,39 @@ async def get_product_listing(
     return result.to_dict() if hasattr(result, "to_dict") else {}
 
 
-async def get_product_listings(
+def get_product_listings(
     client: ApiClient,
     user_id: str,
     product_listing_type: str = "direct",
-    n: int = 20,
-    offset: int = 0,
-) -> List[dict]:
+    **pf_kwargs: Unpack[IterPFKwargs],
+) -> AsyncIterable[dict]:
     """获取商品列表
 
     Args:
-        user_id: 用户 ID
         client: ApiClient 实例
+        user_id: 用户 ID
         product_listing_type: 商品类型
-        n: 返回数量
-        offset: 偏移量
+        pf_kwargs: 分页查询相关参数
 
     Returns:
-        商品列表
+        商品列表的异步迭代器
     """
     api = EconomyApi(client)
-    result = await cast(
-        "Awaitable[list]",
-        run_sync(api.get_product_listings)(
-            user_id=user_id,
-            type=product_listing_type,
-            n=n,
-            offset=offset,
-        ),
-    )
-    return (
-        [item.to_dict() if hasattr(item, "to_dict") else item for item in result]
-        if isinstance(result, list)
-        else []
-    )
+
+    @iter_pagination_func(**pf_kwargs)
+    async def iterator(page_size: int, offset: int):
+        result = await cast(
+            "Awaitable[list]",
+            run_sync(api.get_product_listings)(
+                user_id=user_id,
+                listing_type=product_listing_type,
+                n=page_size,
+                offset=offset,
+            ),
+        )
+        return [x.to_dict() if hasattr(x, "to_dict") else x for x in result or []]
+
+    return iterator()
 
 
 async def get_store(client: ApiClient, store_id: str) -> dict:
@@ -232,36 +206,40 @@ async def get_store_shelves(client: ApiClient, store_id: str) -> List[dict]:
     )
 
 
-async def get_current_subscriptions(client: ApiClient) -> dict:
-    """获取当前订阅信息
+async def get_current_subscriptions(client: ApiClient) -> List[dict]:
+    """获取当前用户的订阅
 
     Args:
         client: ApiClient 实例
 
     Returns:
-        订阅信息
+        订阅列表
     """
     api = EconomyApi(client)
     result = await cast(
-        "Awaitable[object]",
+        "Awaitable[list]",
         run_sync(api.get_current_subscriptions)(),
     )
-    return result.to_dict() if hasattr(result, "to_dict") else {}
+    return (
+        [item.to_dict() if hasattr(item, "to_dict") else item for item in result]
+        if isinstance(result, list)
+        else []
+    )
 
 
 async def get_subscriptions(client: ApiClient) -> List[dict]:
-    """获取当前订阅信息
+    """获取所有可用的订阅方案
 
     Args:
         client: ApiClient 实例
 
     Returns:
-        订阅列表
+        订阅方案列表
     """
     api = EconomyApi(client)
     result = await cast(
         "Awaitable[list]",
-        run_sync(api.get_current_subscriptions)(),
+        run_sync(api.get_subscriptions)(),
     )
     return (
         [item.to_dict() if hasattr(item, "to_dict") else item for item in result]
@@ -271,7 +249,7 @@ async def get_subscriptions(client: ApiClient) -> List[dict]:
 
 
 async def get_tilia_status(client: ApiClient) -> dict:
-    """获取 Tilia 状态信息
+    """获取 Tilia 经济系统状态，包含 `economy_online` 与 `economy_state`
 
     Args:
         client: ApiClient 实例
@@ -282,7 +260,7 @@ async def get_tilia_status(client: ApiClient) -> dict:
     api = EconomyApi(client)
     result = await cast(
         "Awaitable[object]",
-        run_sync(api.get_tilia_status)(),
+        run_sync(api.get_economy_status)(),
     )
     return result.to_dict() if hasattr(result, "to_dict") else {}
 
@@ -367,3 +345,55 @@ async def get_user_subscription_eligible(client: ApiClient, user_id: str) -> dic
         run_sync(api.get_user_subscription_eligible)(user_id=user_id),
     )
     return result.to_dict() if hasattr(result, "to_dict") else {}
+
+
+DASHBOARD_FATAL_ERRORS = (UnauthorizedException, AttributeError, NameError, TypeError)
+"""经济总览中不作为单项失败处理、直接抛出的异常：登录失效与代码错误"""
+
+
+class EconomyDashboard(NamedTuple):
+    """经济信息总览，获取失败的部分为 `None`"""
+
+    balance: Optional[BalanceModel]
+    earnings: Optional[dict]
+    current_subscriptions: Optional[List[dict]]
+    subscriptions: Optional[List[dict]]
+    tilia_status: Optional[dict]
+
+
+async def get_economy_dashboard(client: ApiClient) -> EconomyDashboard:
+    """同时获取余额、收益、订阅与 Tilia 状态
+
+    单项请求失败时该项为 `None`，不影响其他项
+
+    Args:
+        client: ApiClient 实例
+
+    Returns:
+        经济信息总览
+
+    Raises:
+        UnauthorizedException: 登录已失效
+        Exception: `DASHBOARD_FATAL_ERRORS` 中的代码错误，或全部获取失败时的第一个异常
+    """
+    user_id = await get_current_user_id(client)
+    results = await asyncio.gather(
+        get_balance(client, user_id),
+        get_balance_earnings(client, user_id),
+        get_current_subscriptions(client),
+        get_subscriptions(client),
+        get_tilia_status(client),
+        return_exceptions=True,
+    )
+
+    errors = [x for x in results if isinstance(x, BaseException)]
+    for e in errors:
+        if isinstance(e, DASHBOARD_FATAL_ERRORS):
+            raise e
+        logger.warning(f"Failed to get economy info: {type(e).__name__}: {e}")
+    if len(errors) == len(results):
+        raise errors[0]
+
+    return EconomyDashboard(
+        *(None if isinstance(x, BaseException) else x for x in results),
+    )
@@ -0,0 +1,111 @@
+import csv
+import json
+from collections.abc import AsyncIterable
+from pathlib import Path
+from typing import Any, Callable, Dict, Literal, Optional, TypeVar
+
+from pydantic import BaseModel
+from vrchatapi import ApiClient
+
+from .groups import get_group_members
+from .types import GroupMemberModel
+
+TM = TypeVar("TM", bound=BaseModel)
+
+ExportFormat = Literal["csv", "jsonl"]
+ExportFields = Dict[str, Callable[[Any], Any]]
+"""CSV 列名 -> 从条目中取值的函数"""
+
+GROUP_MEMBER_EXPORT_FIELDS: ExportFields = {
+    "user_id": lambda x: x.user_id,
+    "display_name": lambda x: x.user.display_name,
+    "membership_status": lambda x: x.membership_status,
+    "joined_at": lambda x: x.joined_at.isoformat() if x.joined_at else "",
+    "role_ids": lambda x: " ".join(x.role_ids),
+    "is_representing": lambda x: x.is_representing,
+    "manager_notes": lambda x: x.manager_notes,
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return "" if value is None else value
+
+
+async def export_models(
+    items: AsyncIterable[TM],
+    path: Path,
+    fmt: ExportFormat = "csv",
+    fields: Optional[ExportFields] = None,
+) -> int:
+    """
+    将异步迭代器中的条目逐条写入文件，内存占用与条目数量无关
+
+    写入过程中使用临时文件，全部写入完成后才会替换为目标文件
+
+    Args:
+        items: 要导出的条目
+        path: 目标文件路径
+        fmt: 导出格式，`csv` 或 `jsonl`
+        fields: CSV 的列定义，为 `None` 时使用第一个条目的顶层字段
+
+    Returns:
+        写入的条目数
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.part")
+    count = 0
+    try:
+        with tmp_path.open("w", encoding="u8", newline="") as f:
+            writer: Optional[csv.DictWriter] = None
+            columns: ExportFields = fields or {}
+            async for item in items:
+                if fmt == "jsonl":
+                    f.write(item.model_dump_json())
+                    f.write("\n")
+                else:
+                    if writer is None:
+                        columns = columns or {
+                            k: (lambda x, k=k: getattr(x, k))
+                            for k in type(item).model_fields
+                        }
+                        writer = csv.DictWriter(f, fieldnames=list(columns))
+                        writer.writeheader()
+                    writer.writerow(
+                        {k: _csv_value(getter(item)) for k, getter in columns.items()},
+                    )
+                count += 1
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return count
+
+
+async def export_group_members(
+    client: ApiClient,
+    group_id: str,
+    path: Path,
+    fmt: ExportFormat = "csv",
+) -> int:
+    """
+    导出群组的全部成员，边请求边写入
+
+    Args:
+        client: ApiClient 实例
+        group_id: 群组 ID
+        path: 目标文件路径
+        fmt: 导出格式，`csv` 或 `jsonl`
+
+    Returns:
+        导出的成员数
+    """
+
+    members: AsyncIterable[GroupMemberModel] = get_group_members(
+        client,
+        group_id,
+        page_size=100,
+        prefetch=True,
+    )
+    return await export_models(members, path, fmt, GROUP_MEMBER_EXPORT_FIELDS)
@@ -0,0 +1,297 @@
+import asyncio
+from collections.abc import AsyncIterable, Awaitable, Iterable
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from nonebot import logger
+from vrchatapi import AddFavoriteRequest, ApiClient
+from vrchatapi.exceptions import UnauthorizedException
+
+from .favorites import (
+    add_favorite,
+    get_favorite_limits,
+    get_favorites,
+    remove_favorite,
+)
+from .types import FavoriteLimitsModel, FavoriteModel, FavoriteType
+
+FAVORITE_SYNC_CONCURRENCY = 4
+
+
+def get_group_limit(
+    limits: FavoriteLimitsModel,
+    favorite_type: FavoriteType,
+    tag: str,
+) -> int:
+    """收藏组最多能容纳的收藏数，VRC+ 世界收藏组使用单独的限制"""
+    per_group = limits.max_favorites_per_group
+    if favorite_type == "world" and tag.startswith("vrcPlusWorlds"):
+        return per_group.vrc_plus_world or per_group.world
+    return getattr(per_group, favorite_type) or limits.default_max_favorites_per_group
+
+
+class FavoriteSyncPlan(NamedTuple):
+    """将收藏组同步为目标内容需要进行的操作"""
+
+    favorite_type: FavoriteType
+    tag: str
+    limit: int
+    """收藏组最多能容纳的收藏数"""
+    current: List[FavoriteModel]
+    """收藏组当前的内容"""
+    to_add: List[str]
+    """要添加的对象 ID"""
+    to_remove: List[FavoriteModel]
+    """要移除的收藏，仅在镜像模式下存在"""
+    to_move: List[FavoriteModel]
+    """要从同类型其他收藏组移到此收藏组的收藏，仅在移动模式下存在"""
+    over_limit: List[str]
+    """超出收藏组容量而不会添加的对象 ID"""
+    in_other_groups: Dict[str, str]
+    """
+    已在同类型其他收藏组中的对象 ID -> 所在收藏组，
+    同一对象在同类型中只能收藏一次，非移动模式下不会添加
+    """
+
+    @property
+    def unchanged(self) -> bool:
+        return not self.to_add and not self.to_remove
+
+
+class FavoriteSyncResult(NamedTuple):
+    plan: FavoriteSyncPlan
+    added: List[str]
+    removed: List[str]
+    """移除的对象 ID"""
+    failed: Dict[str, str]
+    """操作失败的对象 ID -> 错误信息"""
+
+
+async def plan_favorite_sync(
+    client: ApiClient,
+    favorite_type: FavoriteType,
+    tag: str,
+    desired: Iterable[str],
+    mirror: bool = False,
+    move: bool = False,
+) -> FavoriteSyncPlan:
+    """
+    比较收藏组的当前内容与目标内容，得出需要进行的操作，不会修改收藏
+
+    Args:
+        client: ApiClient 实例
+        favorite_type: 收藏类型
+        tag: 收藏组名称，例如 `worlds1`、`avatars1`、`group_0`
+        desired: 目标内容的对象 ID，保持传入顺序，超出容量时靠后的不会添加
+        mirror: 是否移除目标内容之外的收藏，使收藏组与目标内容完全一致
+        move: 是否将已在同类型其他收藏组中的对象移到此收藏组
+
+    Returns:
+        同步计划
+    """
+
+    # 同一对象在同类型的收藏中只能出现一次，所以需要获取全部同类型收藏
+    all_favorites, limits = await asyncio.gather(
+        _collect(get_favorites(client, favorite_type, page_size=100)),
+        get_favorite_limits(client),
+    )
+    current = [x for x in all_favorites if tag in x.tags]
+    current_ids = {x.target_id for x in current}
+    other_groups = {x.target_id: x for x in all_favorites if tag not in x.tags}
+
+    desired_ids = list(dict.fromkeys(x for x in desired if x))
+    desired_set = set(desired_ids)
+    to_remove = [x for x in current if x.target_id not in desired_set] if mirror else []
+    candidates = [x for x in desired_ids if x not in current_ids]
+    in_other_groups = {
+        x: ",".join(other_groups[x].tags) for x in candidates if x in other_groups
+    }
+    if not move:
+        candidates = [x for x in candidates if x not in in_other_groups]
+
+    limit = get_group_limit(limits, favorite_type, tag)
+    capacity = max(limit - len(current) + len(to_remove), 0)
+    to_add = candidates[:capacity]
+    return FavoriteSyncPlan(
+        favorite_type=favorite_type,
+        tag=tag,
+        limit=limit,
+        current=current,
+        to_add=to_add,
+        to_remove=to_remove,
+        to_move=[other_groups[x] for x in to_add if x in other_groups],
+        over_limit=candidates[capacity:],
+        in_other_groups={} if move else in_other_groups,
+    )
+
+
+async def _collect(items: AsyncIterable[FavoriteModel]) -> List[FavoriteModel]:
+    return [x async for x in items]
+
+
+async def apply_favorite_sync(
+    client: ApiClient,
+    plan: FavoriteSyncPlan,
+    concurrency: int = FAVORITE_SYNC_CONCURRENCY,
+) -> FavoriteSyncResult:
+    """
+    执行同步计划，先并发移除（包括要移动的收藏的原记录），再并发添加，
+    使移除腾出的容量可以被使用
+
+    单项操作失败不会中断其他操作，失败的项会记录在结果中
+
+    Args:
+        client: ApiClient 实例
+        plan: `plan_favorite_sync` 得到的同步计划
+        concurrency: 同时进行的操作数
+
+    Returns:
+        同步结果
+
+    Raises:
+        UnauthorizedException: 登录已失效
+    """
+
+    sem = asyncio.Semaphore(concurrency)
+    added: List[str] = []
+    removed: List[str] = []
+    failed: Dict[str, str] = {}
+
+    async def run(
+        target_id: str,
+        func: Callable[[], Awaitable[Any]],
+        done: List[str],
+    ):
+        async with sem:
+            try:
+                await func()
+            except UnauthorizedException:
+                raise
+            except Exception as e:
+                logger.warning(f"Favorite sync failed for {target_id}: {e!r}")
+                failed[target_id] = f"{type(e).__name__}: {e}"
+            else:
+                done.append(target_id)
+
+    await asyncio.gather(
+        *(
+            run(
+                x.target_id,
+                lambda x=x: remove_favorite(client, x.favorite_id),
+                removed,
+            )
+            for x in plan.to_remove
+        ),
+        *(
+            run(
+                x.target_id,
+                lambda x=x: remove_favorite(client, x.favorite_id),
+                [],
+            )
+            for x in plan.to_move
+        ),
+    )
+    await asyncio.gather(
+        *(
+            run(
+                x,
+                lambda x=x: add_favorite(
+                    client,
+                    AddFavoriteRequest(
+                        favorite_id=x,
+                        type=plan.favorite_type,
+                        tags=[plan.tag],
+                    ),
+                ),
+                added,
+            )
+            # 原记录移除失败的对象无法添加
+            for x in plan.to_add
+            if x not in failed
+        ),
+    )
+    return FavoriteSyncResult(plan, added, removed, failed)
+
+
+async def sync_favorites(
+    client: ApiClient,
+    favorite_type: FavoriteType,
+    tag: str,
+    desired: Iterable[str],
+    mirror: bool = False,
+    move: bool = False,
+    dry_run: bool = False,
+    concurrency: int = FAVORITE_SYNC_CONCURRENCY,
+) -> FavoriteSyncResult:
+    """
+    将收藏组同步为目标内容，只添加或移除有差异的项
+
+    Args:
+        client: ApiClient 实例
+        favorite_type: 收藏类型
+        tag: 收藏组名称
+        desired: 目标内容的对象 ID
+        mirror: 是否移除目标内容之外的收藏
+        move: 是否将已在同类型其他收藏组中的对象移到此收藏组
+        dry_run: 为 `True` 时只生成计划，不修改收藏
+        concurrency: 同时进行的操作数
+
+    Returns:
+        同步结果，`dry_run` 时只有计划
+    """
+
+    plan = await plan_favorite_sync(
+        client,
+        favorite_type,
+        tag,
+        desired,
+        mirror,
+        move,
+    )
+    if dry_run or plan.unchanged:
+        return FavoriteSyncResult(plan, [], [], {})
+    return await apply_favorite_sync(client, plan, concurrency)
+
+
+async def mirror_favorite_group(
+    source_client: ApiClient,
+    favorite_type: FavoriteType,
+    source_tag: str,
+    target_client: Optional[ApiClient] = None,
+    target_tag: Optional[str] = None,
+    move: bool = False,
+    dry_run: bool = False,
+    concurrency: int = FAVORITE_SYNC_CONCURRENCY,
+) -> FavoriteSyncResult:
+    """
+    将一个收藏组的内容镜像到另一个收藏组，可以是另一个账号的收藏组
+
+    同一账号中同一对象在同类型中只能收藏一次，同账号镜像时已在源收藏组中的对象
+    只有在 `move` 为 `True` 时才会移到目标收藏组，否则不会添加
+
+    Args:
+        source_client: 源账号的 ApiClient 实例
+        favorite_type: 收藏类型
+        source_tag: 源收藏组名称
+        target_client: 目标账号的 ApiClient 实例，为 `None` 时与源账号相同
+        target_tag: 目标收藏组名称，为 `None` 时与源收藏组相同
+        move: 是否将已在同类型其他收藏组中的对象移到目标收藏组
+        dry_run: 为 `True` 时只生成计划，不修改收藏
+        concurrency: 同时进行的操作数
+
+    Returns:
+        同步结果
+    """
+
+    source = await _collect(
+        get_favorites(source_client, favorite_type, source_tag, page_size=100),
+    )
+    return await sync_favorites(
+        target_client or source_client,
+        favorite_type,
+        target_tag or source_tag,
+        (x.target_id for x in source),
+        mirror=True,
+        move=move,
+        dry_run=dry_run,
+        concurrency=concurrency,
+    )
@@ -1,23 +1,38 @@
-from collections.abc import AsyncIterable, Awaitable
-from typing import TYPE_CHECKING, cast
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple, Union, cast
 from typing_extensions import Unpack
 
+from nonebot import logger
 from nonebot.utils import run_sync
 from vrchatapi import ApiClient, FavoritesApi
-
-from .types import FavoriteGroupModel, FavoriteLimitsModel, FavoriteModel
+from vrchatapi.exceptions import UnauthorizedException
+
+from .avatars import avatar_cache
+from .cache import EntityCache
+from .types import (
+    AvatarModel,
+    FavoriteGroupModel,
+    FavoriteLimitsModel,
+    FavoriteModel,
+    FavoriteType,
+    UserModel,
+    WorldModel,
+)
+from .users import user_cache
 from .utils import (
+    HasDataProtocol,
     IterPFKwargs,
-    auto_parse_iterator_return,
     iter_pagination_func,
+    parse_raw_model,
+    parse_raw_models,
 )
+from .world import world_cache
 
 if TYPE_CHECKING:
     from vrchatapi.models import (
         AddFavoriteRequest,
-        Favorite,
         FavoriteGroup,
-        FavoriteLimits,
         Success,
     )
 
@@ -153,32 +168,38 @@ async def update_favorite_group(
 
 def get_favorites(
     client: ApiClient,
-    favorite_type: str,
+    favorite_type: Optional[FavoriteType] = None,
+    tag: Optional[str] = None,
     **pf_kwargs: Unpack[IterPFKwargs],
 ) -> AsyncIterable[FavoriteModel]:
     """获取收藏列表。
 
     参数:
         client (ApiClient): API 客户端实例。
-        favorite_type (str): 收藏类型（avatar/world）。
+        favorite_type (FavoriteType): 收藏类型（world/friend/avatar），为 None 时不限制。
+        tag (str): 收藏组名称，为 None 时不限制。
         pf_kwargs: 分页查询相关参数。
 
     返回:
         AsyncIterable[FavoriteModel]: 收藏列表的异步迭代器。
     """
     api = FavoritesApi(client)
+    kwargs = {
+        k: v for k, v in {"type": favorite_type, "tag": tag}.items() if v is not None
+    }
 
-    @auto_parse_iterator_return(FavoriteModel)
     @iter_pagination_func(**pf_kwargs)
-    async def iterator(page_size: int, offset: int) -> list["Favorite"]:
-        return await cast(
-            "Awaitable[list[Favorite]]",
+    async def iterator(page_size: int, offset: int):
+        resp = await cast(
+            "Awaitable[HasDataProtocol]",
             run_sync(api.get_favorites)(
-                type=favorite_type,
                 n=page_size,
                 offset=offset,
+                _preload_content=False,
+                **kwargs,
             ),
         )
+        return parse_raw_models(FavoriteModel, resp)
 
     return iterator()
 
@@ -198,16 +219,17 @@ def get_favorite_groups(
     """
     api = FavoritesApi(client)
 
-    @auto_parse_iterator_return(FavoriteGroupModel)
     @iter_pagination_func(**pf_kwargs)
-    async def iterator(page_size: int, offset: int) -> list["FavoriteGroup"]:
-        return await cast(
-            "Awaitable[list[FavoriteGroup]]",
+    async def iterator(page_size: int, offset: int):
+        resp = await cast(
+            "Awaitable[HasDataProtocol]",
             run_sync(api.get_favorite_groups)(
                 n=page_size,
                 offset=offset,
+                _preload_content=False,
             ),
         )
+        return parse_raw_models(FavoriteGroupModel, resp)
 
     return iterator()
 
@@ -222,8 +244,125 @@ async def get_favorite_limits(client: ApiClient) -> FavoriteLimitsModel:
         FavoriteLimitsModel: 收藏限制信息。
     """
     api = FavoritesApi(client)
-    result = await cast(
-        "Awaitable[FavoriteLimits]",
-        run_sync(api.get_favorite_limits)(),
+    resp = await cast(
+        "Awaitable[HasDataProtocol]",
+        run_sync(api.get_favorite_limits)(_preload_content=False),
     )
-    return FavoriteLimitsModel(**result.to_dict())
+    return parse_raw_model(FavoriteLimitsModel, resp)
+
+
+HYDRATE_CONCURRENCY = 8
+
+FavoriteDetail = Union[UserModel, WorldModel, AvatarModel]
+
+FAVORITE_CACHES: Dict[FavoriteType, EntityCache] = {
+    "friend": user_cache,
+    "world": world_cache,
+    "avatar": avatar_cache,
+}
+"""收藏类型 -> 获取详细信息时使用的实体缓存"""
+
+
+class HydratedFavorite(NamedTuple):
+    favorite: FavoriteModel
+    detail: Optional[FavoriteDetail]
+    """被收藏对象的详细信息，不存在或获取失败时为 `None`"""
+
+
+async def iter_hydrated_favorites(
+    client: ApiClient,
+    favorite_type: Optional[FavoriteType] = None,
+    tag: Optional[str] = None,
+    max_size: int = 0,
+    concurrency: int = HYDRATE_CONCURRENCY,
+) -> AsyncIterator[HydratedFavorite]:
+    """获取收藏列表及被收藏对象的详细信息，详细信息获取完成一个就返回一个。
+
+    详细信息通过用户、世界、头像的共享缓存获取，同一对象只会请求一次，
+    所以返回顺序与收藏列表的顺序无关。
+
+    参数:
+        client (ApiClient): API 客户端实例。
+        favorite_type (FavoriteType): 收藏类型，为 None 时不限制。
+        tag (str): 收藏组名称，为 None 时不限制。
+        max_size (int): 最多获取的收藏数，为 0 时不限制。
+        concurrency (int): 同时请求详细信息的最大数量。
+
+    返回:
+        AsyncIterator[HydratedFavorite]: 收藏与详细信息的异步迭代器。
+
+    异常:
+        UnauthorizedException: 登录已失效。
+    """
+    # 按 (类型, ID) 分组，收藏在多个收藏组中的对象只请求一次
+    grouped: Dict[Tuple[FavoriteType, str], List[FavoriteModel]] = {}
+    async for favorite in get_favorites(
+        client,
+        favorite_type,
+        tag,
+        page_size=100,
+        max_size=max_size,
+    ):
+        grouped.setdefault((favorite.type, favorite.target_id), []).append(favorite)
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def hydrate(
+        key: Tuple[FavoriteType, str],
+    ) -> Tuple[List[FavoriteModel], Optional[FavoriteDetail]]:
+        favorite_type, target_id = key
+        async with sem:
+            try:
+                detail = await FAVORITE_CACHES[favorite_type].get(client, target_id)
+            except UnauthorizedException:
+                raise
+            except Exception as e:
+                logger.debug(
+                    f"Failed to get {favorite_type} {target_id}: "
+                    f"{type(e).__name__}: {e}",
+                )
+                detail = None
+        return grouped[key], detail
+
+    tasks = [asyncio.ensure_future(hydrate(x)) for x in grouped]
+    try:
+        for future in asyncio.as_completed(tasks):
+            favorites, detail = await future
+            for favorite in favorites:
+                yield HydratedFavorite(favorite, detail)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def get_hydrated_favorites(
+    client: ApiClient,
+    favorite_type: Optional[FavoriteType] = None,
+    tag: Optional[str] = None,
+    max_size: int = 0,
+    concurrency: int = HYDRATE_CONCURRENCY,
+) -> List[HydratedFavorite]:
+    """同 `iter_hydrated_favorites`，全部获取完成后按收藏组名称与收藏记录 ID 排序返回。
+
+    参数:
+        client (ApiClient): API 客户端实例。
+        favorite_type (FavoriteType): 收藏类型，为 None 时不限制。
+        tag (str): 收藏组名称，为 None 时不限制。
+        max_size (int): 最多获取的收藏数，为 0 时不限制。
+        concurrency (int): 同时请求详细信息的最大数量。
+
+    返回:
+        List[HydratedFavorite]: 收藏与详细信息列表。
+    """
+    items = [
+        x
+        async for x in iter_hydrated_favorites(
+            client,
+            favorite_type,
+            tag,
+            max_size,
+            concurrency,
+        )
+    ]
+    items.sort(key=lambda x: (x.favorite.tags, x.favorite.favorite_id))
+    return items
@@ -1,15 +1,31 @@
-from typing import Awaitable, List, cast
+from collections.abc import AsyncIterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Awaitable, List, Literal, Optional, Union, cast
+from typing_extensions import Unpack
 
 from nonebot.utils import run_sync
 from vrchatapi import ApiClient, FilesApi
 
-from .types import FileModel, FileVersionModel
+from .types import FileModel, FileUploadStatusModel
+from .utils import (
+    IterPFKwargs,
+    auto_parse_iterator_return,
+    auto_parse_return,
+    iter_pagination_func,
+)
 
+if TYPE_CHECKING:
+    from vrchatapi.models import File, FileUploadURL, FileVersionUploadStatus
 
+FileDataType = Literal["file", "signature", "delta"]
+"""文件版本中的数据部分"""
+
+
+@auto_parse_return(FileModel)
 async def create_file(
     client: ApiClient,
     create_file_request: dict,
-) -> FileModel:
+) -> "File":
     """创建文件
 
     Args:
@@ -22,24 +38,20 @@ async def create_file(
     from vrchatapi.models import CreateFileRequest
 
     api = FilesApi(client)
-    result = await cast(
-        "Awaitable[dict]",
+    return await cast(
+        "Awaitable[File]",
         run_sync(api.create_file)(
             create_file_request=CreateFileRequest(**create_file_request),
         ),
     )
-    return (
-        FileModel(**result)
-        if isinstance(result, dict)
-        else FileModel.model_validate({})
-    )
 
 
+@auto_parse_return(FileModel)
 async def create_file_version(
     client: ApiClient,
     file_id: str,
     create_file_version_request: dict,
-) -> FileVersionModel:
+) -> "File":
     """创建文件版本
 
     Args:
@@ -48,13 +60,13 @@ async def create_file_version(
         create_file_version_request: 创建文件版本请求对象
 
     Returns:
-        文件版本信息
+        文件信息，新版本为 `versions` 中的最后一个
     """
     from vrchatapi.models import CreateFileVersionRequest
 
     api = FilesApi(client)
-    result = await cast(
-        "Awaitable[dict]",
+    return await cast(
+        "Awaitable[File]",
         run_sync(api.create_file_version)(
             file_id=file_id,
             create_file_version_request=CreateFileVersionRequest(
@@ -62,14 +74,10 @@ async def create_file_version(
             ),
         ),
     )
-    return (
-        FileVersionModel(**result)
-        if isinstance(result, dict)
-        else FileVersionModel.model_validate({})
-    )
 
 
-async def get_file(client: ApiClient, file_id: str) -> FileModel:
+@auto_parse_return(FileModel)
+async def get_file(client: ApiClient, file_id: str) -> "File":
     """获取文件信息
 
     Args:
@@ -80,38 +88,37 @@ async def get_file(client: ApiClient, file_id: str) -> FileModel:
         文件信息
     """
     api = FilesApi(client)
-    result = await cast(
-        "Awaitable[dict]",
+    return await cast(
+        "Awaitable[File]",
         run_sync(api.get_file)(file_id=file_id),
     )
-    return (
-        FileModel(**result)
-        if isinstance(result, dict)
-        else FileModel.model_validate({})
-    )
 
 
-async def get_files(
+def get_files(
     client: ApiClient,
-    n: int = 20,
-    offset: int = 0,
-) -> List[FileModel]:
+    **pf_kwargs: Unpack[IterPFKwargs],
+) -> AsyncIterable[FileModel]:
     """获取文件列表
 
     Args:
         client: ApiClient 实例
-        n: 返回数量
-        offset: 偏移量
+        pf_kwargs: 分页查询相关参数
 
     Returns:
-        文件列表
+        文件列表的异步迭代器
     """
     api = FilesApi(client)
-    result = await cast(
-        "Awaitable[list]",
-        run_sync(api.get_files)(n=n, offset=offset),
-    )
-    return [FileModel(**r.to_dict()) for r in result] if result else []
+
+    @auto_parse_iterator_return(FileModel)
+    @iter_pagination_func(**pf_kwargs)
+    async def iterator(page_size: int, offset: int):
+        result = await cast(
+            "Awaitable[list]",
+            run_sync(api.get_files)(n=page_size, offset=offset),
+        )
+        return result or []
+
+    return iterator()
 
 
 async def delete_file(client: ApiClient, file_id: str) -> bool:
@@ -234,41 +241,51 @@ async def start_file_data_upload(
     client: ApiClient,
     file_id: str,
     version: int,
-) -> dict:
+    file_type: FileDataType,
+    part_number: Optional[int] = None,
+) -> str:
     """开始文件数据上传
 
     Args:
         client: ApiClient 实例
         file_id: 文件 ID
         version: 版本号
+        file_type: 要上传的部分
+        part_number: 分块上传时的分块序号，从 `1` 开始
 
     Returns:
-        上传 URL 信息
+        上传 URL
     """
     api = FilesApi(client)
+    kwargs = {"part_number": part_number} if part_number else {}
     result = await cast(
-        "Awaitable[dict]",
+        "Awaitable[FileUploadURL]",
         run_sync(api.start_file_data_upload)(
             file_id=file_id,
             version_id=version,
+            file_type=file_type,
+            **kwargs,
         ),
     )
-    return result if isinstance(result, dict) else {}
+    return result.url
 
 
+@auto_parse_return(FileModel)
 async def finish_file_data_upload(
     client: ApiClient,
     file_id: str,
     version: int,
-    finish_file_data_upload_request: dict,
-) -> FileModel:
+    file_type: FileDataType,
+    etags: Optional[List[str]] = None,
+) -> "File":
     """完成文件数据上传
 
     Args:
         client: ApiClient 实例
         file_id: 文件 ID
         version: 版本号
-        finish_file_data_upload_request: 完成上传请求对象
+        file_type: 上传的部分
+        etags: 分块上传时按分块顺序排列的 ETag，单次上传时为 `None`
 
     Returns:
         文件信息
@@ -276,142 +293,113 @@ async def finish_file_data_upload(
     from vrchatapi.models import FinishFileDataUploadRequest
 
     api = FilesApi(client)
-    result = await cast(
-        "Awaitable[dict]",
+    request = (
+        FinishFileDataUploadRequest(etags=etags, max_parts="0", next_part_number="0")
+        if etags
+        else None
+    )
+    return await cast(
+        "Awaitable[File]",
         run_sync(api.finish_file_data_upload)(
             file_id=file_id,
             version_id=version,
-            finish_file_data_upload_request=FinishFileDataUploadRequest(
-                **finish_file_data_upload_request,
-            ),
+            file_type=file_type,
+            finish_file_data_upload_request=request,
         ),
     )
-    return (
-        FileModel(**result)
-        if isinstance(result, dict)
-        else FileModel.model_validate({})
-    )
 
 
+@auto_parse_return(FileUploadStatusModel)
 async def get_file_data_upload_status(
     client: ApiClient,
     file_id: str,
     version: int,
-) -> dict:
-    """获取文件数据上传状态
+    file_type: FileDataType,
+) -> "FileVersionUploadStatus":
+    """获取分块上传的状态，用于断点续传
 
     Args:
         client: ApiClient 实例
         file_id: 文件 ID
         version: 版本号
+        file_type: 上传的部分
 
     Returns:
         上传状态信息
     """
     api = FilesApi(client)
-    result = await cast(
-        "Awaitable[dict]",
+    return await cast(
+        "Awaitable[FileVersionUploadStatus]",
         run_sync(api.get_file_data_upload_status)(
             file_id=file_id,
             version_id=version,
+            file_type=file_type,
         ),
     )
-    return result if isinstance(result, dict) else {}
 
 
+@auto_parse_return(FileModel)
 async def upload_image(
     client: ApiClient,
-    file_id: str,
-    file_data: bytes,
-    tag: str | None = None,
-) -> FileModel:
+    file_path: Union[str, Path],
+    tag: str,
+) -> "File":
     """上传图片文件
 
     Args:
         client: ApiClient 实例
-        file_id: 文件 ID
-        file_data: 文件数据
-        tag: 标签
+        file_path: 图片文件路径
+        tag: 图片用途，如 `icon`、`gallery`、`emoji`
 
     Returns:
         文件信息
     """
     api = FilesApi(client)
-    result = await cast(
-        "Awaitable[dict]",
-        run_sync(api.upload_image)(
-            fileId=file_id,
-            file=file_data,
-            tag=tag,
-        ),
-    )
-    return (
-        FileModel(**result)
-        if isinstance(result, dict)
-        else FileModel.model_validate({})
+    return await cast(
+        "Awaitable[File]",
+        run_sync(api.upload_image)(file=str(file_path), tag=tag),
     )
 
 
+@auto_parse_return(FileModel)
 async def upload_icon(
     client: ApiClient,
-    file_id: str,
-    file_data: bytes,
-) -> FileModel:
+    file_path: Union[str, Path],
+) -> "File":
     """上传图标文件
 
     Args:
         client: ApiClient 实例
-        file_id: 文件 ID
-        file_data: 文件数据
+        file_path: 图标文件路径
 
     Returns:
         文件信息
     """
     api = FilesApi(client)
-    result = await cast(
-        "Awaitable[dict]",
-        run_sync(api.upload_icon)(
-            fileId=file_id,
-            file=file_data,
-        ),
-    )
-    return (
-        FileModel(**result)
-        if isinstance(result, dict)
-        else FileModel.model_validate({})
+    return await cast(
+        "Awaitable[File]",
+        run_sync(api.upload_icon)(file=str(file_path)),
     )
 
 
+@auto_parse_return(FileModel)
 async def upload_gallery_image(
     client: ApiClient,
-    group_id: str,
-    gallery_id: str,
-    file_data: bytes,
-) -> FileModel:
+    file_path: Union[str, Path],
+) -> "File":
     """上传画廊图片
 
     Args:
         client: ApiClient 实例
-        group_id: 群组 ID
-        gallery_id: 画廊 ID
-        file_data: 文件数据
+        file_path: 图片文件路径
 
     Returns:
         文件信息
     """
     api = FilesApi(client)
-    result = await cast(
-        "Awaitable[dict]",
-        run_sync(api.upload_gallery_image)(
-            groupId=group_id,
-            galleryId=gallery_id,
-            file=file_data,
-        ),
-    )
-    return (
-        FileModel(**result)
-        if isinstance(result, dict)
-        else FileModel.model_validate({})
+    return await cast(
+        "Awaitable[File]",
+        run_sync(api.upload_gallery_image)(file=str(file_path)),
     )
 
 
@@ -5,11 +5,13 @@ from typing_extensions import Unpack
 from nonebot.utils import run_sync
 from vrchatapi import ApiClient, FriendsApi
 
+from .name_index import user_index
 from .types import LimitedUserModel
 from .utils import (
+    HasDataProtocol,
     IterPFKwargs,
-    auto_parse_iterator_return,
     iter_pagination_func,
+    parse_raw_models,
 )
 
 if TYPE_CHECKING:
@@ -55,18 +57,19 @@ def get_friends(
     """
     api = FriendsApi(client)
 
-    @auto_parse_iterator_return(LimitedUserModel)
     @iter_pagination_func(**pf_kwargs)
+    @user_index.ingest_page(client)
     async def iterator(page_size: int, offset: int):
-        result = await cast(
-            "Awaitable[list]",
+        resp = await cast(
+            "Awaitable[HasDataProtocol]",
             run_sync(api.get_friends)(
                 offset=offset,
                 n=page_size,
                 offline=str(offline).lower(),
+                _preload_content=False,
             ),
         )
-        return result or []
+        return parse_raw_models(LimitedUserModel, resp)
 
     return iterator()
 
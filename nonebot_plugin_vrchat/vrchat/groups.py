@@ -1,10 +1,11 @@
-from collections.abc import AsyncIterable
-from typing import Awaitable, List, cast
+from collections.abc import AsyncIterable, Iterable
+from typing import Awaitable, Dict, List, cast
 from typing_extensions import Unpack
 
 from nonebot.utils import run_sync
 from vrchatapi import ApiClient, GroupsApi, JoinGroupRequest
 
+from .cache import EntityCache, search_cache
 from .types import (
     GroupAnnouncementModel,
     GroupInstanceModel,
@@ -15,11 +16,15 @@ from .types import (
     LimitedGroupModel,
 )
 from .utils import (
+    HasDataProtocol,
     IterPFKwargs,
-    auto_parse_iterator_return,
+    auto_parse_raw_return,
     iter_pagination_func,
+    parse_raw_models,
 )
 
+GET_GROUPS_CONCURRENCY = 8
+
 
 def search_groups(
     client: ApiClient,
@@ -38,19 +43,25 @@ def search_groups(
     """
     api = GroupsApi(client)
 
-    @auto_parse_iterator_return(LimitedGroupModel)
     @iter_pagination_func(**pf_kwargs)
+    @search_cache.cached_page("groups", keyword)
     async def iterator(page_size: int, offset: int):
-        result = await cast(
-            "Awaitable[list]",
-            run_sync(api.search_groups)(query=keyword, offset=offset, n=page_size),
+        resp = await cast(
+            "Awaitable[HasDataProtocol]",
+            run_sync(api.search_groups)(
+                query=keyword,
+                offset=offset,
+                n=page_size,
+                _preload_content=False,
+            ),
         )
-        return result or []
+        return parse_raw_models(LimitedGroupModel, resp)
 
     return iterator()
 
 
-async def get_group(client: ApiClient, group_id: str) -> GroupModel:
+@auto_parse_raw_return(GroupModel)
+async def get_group(client: ApiClient, group_id: str) -> HasDataProtocol:
     """获取群组信息
 
     Args:
@@ -61,11 +72,53 @@ async def get_group(client: ApiClient, group_id: str) -> GroupModel:
         群组信息
     """
     api = GroupsApi(client)
-    result = await cast(
-        "Awaitable[dict]",
-        run_sync(api.get_group)(group_id=group_id),
+    return await cast(
+        "Awaitable[HasDataProtocol]",
+        run_sync(api.get_group)(group_id=group_id, _preload_content=False),
     )
-    return GroupModel(**result.to_dict())
+
+
+group_cache: EntityCache[GroupModel] = EntityCache(get_group, ttl=300, maxsize=1024)
+"""群组详情缓存，按查看者区分，`membership_status` 等字段对不同查看者不同"""
+
+
+def invalidate_group(group_id: str):
+    """从所有查看者的缓存中移除群组"""
+    group_cache.invalidate(group_id)
+
+
+async def get_group_cached(client: ApiClient, group_id: str) -> GroupModel:
+    """获取群组信息，优先使用缓存
+
+    Args:
+        client: ApiClient 实例
+        group_id: 群组 ID
+
+    Returns:
+        群组信息
+
+    Raises:
+        NotFoundException: 群组不存在，此结果同样会被缓存
+    """
+    return await group_cache.get(client, group_id)
+
+
+async def get_groups(
+    client: ApiClient,
+    group_ids: Iterable[str],
+    concurrency: int = GET_GROUPS_CONCURRENCY,
+) -> Dict[str, GroupModel]:
+    """批量获取群组信息，优先使用缓存，未命中的群组并发请求
+
+    Args:
+        client: ApiClient 实例
+        group_ids: 群组 ID，重复的 ID 只会请求一次
+        concurrency: 最大并发请求数
+
+    Returns:
+        群组 ID -> 群组信息，按传入顺序排列，不存在或获取失败的群组不会出现在结果中
+    """
+    return await group_cache.get_many(client, group_ids, concurrency)
 
 
 async def create_group(
@@ -122,6 +175,7 @@ async def update_group(
             update_group_request=UpdateGroupRequest(**update_group_request),
         ),
     )
+    invalidate_group(group_id)
     return (
         GroupModel(**result)
         if isinstance(result, dict)
@@ -141,40 +195,43 @@ async def delete_group(client: ApiClient, group_id: str) -> bool:
     """
     api = GroupsApi(client)
     await run_sync(api.delete_group)(group_id=group_id)
+    invalidate_group(group_id)
     return True
 
 
-async def get_group_members(
+def get_group_members(
     client: ApiClient,
     group_id: str,
-    n: int = 20,
-    offset: int = 0,
-) -> List[GroupMemberModel]:
+    **pf_kwargs: Unpack[IterPFKwargs],
+) -> AsyncIterable[GroupMemberModel]:
     """获取群组成员列表
 
+    成员较多时建议传入 `prefetch=True`，在处理本页时提前请求下一页
+
     Args:
         client: ApiClient 实例
         group_id: 群组 ID
-        n: 返回数量
-        offset: 偏移量
+        pf_kwargs: 分页查询相关参数，单页最多 `100`
 
     Returns:
-        成员列表
+        获取群组成员的异步迭代器
     """
     api = GroupsApi(client)
-    result = await cast(
-        "Awaitable[list]",
-        run_sync(api.get_group_members)(
-            group_id=group_id,
-            n=n,
-            offset=offset,
-        ),
-    )
-    return (
-        [item.to_dict() if hasattr(item, "to_dict") else item for item in result]
-        if isinstance(result, list)
-        else []
-    )
+
+    @iter_pagination_func(**pf_kwargs)
+    async def iterator(page_size: int, offset: int):
+        resp = await cast(
+            "Awaitable[HasDataProtocol]",
+            run_sync(api.get_group_members)(
+                group_id=group_id,
+                n=page_size,
+                offset=offset,
+                _preload_content=False,
+            ),
+        )
+        return parse_raw_models(GroupMemberModel, resp)
+
+    return iterator()
 
 
 async def get_group_roles(
@@ -245,6 +302,7 @@ async def join_group(client: ApiClient, group_id: str) -> bool:
         confirm_override_block=True,
         join_group_request=JoinGroupRequest(),
     )
+    invalidate_group(group_id)
     return True
 
 
@@ -260,102 +318,98 @@ async def leave_group(client: ApiClient, group_id: str) -> bool:
     """
     api = GroupsApi(client)
     await run_sync(api.leave_group)(group_id=group_id)
+    invalidate_group(group_id)
     return True
 
 
-async def get_group_invites(
+def get_group_invites(
     client: ApiClient,
     group_id: str,
-    n: int = 20,
-    offset: int = 0,
-) -> List[GroupMemberModel]:
+    **pf_kwargs: Unpack[IterPFKwargs],
+) -> AsyncIterable[GroupMemberModel]:
     """获取群组邀请列表
 
     Args:
         client: ApiClient 实例
         group_id: 群组 ID
-        n: 返回数量
-        offset: 偏移量
+        pf_kwargs: 分页查询相关参数
 
     Returns:
-        邀请列表
+        获取群组邀请的异步迭代器
     """
     api = GroupsApi(client)
-    result = await cast(
-        "Awaitable[list]",
-        run_sync(api.get_group_invites)(
-            group_id=group_id,
-            n=n,
-            offset=offset,
-        ),
-    )
-    return (
-        [item.to_dict() if hasattr(item, "to_dict") else item for item in result]
-        if isinstance(result, list)
-        else []
-    )
+
+    @iter_pagination_func(**pf_kwargs)
+    async def iterator(page_size: int, offset: int):
+        resp = await cast(
+            "Awaitable[HasDataProtocol]",
+            run_sync(api.get_group_invites)(
+                group_id=group_id,
+                n=page_size,
+                offset=offset,
+                _preload_content=False,
+            ),
+        )
+        return parse_raw_models(GroupMemberModel, resp)
+
+    return iterator()
 
 
-async def get_group_requests(
+def get_group_requests(
     client: ApiClient,
     group_id: str,
-    n: int = 20,
-    offset: int = 0,
-) -> List[GroupMemberModel]:
+    **pf_kwargs: Unpack[IterPFKwargs],
+) -> AsyncIterable[GroupMemberModel]:
     """获取群组请求列表
 
     Args:
         client: ApiClient 实例
         group_id: 群组 ID
-        n: 返回数量
-        offset: 偏移量
+        pf_kwargs: 分页查询相关参数
 
     Returns:
-        请求列表
+        获取群组请求的异步迭代器
     """
     api = GroupsApi(client)
-    result = await cast(
-        "Awaitable[list]",
-        run_sync(api.get_group_requests)(
-            group_id=group_id,
-            n=n,
-            offset=offset,
-        ),
-    )
-    return (
-        [item.to_dict() if hasattr(item, "to_dict") else item for item in result]
-        if isinstance(result, list)
-        else []
-    )
+
+    @iter_pagination_func(**pf_kwargs)
+    async def iterator(page_size: int, offset: int):
+        resp = await cast(
+            "Awaitable[HasDataProtocol]",
+            run_sync(api.get_group_requests)(
+                group_id=group_id,
+                n=page_size,
+                offset=offset,
+                _preload_content=False,
+            ),
+        )
+        return parse_raw_models(GroupMemberModel, resp)
+
+    return iterator()
 
 
 async def get_group_instances(
     client: ApiClient,
     group_id: str,
 ) -> List[GroupInstanceModel]:
-    """获取群组实例列表
+    """获取群组当前的实例列表
 
     Args:
         client: ApiClient 实例
         group_id: 群组 ID
-        n: 返回数量
-        offset: 偏移量
 
     Returns:
         实例列表
     """
     api = GroupsApi(client)
-    result = await cast(
-        "Awaitable[list]",
+    resp = await cast(
+        "Awaitable[HasDataProtocol]",
         run_sync(api.get_group_instances)(
             group_id=group_id,
+            _preload_content=False,
         ),
     )
-    return (
-        [item.to_dict() if hasattr(item, "to_dict") else item for item in result]
-        if isinstance(result, list)
-        else []
-    )
+    return parse_raw_models(GroupInstanceModel, resp)
 
 
 async def get_group_permissions(
@@ -1,12 +1,38 @@
-from typing import TYPE_CHECKING, Awaitable, Optional, cast
+from collections.abc import AsyncIterable
+from typing import TYPE_CHECKING, Awaitable, List, NamedTuple, Optional, cast
+from typing_extensions import Unpack
 
 from nonebot.utils import run_sync
 from vrchatapi import ApiClient, InstancesApi
 
+from .location import Location, parse_location
+from .types import WorldModel
+from .utils import IterPFKwargs, iter_pagination_func
+from .world import get_worlds
+
 if TYPE_CHECKING:
     from vrchatapi.models import Instance
 
 
+def split_location(location: str) -> tuple[str, str]:
+    """
+    将 location 拆分为调用实例 API 所需的世界 ID 与实例 ID
+
+    Args:
+        location: 实例的 location
+
+    Raises:
+        ValueError: location 不指向具体实例
+
+    Returns:
+        Tuple[世界 ID, 实例 ID]
+    """
+    loc = parse_location(location)
+    if not (loc.world_id and loc.instance_id):
+        raise ValueError(f"Location is not an instance: {location}")
+    return loc.world_id, loc.instance_id
+
+
 async def get_instance(
     client: ApiClient,
     world_id: str,
@@ -33,6 +59,22 @@ async def get_instance(
     return result.to_dict() if result else {}
 
 
+async def get_instance_by_location(client: ApiClient, location: str) -> dict:
+    """通过 location 获取实例信息
+
+    Args:
+        client: ApiClient 实例
+        location: 实例的 location
+
+    Raises:
+        ValueError: location 不指向具体实例
+
+    Returns:
+        实例信息
+    """
+    return await get_instance(client, *split_location(location))
+
+
 async def create_instance(
     client: ApiClient,
     create_instance_request: dict,
@@ -128,24 +170,66 @@ async def get_short_name(
     return result.get("shortName") if result else None
 
 
-async def get_recent_locations(
+def get_recent_locations(
     client: ApiClient,
-    user_id: str,
-    n: int = 10,
-) -> list[str]:
-    """获取用户最近访问的位置列表
+    **pf_kwargs: Unpack[IterPFKwargs],
+) -> AsyncIterable[str]:
+    """获取当前账号最近访问的位置列表
 
     Args:
         client: ApiClient 实例
-        user_id: 用户 ID
-        n: 返回数量，默认 10
+        pf_kwargs: 分页查询相关参数
 
     Returns:
-        位置列表
+        location 的异步迭代器，越新的越靠前
     """
     api = InstancesApi(client)
-    result = await cast(
-        "Awaitable[list]",
-        run_sync(api.get_recent_locations)(userId=user_id, n=n),
-    )
-    return result if result else []
+
+    @iter_pagination_func(**pf_kwargs)
+    async def iterator(page_size: int, offset: int):
+        result = await cast(
+            "Awaitable[list]",
+            run_sync(api.get_recent_locations)(n=page_size, offset=offset),
+        )
+        return result or []
+
+    return iterator()
+
+
+class RecentLocation(NamedTuple):
+    location: Location
+    world: Optional[WorldModel]
+    """世界信息，获取失败时为 `None`"""
+
+
+async def resolve_recent_locations(
+    client: ApiClient,
+    max_size: int = 20,
+) -> List[RecentLocation]:
+    """
+    获取最近访问的位置，并批量获取其中的世界信息
+
+    相同的 location 只保留一次，每个世界只请求一次，且会使用世界缓存
+
+    Args:
+        client: ApiClient 实例
+        max_size: 最多获取的 location 数
+
+    Returns:
+        去重后的位置，越新的越靠前
+    """
+
+    raws = [
+        x
+        async for x in get_recent_locations(
+            client,
+            page_size=min(max_size, 100),
+            max_size=max_size,
+        )
+    ]
+    locations = [x for x in map(parse_location, dict.fromkeys(raws)) if x.world_id]
+    worlds = await get_worlds(client, (x.world_id for x in locations if x.world_id))
+    return [
+        RecentLocation(loc, worlds.get(loc.world_id) if loc.world_id else None)
+        for loc in locations
+    ]
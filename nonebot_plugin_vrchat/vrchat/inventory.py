@@ -219,40 +219,28 @@ async def get_inventory_template(
     )
 
 
-async def get_inventory_collections(
-    client: ApiClient,
-    n: int = 20,
-    offset: int = 0,
-) -> List[dict]:
-    """获取库存集合列表
+async def get_inventory_collections(client: ApiClient) -> List[str]:
+    """获取库存集合列表，接口不分页
 
     Args:
         client: ApiClient 实例
-        n: 返回数量
-        offset: 偏移量
 
     Returns:
-        集合列表
+        集合名称列表
     """
     api = InventoryApi(client)
     result = await cast(
         "Awaitable[list]",
-        run_sync(api.get_inventory_collections)(n=n, offset=offset),
+        run_sync(api.get_inventory_collections)(),
     )
-    return result if isinstance(result, list) else []
+    return result or []
 
 
-async def get_inventory_drops(
-    client: ApiClient,
-    n: int = 20,
-    offset: int = 0,
-) -> List[dict]:
-    """获取库存掉落列表
+async def get_inventory_drops(client: ApiClient) -> List[dict]:
+    """获取库存掉落列表，接口不分页
 
     Args:
         client: ApiClient 实例
-        n: 返回数量
-        offset: 偏移量
 
     Returns:
         掉落列表
@@ -260,6 +248,6 @@ async def get_inventory_drops(
     api = InventoryApi(client)
     result = await cast(
         "Awaitable[list]",
-        run_sync(api.get_inventory_drops)(n=n, offset=offset),
+        run_sync(api.get_inventory_drops)(),
     )
-    return result if isinstance(result, list) else []
+    return [x.to_dict() if hasattr(x, "to_dict") else x for x in result or []]
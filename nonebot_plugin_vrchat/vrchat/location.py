@@ -0,0 +1,107 @@
+from functools import lru_cache
+from typing import Literal, NamedTuple, Optional
+
+InstanceAccessType = Literal["public", "hidden", "friends", "private", "group"]
+"""
+实例类型
+
+- public: 公开
+- hidden: 好友+
+- friends: 好友
+- private: 邀请 / 邀请+（见 `Location.can_request_invite`）
+- group: 群组（见 `Location.group_access_type`）
+"""
+GroupAccessType = Literal["members", "plus", "public"]
+
+SPECIAL_LOCATIONS = ("offline", "private", "traveling")
+"""不指向具体实例的 location"""
+
+_OWNER_TAGS = ("hidden", "friends", "private", "group")
+
+
+class Location(NamedTuple):
+    """解析后的 location，例如 `wrld_xxx:12345~friends(usr_xxx)~region(jp)`"""
+
+    raw: str
+    world_id: Optional[str] = None
+    instance_id: Optional[str] = None
+    """location 中 `:` 后的完整部分，调用实例相关 API 时使用"""
+    name: Optional[str] = None
+    """实例编号，即 instance_id 中第一个 `~` 前的部分"""
+    access_type: Optional[InstanceAccessType] = None
+    owner_id: Optional[str] = None
+    """实例所有者的用户 ID 或群组 ID，公开实例为 `None`"""
+    can_request_invite: bool = False
+    group_access_type: Optional[GroupAccessType] = None
+    region: Optional[str] = None
+    """服务器区域，location 中未指定时为 `None`"""
+
+    @property
+    def is_instance(self) -> bool:
+        """是否指向一个具体的实例"""
+        return self.instance_id is not None
+
+    @property
+    def is_offline(self) -> bool:
+        return self.raw in ("", "offline")
+
+    @property
+    def is_traveling(self) -> bool:
+        return self.raw.startswith("traveling")
+
+    @property
+    def is_private(self) -> bool:
+        """是否是对方隐藏了位置的 `private`，而不是邀请实例"""
+        return self.raw == "private"
+
+
+@lru_cache(maxsize=4096)
+def parse_location(location: str) -> Location:
+    """
+    解析 location 字符串，结果会被缓存
+
+    Args:
+        location: user.location 或 instance.location
+
+    Returns:
+        解析后的 `Location`，对 `offline`、`traveling` 等特殊值只有 `raw` 字段
+    """
+
+    if not location or location.split(":", 1)[0] in SPECIAL_LOCATIONS:
+        return Location(raw=location)
+
+    world_id, sep, instance_id = location.partition(":")
+    if not sep or not instance_id:
+        return Location(raw=location, world_id=world_id)
+
+    name, *tags = instance_id.split("~")
+    access_type: InstanceAccessType = "public"
+    owner_id = None
+    can_request_invite = False
+    group_access_type = None
+    region = None
+
+    for tag in tags:
+        key, _, value = tag.partition("(")
+        value = value[:-1] if value.endswith(")") else value
+        if key in _OWNER_TAGS:
+            access_type = key  # pyright: ignore[reportAssignmentType]
+            owner_id = value or None
+        elif key == "canRequestInvite":
+            can_request_invite = True
+        elif key == "groupAccessType" and value in ("members", "plus", "public"):
+            group_access_type = value  # pyright: ignore[reportAssignmentType]
+        elif key == "region":
+            region = value or None
+
+    return Location(
+        raw=location,
+        world_id=world_id,
+        instance_id=instance_id,
+        name=name,
+        access_type=access_type,
+        owner_id=owner_id,
+        can_request_invite=can_request_invite,
+        group_access_type=group_access_type,
+        region=region,
+    )
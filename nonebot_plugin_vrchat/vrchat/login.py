@@ -7,7 +7,8 @@ from vrchatapi.models.current_user import CurrentUser
 from vrchatapi.models.two_factor_auth_code import TwoFactorAuthCode
 from vrchatapi.models.two_factor_email_code import TwoFactorEmailCode
 
-from .client import PLAYER_PATH, LoginInfo, get_client, save_client_cookies
+from .client import LoginInfo, get_client, save_login_info
+from .current_user import set_current_user
 from .utils import user_agent
 
 
@@ -52,14 +53,14 @@ async def login_via_password(
     client.user_agent = user_agent
     api = AuthenticationApi(client)
 
-    def save_user_info():
-        """保存用户登录信息"""
-        info_path = PLAYER_PATH / f"{session_id}.json"
-        info_path.write_text(
-            LoginInfo(username=username, password=password).json(),
-            encoding="utf-8",
+    async def save_user_info(current_user: CurrentUser):
+        """保存用户登录信息，并缓存当前用户信息供之后的请求使用"""
+        await save_login_info(
+            session_id,
+            LoginInfo(username=username, password=password),
+            client,
         )
-        save_client_cookies(client, session_id)
+        set_current_user(client, current_user)
 
     try:
         # 调用 getCurrentUser 时，如果用户未登录，则会向服务器请求登录
@@ -96,11 +97,11 @@ async def login_via_password(
                 Awaitable[CurrentUser],
                 run_sync(api.get_current_user)(),
             )
-            save_user_info()
+            await save_user_info(current_user)
             return current_user
 
         raise TwoFactorAuthError(verify_two_fa) from e
 
     # 未抛出错误
-    save_user_info()
+    await save_user_info(current_user)
     return current_user
@@ -0,0 +1,296 @@
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from functools import wraps
+from operator import attrgetter
+from typing import Callable, Dict, Generic, List, Optional, Set, Tuple, TypeVar
+
+from vrchatapi import ApiClient
+
+from .cache import get_viewer_key, normalize_query
+from .types import LimitedUserModel, LimitedWorldModel
+from .utils import PaginationCallable
+
+T = TypeVar("T")
+
+FUZZY_THRESHOLD = 0.5
+"""模糊匹配时 bigram 相似度的最低值"""
+NAME_INDEX_TTL = 3600
+"""索引条目的有效期，单位秒，过期的条目在读取时删除"""
+
+
+def name_grams(name: str) -> Set[str]:
+    """规范化后名称的 bigram 集合，名称首尾补空格，使单个字符的名称也能被索引"""
+    padded = f" {name} "
+    return {padded[i : i + 2] for i in range(len(padded) - 1)}
+
+
+class NameIndex(Generic[T]):
+    """
+    按名称查找已见过的实体的本地索引，使用 bigram 倒排表实现前缀与模糊匹配
+
+    条目数量超过上限时淘汰最久未使用的条目，添加或命中都会刷新使用顺序；
+    条目在加入后超过有效期即失效，只有再次加入才会续期
+    """
+
+    def __init__(
+        self,
+        get_id: Callable[[T], str],
+        get_name: Callable[[T], str],
+        maxsize: int = 5000,
+        ttl: float = NAME_INDEX_TTL,
+        strip: Optional[Callable[[T], T]] = None,
+    ) -> None:
+        """
+        Args:
+            get_id: 获取实体 ID 的函数
+            get_name: 获取实体名称的函数
+            maxsize: 最大条目数
+            ttl: 条目有效期，单位秒
+            strip: 加入索引前处理实体的函数，用于去除很快会过时的字段
+        """
+
+        self.get_id = get_id
+        self.get_name = get_name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.strip = strip
+        self._items: "OrderedDict[str, Tuple[str, T, float]]" = OrderedDict()
+        """ID -> (规范化后的名称, 实体, 过期时间)"""
+        self._grams: Dict[str, Set[str]] = {}
+        """bigram -> ID"""
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _unlink(self, entity_id: str, name: str):
+        for gram in name_grams(name):
+            ids = self._grams.get(gram)
+            if ids is None:
+                continue
+            ids.discard(entity_id)
+            if not ids:
+                del self._grams[gram]
+
+    def add(self, item: T):
+        entity_id = self.get_id(item)
+        name = normalize_query(self.get_name(item) or "")
+        if not entity_id or not name:
+            return
+
+        old = self._items.get(entity_id)
+        if old and old[0] != name:
+            self._unlink(entity_id, old[0])
+        if not old or old[0] != name:
+            for gram in name_grams(name):
+                self._grams.setdefault(gram, set()).add(entity_id)
+
+        if self.strip:
+            item = self.strip(item)
+        self._items[entity_id] = (name, item, time.monotonic() + self.ttl)
+        self._items.move_to_end(entity_id)
+        while len(self._items) > self.maxsize:
+            old_id, (old_name, *_) = self._items.popitem(last=False)
+            self._unlink(old_id, old_name)
+
+    def add_many(self, items: Iterable[T]):
+        for item in items:
+            self.add(item)
+
+    def remove(self, entity_id: str):
+        old = self._items.pop(entity_id, None)
+        if old:
+            self._unlink(entity_id, old[0])
+
+    def clear(self):
+        self._items.clear()
+        self._grams.clear()
+
+    def _expired(self, entity_id: str, now: float) -> bool:
+        if self._items[entity_id][2] > now:
+            return False
+        self.remove(entity_id)
+        return True
+
+    def get(self, entity_id: str) -> Optional[T]:
+        if entity_id not in self._items or self._expired(entity_id, time.monotonic()):
+            return None
+        return self._items[entity_id][1]
+
+    def exact(self, query: str, limit: int = 10) -> List[T]:
+        """名称与关键词规范化后完全相同的实体"""
+        query = normalize_query(query)
+        return [
+            x
+            for x in self.search(query, limit=limit, fuzzy=False)
+            if self._items[self.get_id(x)][0] == query
+        ]
+
+    def search(self, query: str, limit: int = 10, fuzzy: bool = True) -> List[T]:
+        """
+        查找名称与关键词匹配的实体
+
+        结果依次为完全匹配、前缀匹配、包含关键词，以及相似度不低于 `FUZZY_THRESHOLD` 的模糊匹配
+
+        Args:
+            query: 关键词
+            limit: 最大结果数
+            fuzzy: 是否包含模糊匹配的结果
+
+        Returns:
+            按匹配程度排序的实体
+        """
+
+        query = normalize_query(query)
+        if not query:
+            return []
+
+        query_grams = name_grams(query)
+        counts: Dict[str, int] = {}
+        for gram in query_grams:
+            for entity_id in self._grams.get(gram, ()):
+                counts[entity_id] = counts.get(entity_id, 0) + 1
+
+        now = time.monotonic()
+        scored: List[Tuple[Tuple[int, float], str]] = []
+        for entity_id, count in counts.items():
+            if self._expired(entity_id, now):
+                continue
+            name = self._items[entity_id][0]
+            if name == query:
+                rank = 0
+            elif name.startswith(query):
+                rank = 1
+            elif query in name:
+                rank = 2
+            else:
+                rank = 3
+            # Dice 系数
+            similarity = 2 * count / (len(query_grams) + len(name_grams(name)))
+            if rank == 3 and (not fuzzy or similarity < FUZZY_THRESHOLD):
+                continue
+            scored.append(((rank, -similarity), entity_id))
+
+        scored.sort()
+        ret: List[T] = []
+        for _, entity_id in scored[:limit]:
+            self._items.move_to_end(entity_id)
+            ret.append(self._items[entity_id][1])
+        return ret
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """名称以关键词开头的实体的原始名称，用于自动补全"""
+        prefix = normalize_query(prefix)
+        return [
+            self.get_name(x)
+            for x in self.search(prefix, limit=limit, fuzzy=False)
+            if self._items[self.get_id(x)][0].startswith(prefix)
+        ]
+
+    def ingest_page(self, func: PaginationCallable[T]) -> PaginationCallable[T]:
+        """
+        用于装饰 `PaginationCallable` 的装饰器，将每页返回的实体加入索引，
+        应放在 `iter_pagination_func` 内侧
+        """
+
+        @wraps(func)
+        async def wrapper(page_size: int, offset: int) -> Optional[List[T]]:
+            resp = await func(page_size, offset)
+            if resp:
+                self.add_many(resp)
+            return resp
+
+        return wrapper
+
+
+class ViewerNameIndex(Generic[T]):
+    """
+    按查看者区分的 `NameIndex`，一个账号见过的实体不会出现在其他账号的查询中
+    """
+
+    def __init__(
+        self,
+        get_id: Callable[[T], str],
+        get_name: Callable[[T], str],
+        maxsize: int = 5000,
+        ttl: float = NAME_INDEX_TTL,
+        strip: Optional[Callable[[T], T]] = None,
+    ) -> None:
+        """
+        Args:
+            get_id: 获取实体 ID 的函数
+            get_name: 获取实体名称的函数
+            maxsize: 每个查看者的最大条目数
+            ttl: 条目有效期，单位秒
+            strip: 加入索引前处理实体的函数，用于去除很快会过时的字段
+        """
+
+        self.get_id = get_id
+        self.get_name = get_name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.strip = strip
+        self._indexes: Dict[str, NameIndex[T]] = {}
+        """查看者用户名 -> 索引"""
+
+    def of(self, client: ApiClient) -> NameIndex[T]:
+        """获取查看者的索引"""
+
+        viewer = get_viewer_key(client)
+        index = self._indexes.get(viewer)
+        if index is None:
+            index = NameIndex(
+                self.get_id,
+                self.get_name,
+                maxsize=self.maxsize,
+                ttl=self.ttl,
+                strip=self.strip,
+            )
+            self._indexes[viewer] = index
+        return index
+
+    def drop(self, viewer: str):
+        """移除查看者的索引，退出登录时调用"""
+        self._indexes.pop(viewer, None)
+
+    def ingest_page(
+        self,
+        client: ApiClient,
+    ) -> Callable[[PaginationCallable[T]], PaginationCallable[T]]:
+        """将每页返回的实体加入查看者的索引，见 `NameIndex.ingest_page`"""
+        return self.of(client).ingest_page
+
+
+def strip_user(user: LimitedUserModel) -> LimitedUserModel:
+    """去除用户的在线状态与位置，索引中只保留资料"""
+    return user.model_copy(
+        update={
+            "original_status": "offline",
+            "status_description": "",
+            "location": None,
+            "last_login": None,
+            "friend_key": None,
+        },
+    )
+
+
+def strip_world(world: LimitedWorldModel) -> LimitedWorldModel:
+    """去除世界的实时人数，索引中只保留资料"""
+    return world.model_copy(update={"occupants": 0})
+
+
+user_index: ViewerNameIndex[LimitedUserModel] = ViewerNameIndex(
+    attrgetter("user_id"),
+    attrgetter("display_name"),
+    strip=strip_user,
+)
+"""
+好友列表与用户搜索中见过的用户，用于名称完全相同时的本地查询、
+搜索无结果时的名称补全，以及搜索请求失败时的备用结果
+"""
+world_index: ViewerNameIndex[LimitedWorldModel] = ViewerNameIndex(
+    attrgetter("world_id"),
+    attrgetter("name"),
+    strip=strip_world,
+)
+"""世界搜索中见过的世界，用途同 `user_index`"""
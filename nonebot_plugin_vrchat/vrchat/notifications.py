@@ -1,5 +1,6 @@
-from collections.abc import AsyncIterable, Awaitable
-from typing import TYPE_CHECKING, cast
+from collections.abc import AsyncIterable, Awaitable, Iterable
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, cast
 from typing_extensions import Unpack
 
 from nonebot.utils import run_sync
@@ -45,6 +46,156 @@ def get_notifications(
     return iterator()
 
 
+class NotificationStore:
+    """本地通知列表，由接口增量同步或 pipeline 推送更新"""
+
+    def __init__(self) -> None:
+        self.notifications: Dict[str, NotificationModel] = {}
+        self.cursor: Optional[datetime] = None
+        """已同步的最新通知的创建时间，为 `None` 时表示从未同步"""
+
+    def upsert(self, notification: NotificationModel):
+        self.notifications[notification.notification_id] = notification
+        if self.cursor and notification.created_at > self.cursor:
+            self.cursor = notification.created_at
+
+    def merge(self, notifications: Iterable[NotificationModel]) -> int:
+        """
+        合并一批通知并推进同步游标
+
+        Returns:
+            新增的通知数量
+        """
+
+        added = 0
+        for ntf in notifications:
+            if ntf.notification_id not in self.notifications:
+                added += 1
+            self.notifications[ntf.notification_id] = ntf
+            if not self.cursor or ntf.created_at > self.cursor:
+                self.cursor = ntf.created_at
+        return added
+
+    def reconcile(
+        self,
+        notifications: Iterable[NotificationModel],
+        since: Optional[datetime] = None,
+    ) -> int:
+        """
+        以服务器返回的通知为准，移除本地已被服务器删除的通知
+
+        Args:
+            notifications: 服务器返回的通知
+            since: 服务器返回的通知覆盖的最早时间，只处理在此时间之后的本地通知，
+                为 `None` 时表示服务器返回的是完整列表
+
+        Returns:
+            移除的通知数量
+        """
+
+        ids = {x.notification_id for x in notifications}
+        removed = [
+            k
+            for k, v in self.notifications.items()
+            if k not in ids and (since is None or v.created_at > since)
+        ]
+        for k in removed:
+            del self.notifications[k]
+        return len(removed)
+
+    def remove(self, notification_id: str):
+        self.notifications.pop(notification_id, None)
+
+    def mark_seen(self, notification_id: str):
+        ntf = self.notifications.get(notification_id)
+        if ntf:
+            ntf.seen = True
+
+    def mark_read(self, notification_id: str):
+        ntf = self.notifications.get(notification_id)
+        if ntf:
+            ntf.seen = True
+            ntf.read = True
+
+    def clear(self):
+        self.notifications.clear()
+
+    def latest(self, n: Optional[int] = None) -> List[NotificationModel]:
+        """按时间从新到旧返回通知"""
+        ret = sorted(
+            self.notifications.values(),
+            key=lambda x: x.created_at,
+            reverse=True,
+        )
+        return ret[:n] if n else ret
+
+
+# 用户 SessionID -> 未连接 pipeline 时使用的本地通知列表
+_notification_stores: Dict[str, NotificationStore] = {}
+
+
+def get_notification_store(session_id: str) -> NotificationStore:
+    """获取用户的本地通知列表，连接了 pipeline 时与 pipeline 共用同一份"""
+
+    from .pipeline import pipeline_manager
+
+    pipeline = pipeline_manager.clients.get(session_id)
+    if pipeline:
+        return pipeline.notifications
+    return _notification_stores.setdefault(session_id, NotificationStore())
+
+
+async def sync_notifications(
+    client: ApiClient,
+    store: NotificationStore,
+    max_size: int = 100,
+    page_size: int = 20,
+) -> int:
+    """
+    增量同步通知到本地通知列表
+
+    接口按时间从新到旧返回通知，遇到游标之前且已存在于本地的通知后读完当前页即停止翻页，
+    因此在没有新通知时只需要请求一页；
+    本次获取覆盖的时间范围内，本地存在而服务器没有返回的通知会被移除
+
+    Args:
+        client: ApiClient 实例
+        store: 本地通知列表
+        max_size: 最多同步的通知数量
+        page_size: 每页数量
+
+    Returns:
+        新增的通知数量
+    """
+
+    cursor = store.cursor
+    fetched: List[NotificationModel] = []
+    reached = False
+    complete = False
+    async for ntf in get_notifications(client, n=max_size, page_size=page_size):
+        fetched.append(ntf)
+        reached = reached or bool(
+            cursor
+            and ntf.created_at <= cursor
+            and ntf.notification_id in store.notifications,
+        )
+        # 读完当前页再停止，使这一页内的已读与删除状态也能同步
+        if reached and len(fetched) % page_size == 0:
+            break
+    else:
+        # 获取数量未达到上限说明已经是服务器上的完整列表
+        complete = len(fetched) < max_size
+
+    if cursor is None:
+        # 首次同步时以接口结果为准
+        store.clear()
+    elif complete:
+        store.reconcile(fetched)
+    elif fetched:
+        store.reconcile(fetched, since=fetched[-1].created_at)
+    return store.merge(fetched)
+
+
 async def get_notification(
     client: ApiClient,
     notification_id: str,
@@ -0,0 +1,357 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from collections.abc import Iterable
+from contextlib import suppress
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from nonebot import get_driver, logger
+from vrchatapi import ApiClient
+from vrchatapi.exceptions import UnauthorizedException
+
+from .cache import get_viewer_key
+from .groups import get_group_instances
+from .types import GroupInstanceModel
+
+OCCUPANCY_SAMPLE_INTERVAL = 300
+"""后台采样间隔，单位秒"""
+OCCUPANCY_HISTORY_SIZE = 288
+"""每个世界保留的采样数，按采样间隔 5 分钟约为 24 小时"""
+OCCUPANCY_MAX_AGE = 60
+"""快照的有效期，单位秒，在此时间内的查询直接使用内存中的数据"""
+OCCUPANCY_TRACK_TTL = 24 * 60 * 60
+"""群组组合在最后一次查询后继续被后台采样的时间，单位秒，超过后移除其数据"""
+OCCUPANCY_MAX_TRACKED = 32
+"""最多同时跟踪的群组组合数，超出时移除最久未查询的组合"""
+OCCUPANCY_CONCURRENCY = 4
+
+OccupancyKey = Tuple[str, Tuple[str, ...]]
+"""(查看者, 排序后的群组 ID)"""
+
+
+class OccupancySample(NamedTuple):
+    timestamp: int
+    """采样时间，Unix 时间戳，单位秒"""
+    users: int
+    instances: int
+
+
+class WorldOccupancy:
+    """单个世界在所有被统计群组中的人数，以及最近的人数变化"""
+
+    def __init__(
+        self,
+        world_id: str,
+        name: str,
+        history_size: int = OCCUPANCY_HISTORY_SIZE,
+    ) -> None:
+        self.world_id = world_id
+        self.name = name
+        self.instances: List[GroupInstanceModel] = []
+        """当前快照中此世界的实例"""
+        self.history: Deque[OccupancySample] = deque(maxlen=history_size)
+
+    @property
+    def users(self) -> int:
+        return sum(x.member_count for x in self.instances)
+
+    @property
+    def peak(self) -> int:
+        """采样记录中的最高人数"""
+        return max((x.users for x in self.history), default=0)
+
+    def trend(self, samples: int = 2) -> int:
+        """当前人数与 `samples` 次采样前的人数差"""
+        if len(self.history) < samples:
+            return 0
+        return self.history[-1].users - self.history[-samples].users
+
+
+class OccupancySnapshot(NamedTuple):
+    timestamp: float
+    instances: List[GroupInstanceModel]
+    """按人数从多到少排列"""
+    worlds: List[WorldOccupancy]
+    """按人数从多到少排列"""
+
+    @property
+    def users(self) -> int:
+        return sum(x.member_count for x in self.instances)
+
+
+class OccupancyTracker:
+    """
+    统计多个群组的实例人数
+
+    刷新时并发获取所有群组的实例，按世界汇总后记录一次采样；
+    在快照有效期内的查询直接返回内存中的结果，不会请求 API。
+
+    被查询过的群组组合会在后台按采样间隔继续刷新，形成时间序列，
+    超过 `track_ttl` 未被查询或超出 `max_tracked` 时移除
+    """
+
+    def __init__(
+        self,
+        max_age: float = OCCUPANCY_MAX_AGE,
+        history_size: int = OCCUPANCY_HISTORY_SIZE,
+        concurrency: int = OCCUPANCY_CONCURRENCY,
+        sample_interval: float = OCCUPANCY_SAMPLE_INTERVAL,
+        track_ttl: float = OCCUPANCY_TRACK_TTL,
+        max_tracked: int = OCCUPANCY_MAX_TRACKED,
+    ) -> None:
+        """
+        Args:
+            max_age: 快照有效期，单位秒
+            history_size: 每个世界保留的采样数
+            concurrency: 同时请求的群组数
+            sample_interval: 后台采样间隔，单位秒
+            track_ttl: 最后一次查询后继续采样的时间，单位秒
+            max_tracked: 最多同时跟踪的群组组合数
+        """
+
+        self.max_age = max_age
+        self.history_size = history_size
+        self.concurrency = concurrency
+        self.sample_interval = sample_interval
+        self.track_ttl = track_ttl
+        self.max_tracked = max_tracked
+        self._worlds: Dict[OccupancyKey, Dict[str, WorldOccupancy]] = {}
+        self._snapshots: Dict[OccupancyKey, OccupancySnapshot] = {}
+        self._tracked: "OrderedDict[OccupancyKey, Tuple[ApiClient, float]]" = (
+            OrderedDict()
+        )
+        """群组组合 -> (最后一次查询使用的 ApiClient, 最后一次查询的时间)，按查询时间排列"""
+        self._pending: Dict[OccupancyKey, "asyncio.Task[OccupancySnapshot]"] = {}
+        """群组组合 -> 正在进行的刷新任务，相同组合的并发刷新共用一个任务"""
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    async def _fetch(
+        self,
+        client: ApiClient,
+        group_ids: Iterable[str],
+    ) -> List[GroupInstanceModel]:
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(group_id: str) -> List[GroupInstanceModel]:
+            async with sem:
+                try:
+                    return await get_group_instances(client, group_id)
+                except UnauthorizedException:
+                    raise
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to get instances of {group_id}: "
+                        f"{type(e).__name__}: {e}",
+                    )
+                    return []
+
+        results = await asyncio.gather(*(fetch(x) for x in group_ids))
+        # 同一实例可能同时属于多个群组的列表，按 location 去重
+        instances = {x.location: x for result in results for x in result}
+        return list(instances.values())
+
+    def _key(self, client: ApiClient, group_ids: Iterable[str]) -> OccupancyKey:
+        return get_viewer_key(client), tuple(sorted(set(group_ids)))
+
+    def _record(
+        self,
+        key: OccupancyKey,
+        instances: List[GroupInstanceModel],
+        now: float,
+    ) -> List[WorldOccupancy]:
+        worlds = self._worlds.setdefault(key, {})
+        grouped: Dict[str, List[GroupInstanceModel]] = {}
+        for inst in instances:
+            world_id = inst.world.get("id") or inst.location.partition(":")[0]
+            grouped.setdefault(world_id, []).append(inst)
+
+        # 本次没有实例但之前有记录的世界也追加一次采样，保持时间序列连续
+        for world_id in {*grouped, *worlds}:
+            world_instances = grouped.get(world_id, [])
+            world = worlds.get(world_id)
+            if world is None:
+                name = world_instances[0].world.get("name") or world_id
+                world = WorldOccupancy(world_id, name, self.history_size)
+                worlds[world_id] = world
+            world.instances = world_instances
+            sample = OccupancySample(int(now), world.users, len(world_instances))
+            # 两次采样间隔过短时（例如查询与后台采样接连发生）只更新最后一次采样，
+            # 使时间序列保持大致均匀的间隔
+            if world.history and now - world.history[-1].timestamp < (
+                self.sample_interval / 2
+            ):
+                world.history[-1] = sample
+            else:
+                world.history.append(sample)
+            # 整个记录期间都没有人的世界不再保留
+            if not any(x.users for x in world.history):
+                del worlds[world_id]
+
+        return sorted(
+            (worlds[x] for x in grouped if x in worlds),
+            key=lambda x: x.users,
+            reverse=True,
+        )
+
+    async def refresh(
+        self,
+        client: ApiClient,
+        group_ids: Iterable[str],
+    ) -> OccupancySnapshot:
+        """
+        立即获取群组实例并记录一次采样
+
+        Args:
+            client: ApiClient 实例
+            group_ids: 群组 ID
+
+        Returns:
+            本次获取的快照
+        """
+
+        key = self._key(client, group_ids)
+        self._track(key, client)
+        return await self._refresh(client, key)
+
+    def _refresh(
+        self,
+        client: ApiClient,
+        key: OccupancyKey,
+    ) -> "asyncio.Future[OccupancySnapshot]":
+        if not (task := self._pending.get(key)):
+
+            async def refresh() -> OccupancySnapshot:
+                try:
+                    instances = await self._fetch(client, key[1])
+                    instances.sort(key=lambda x: x.member_count, reverse=True)
+                    now = time.time()
+                    worlds = self._record(key, instances, now)
+                    snapshot = OccupancySnapshot(now, instances, worlds)
+                    if key in self._tracked:
+                        self._snapshots[key] = snapshot
+                    else:
+                        # 刷新期间组合已被移除，不保留数据
+                        self._worlds.pop(key, None)
+                    return snapshot
+                finally:
+                    del self._pending[key]
+
+            task = asyncio.create_task(refresh())
+            self._pending[key] = task
+        # 外部取消等待时不取消共用的刷新任务
+        return asyncio.shield(task)
+
+    def _track(self, key: OccupancyKey, client: ApiClient):
+        self._tracked[key] = (client, time.monotonic())
+        self._tracked.move_to_end(key)
+        while len(self._tracked) > self.max_tracked:
+            self.forget(next(iter(self._tracked)))
+
+    def forget(self, key: OccupancyKey):
+        """停止跟踪群组组合并移除其数据"""
+        self._tracked.pop(key, None)
+        self._worlds.pop(key, None)
+        self._snapshots.pop(key, None)
+
+    async def get_snapshot(
+        self,
+        client: ApiClient,
+        group_ids: Iterable[str],
+    ) -> OccupancySnapshot:
+        """
+        获取群组实例的快照，快照在有效期内时直接返回
+
+        并发的相同查询只会请求一次，不同群组组合的查询互不阻塞
+        """
+
+        key = self._key(client, group_ids)
+        self._track(key, client)
+        snapshot = self._snapshots.get(key)
+        if snapshot and time.time() - snapshot.timestamp < self.max_age:
+            return snapshot
+        return await self._refresh(client, key)
+
+    async def sample(self):
+        """刷新所有仍在跟踪期内的群组组合，移除过期的组合"""
+
+        expire_before = time.monotonic() - self.track_ttl
+        for key in [k for k, (_, t) in self._tracked.items() if t < expire_before]:
+            self.forget(key)
+
+        # 逐个组合刷新，避免同时发出过多请求
+        for key, (client, _) in list(self._tracked.items()):
+            try:
+                await self._refresh(client, key)
+            except UnauthorizedException:
+                # 账号已退出登录或登录失效，不再继续采样
+                self.forget(key)
+            except Exception as e:
+                logger.warning(f"Failed to sample occupancy: {type(e).__name__}: {e}")
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.sample_interval)
+            try:
+                await self.sample()
+            except Exception:
+                logger.exception("Failed to sample group occupancy")
+
+    def start(self):
+        if not self._task or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def peek(
+        self,
+        client: ApiClient,
+        group_ids: Iterable[str],
+    ) -> Optional[OccupancySnapshot]:
+        """只读取内存中的快照，不论是否过期"""
+        return self._snapshots.get(self._key(client, group_ids))
+
+    def world_history(
+        self,
+        client: ApiClient,
+        group_ids: Iterable[str],
+        world_id: str,
+    ) -> List[OccupancySample]:
+        """世界在这组群组中的人数采样记录，越新的越靠后"""
+        world = self._worlds.get(self._key(client, group_ids), {}).get(world_id)
+        return list(world.history) if world else []
+
+    async def busiest_instances(
+        self,
+        client: ApiClient,
+        group_ids: Iterable[str],
+        limit: int = 10,
+    ) -> List[GroupInstanceModel]:
+        """人数最多的实例"""
+        return (await self.get_snapshot(client, group_ids)).instances[:limit]
+
+    async def busiest_worlds(
+        self,
+        client: ApiClient,
+        group_ids: Iterable[str],
+        limit: int = 10,
+    ) -> List[WorldOccupancy]:
+        """人数最多的世界"""
+        return (await self.get_snapshot(client, group_ids)).worlds[:limit]
+
+
+occupancy_tracker = OccupancyTracker()
+
+
+@get_driver().on_startup
+async def _():
+    occupancy_tracker.start()
+
+
+@get_driver().on_shutdown
+async def _():
+    await occupancy_tracker.stop()
@@ -0,0 +1,268 @@
+import asyncio
+import json
+import random
+from collections.abc import Iterable
+from contextlib import suppress
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import aiohttp
+from nonebot import logger
+from pydantic import ValidationError
+from vrchatapi import ApiClient
+from vrchatapi.exceptions import UnauthorizedException
+
+from ..config import env_config
+from .cache import get_viewer_key
+from .client import get_client
+from .current_user import invalidate_current_user
+from .friend import get_all_friends
+from .notifications import NotificationStore
+from .presence import PresenceSnapshot, build_presence_snapshot
+from .types import FriendRecord, LimitedUserModel, NotificationModel
+from .utils import user_agent
+
+PIPELINE_URL = "wss://pipeline.vrchat.cloud/"
+
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 300.0
+HEARTBEAT_INTERVAL = 30.0
+
+PipelineEventHandler = Callable[[str, Any], Awaitable[None]]
+
+
+class NotLoggedInPipelineError(Exception):
+    """pipeline 鉴权失败，需要重新登录"""
+
+
+class FriendStateStore:
+    """本地好友状态，由 pipeline 事件增量更新"""
+
+    def __init__(self) -> None:
+        self.friends: Dict[str, FriendRecord] = {}
+        self.ready = False
+        """是否已通过 REST 接口完成初始化"""
+
+    def reset(self, users: Iterable[LimitedUserModel]):
+        self.friends = {x.user_id: FriendRecord.from_model(x) for x in users}
+        self.ready = True
+
+    def upsert(self, user_id: str, user: Optional[dict], **updates: Any):
+        """
+        更新好友信息
+
+        Args:
+            user_id: 好友 ID
+            user: pipeline 推送的用户数据，为 `None` 时只应用 `updates`
+            updates: 要覆盖的字段
+        """
+
+        current = self.friends.get(user_id)
+        if user:
+            try:
+                current = FriendRecord.from_model(LimitedUserModel.model_validate(user))
+            except ValidationError:
+                # 推送的用户数据不完整时，退回到只更新已有记录
+                logger.debug(f"Incomplete user payload from pipeline: {user_id}")
+
+        if current:
+            self.friends[user_id] = current.replace(**updates) if updates else current
+
+    def remove(self, user_id: str):
+        self.friends.pop(user_id, None)
+
+    def snapshot(self, previous: Optional[PresenceSnapshot] = None) -> PresenceSnapshot:
+        return build_presence_snapshot(self.friends.values(), previous)
+
+
+class PipelineClient:
+    """
+    单个账号的 VRChat pipeline websocket 消费者
+
+    连接成功后会先通过 REST 接口获取一次完整好友列表，
+    之后好友与通知的变化全部由推送事件增量更新到本地状态中
+    """
+
+    def __init__(
+        self,
+        client: ApiClient,
+        url: str = PIPELINE_URL,
+        on_event: Optional[PipelineEventHandler] = None,
+    ) -> None:
+        self.client = client
+        self.url = url
+        self.on_event = on_event
+        self.friends = FriendStateStore()
+        self.notifications = NotificationStore()
+        self.connected = False
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def auth_token(self) -> Optional[str]:
+        for cookie in self.client.rest_client.cookie_jar:
+            if cookie.name == "auth":
+                return cookie.value
+        return None
+
+    @property
+    def live(self) -> bool:
+        """本地状态是否与服务器同步，可以代替轮询"""
+        return self.connected and self.friends.ready
+
+    def handle_message(self, event_type: str, content: Any):
+        """将一条推送事件应用到本地状态"""
+
+        if event_type in ("friend-online", "friend-location"):
+            self.friends.upsert(
+                content["userId"],
+                content.get("user"),
+                location=content.get("location") or "offline",
+            )
+        elif event_type == "friend-active":
+            self.friends.upsert(
+                content["userId"],
+                content.get("user"),
+                location="offline",
+                original_status="active",
+            )
+        elif event_type == "friend-offline":
+            self.friends.upsert(
+                content["userId"],
+                None,
+                location="offline",
+                original_status="offline",
+            )
+        elif event_type in ("friend-add", "friend-update"):
+            self.friends.upsert(content["userId"], content.get("user"))
+        elif event_type == "friend-delete":
+            self.friends.remove(content["userId"])
+
+        elif event_type == "notification":
+            if isinstance(content.get("details"), str):
+                content["details"] = json.loads(content["details"] or "{}")
+            self.notifications.upsert(
+                NotificationModel.model_validate(content),
+            )
+        elif event_type == "see-notification":
+            self.notifications.mark_seen(content)
+        elif event_type == "hide-notification":
+            self.notifications.remove(content)
+        elif event_type == "clear-notification":
+            self.notifications.clear()
+
+        elif event_type == "user-update":
+            # 当前账号的信息发生变化，下次使用时重新获取
+            invalidate_current_user(get_viewer_key(self.client))
+
+    async def _seed(self):
+        self.friends.reset([x async for x in get_all_friends(self.client)])
+
+    async def _consume(self, session: aiohttp.ClientSession):
+        token = self.auth_token
+        if not token:
+            raise NotLoggedInPipelineError
+
+        async with session.ws_connect(
+            self.url,
+            params={"authToken": token},
+            heartbeat=HEARTBEAT_INTERVAL,
+        ) as ws:
+            self.connected = True
+            # 断线期间的变化无法通过推送获得，每次连接后重新获取一次完整状态
+            await self._seed()
+
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    continue
+
+                data = json.loads(msg.data)
+                if "err" in data:
+                    raise NotLoggedInPipelineError(data["err"])
+
+                event_type: str = data.get("type", "")
+                content = data.get("content")
+                if isinstance(content, str) and content[:1] in ("{", "["):
+                    content = json.loads(content)
+
+                try:
+                    self.handle_message(event_type, content)
+                except Exception:
+                    logger.exception(f"Error when handling pipeline event {event_type}")
+                    continue
+
+                if self.on_event:
+                    await self.on_event(event_type, content)
+
+    async def run(self):
+        """保持连接，断线后按指数退避重连，直到鉴权失败或被取消"""
+
+        delay = RECONNECT_MIN_DELAY
+        async with aiohttp.ClientSession(headers={"User-Agent": user_agent}) as session:
+            while True:
+                try:
+                    await self._consume(session)
+                    delay = RECONNECT_MIN_DELAY  # 正常关闭，重置退避时间
+                except (NotLoggedInPipelineError, UnauthorizedException) as e:
+                    logger.warning(f"Pipeline authentication failed, stopping: {e!r}")
+                    return
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Pipeline disconnected: {type(e).__name__}: {e}")
+                finally:
+                    self.connected = False
+
+                await asyncio.sleep(delay + random.uniform(0, delay / 2))  # noqa: S311
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    def start(self):
+        if not self._task or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+class PipelineManager:
+    """管理每个已登录账号的 `PipelineClient`"""
+
+    def __init__(self) -> None:
+        self.clients: Dict[str, PipelineClient] = {}
+
+    def get(self, session_id: str) -> Optional[PipelineClient]:
+        """获取账号的 `PipelineClient`，只有在本地状态可用时才返回"""
+        client = self.clients.get(session_id)
+        return client if client and client.live else None
+
+    async def start(self, session_id: str, **kwargs: Any) -> PipelineClient:
+        """
+        为账号启动 pipeline 连接，已存在时会先关闭旧连接
+
+        Args:
+            session_id: 用户 SessionID
+            kwargs: 传给 `PipelineClient` 的参数
+
+        Raises:
+            NotLoggedInError: 用户未登录
+        """
+
+        await self.stop(session_id)
+        kwargs.setdefault("url", env_config.vrchat_pipeline_url)
+        client = PipelineClient(await get_client(session_id), **kwargs)
+        client.start()
+        self.clients[session_id] = client
+        return client
+
+    async def stop(self, session_id: str):
+        client = self.clients.pop(session_id, None)
+        if client:
+            await client.stop()
+
+    async def stop_all(self):
+        await asyncio.gather(*(self.stop(x) for x in list(self.clients)))
+
+
+pipeline_manager = PipelineManager()
@@ -0,0 +1,127 @@
+from collections.abc import Collection, Iterable
+from typing import Dict, List, Literal, NamedTuple, Optional, Union
+
+from .location import parse_location
+from .types import FriendRecord, LimitedUserModel, NormalizedStatusType
+
+PresenceEventType = Literal["online", "location", "offline"]
+"""
+好友状态变化类型
+
+- online: 上线
+- location: 切换世界
+- offline: 下线
+"""
+
+OFFLINE_LOCATIONS = ("", "offline")
+TRAVELING_LOCATION = "traveling"
+
+
+class PresenceState(NamedTuple):
+    """单个好友在某一时刻的在线状态"""
+
+    display_name: str
+    status: NormalizedStatusType
+    location: str
+
+    @property
+    def world_key(self) -> str:
+        """用于判断是否切换了世界的键，即 location 中的世界 ID"""
+        return parse_location(self.location).world_id or self.location
+
+
+class PresenceEvent(NamedTuple):
+    """好友状态变化事件"""
+
+    type: PresenceEventType
+    user_id: str
+    display_name: str
+    old: Optional[PresenceState]
+    new: Optional[PresenceState]
+
+
+PresenceSnapshot = Dict[str, PresenceState]
+"""好友在线状态快照，键为用户 ID，只包含游戏内在线的好友"""
+
+
+def is_in_game(location: Optional[str]) -> bool:
+    """判断 location 是否表示用户正在游戏内（网页在线不算）"""
+    return location not in (None, *OFFLINE_LOCATIONS)
+
+
+def build_presence_snapshot(
+    users: Iterable[Union[LimitedUserModel, FriendRecord]],
+    previous: Optional[PresenceSnapshot] = None,
+) -> PresenceSnapshot:
+    """
+    由好友列表构建在线状态快照
+
+    正在加载世界（`traveling`）的好友会沿用上一次快照中的状态，
+    避免在两次轮询之间产生多余的切换世界事件
+
+    Args:
+        users: 好友列表
+        previous: 上一次的快照
+
+    Returns:
+        在线状态快照
+    """
+
+    snapshot: PresenceSnapshot = {}
+    for user in users:
+        location = user.location
+        if not is_in_game(location):
+            continue
+        assert location
+
+        if location == TRAVELING_LOCATION and previous and user.user_id in previous:
+            snapshot[user.user_id] = previous[user.user_id]
+            continue
+
+        snapshot[user.user_id] = PresenceState(
+            display_name=user.display_name,
+            status=user.status,
+            location=location,
+        )
+    return snapshot
+
+
+def diff_presence(
+    old: PresenceSnapshot,
+    new: PresenceSnapshot,
+    user_ids: Optional[Collection[str]] = None,
+) -> List[PresenceEvent]:
+    """
+    对比两次快照，只返回发生变化的好友
+
+    Args:
+        old: 上一次的快照
+        new: 本次的快照
+        user_ids: 只对比这些用户，为 `None` 时对比全部
+
+    Returns:
+        状态变化事件列表，按 上线、切换世界、下线 的顺序排列
+    """
+
+    old_ids = old.keys()
+    new_ids = new.keys()
+    if user_ids is not None:
+        watched = set(user_ids)
+        old_ids = old_ids & watched
+        new_ids = new_ids & watched
+
+    online = [
+        PresenceEvent("online", uid, new[uid].display_name, None, new[uid])
+        for uid in new_ids - old_ids
+    ]
+    offline = [
+        PresenceEvent("offline", uid, old[uid].display_name, old[uid], None)
+        for uid in old_ids - new_ids
+    ]
+    location = [
+        PresenceEvent("location", uid, new[uid].display_name, old[uid], new[uid])
+        for uid in new_ids & old_ids
+        if old[uid].world_key != new[uid].world_key
+        and new[uid].location != TRAVELING_LOCATION
+    ]
+    return [*online, *location, *offline]
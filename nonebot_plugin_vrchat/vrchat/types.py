@@ -1,7 +1,18 @@
 from datetime import date, datetime
-from typing import TYPE_CHECKING, Dict, List, Literal, Optional, Tuple, TypeVar
-
-from pydantic import BaseModel, Field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+    get_args,
+)
+
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.alias_generators import to_camel
 from vrchatapi.models import LimitedUserSearch
 
 from .utils import patch_api_model_append_attr
@@ -19,6 +30,7 @@ GroupPrivacyType = Literal["default", "private"]
 GroupJoinStateType = Literal["closed", "invite", "request", "open"]
 GroupMemberStatusType = Literal["inactive", "member", "requested", "invited"]
 ReleaseStatusType = Literal["public", "private", "hidden", "all"]
+FavoriteType = Literal["world", "friend", "avatar"]
 PlatfoemType = Literal
 
 NormalizedStatusType = Literal[
@@ -58,6 +70,13 @@ DEVELOPER_TRUST_TYPE_MAP: Dict[str, TrustType] = {
     "moderator": "moderator",
 }
 TRUST_TAG_PREFIX = "system_trust_"
+TRUST_TAG_LEVELS: Tuple[Tuple[str, TrustType], ...] = tuple(
+    (f"{TRUST_TAG_PREFIX}{suffix}", level)
+    for suffix, level in NORMALIZE_TRUST_TAG_MAP.items()
+)
+"""预先拼接好的信任等级 Tag，按优先级排列"""
+TRUST_RANK: Dict[TrustType, int] = {x: i for i, x in enumerate(get_args(TrustType))}
+"""信任等级 -> 排序用的整数，越大等级越高"""
 
 
 def normalize_status(
@@ -115,19 +134,30 @@ def extract_trust_level(tags: List[str], developer_type: Optional[str]) -> Trust
     if developer_type in DEVELOPER_TRUST_TYPE_MAP:
         return DEVELOPER_TRUST_TYPE_MAP[developer_type]
 
-    for suffix in NORMALIZE_TRUST_TAG_MAP:
-        if f"{TRUST_TAG_PREFIX}{suffix}" in tags:
-            return NORMALIZE_TRUST_TAG_MAP[suffix]
+    for tag, level in TRUST_TAG_LEVELS:
+        if tag in tags:
+            return level
 
     return "visitor"
 
 
+class VRChatModel(BaseModel):
+    """
+    所有 API 数据模型的基类
+
+    既可以从 API 原始 JSON（camelCase）直接解析，
+    也可以从 `vrchatapi` 模型的 `.to_dict()`（snake_case）解析
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
 # region patches
 patch_api_model_append_attr(LimitedUserSearch, "last_login", "last_login", "datetime")
 # endregion patches
 
 
-class LimitedUserModel(BaseModel):
+class LimitedUserModel(VRChatModel):
     """陌生人信息"""
 
     user_id: str = Field(alias="id")
@@ -170,7 +200,86 @@ class LimitedUserModel(BaseModel):
         return extract_trust_level(self.tags, self.developer_type)
 
 
-class Badge(BaseModel):
+class FriendRecord:
+    """
+    好友信息的紧凑表示，用于好友列表与本地好友状态
+
+    状态、信任等级与排序用的整数在创建时计算一次，之后直接读取
+    """
+
+    __slots__ = (
+        "current_avatar_thumbnail_image_url",
+        "display_name",
+        "last_login",
+        "location",
+        "original_status",
+        "status",
+        "status_description",
+        "trust",
+        "trust_rank",
+        "user_id",
+    )
+
+    def __init__(
+        self,
+        user_id: str,
+        display_name: str,
+        original_status: StatusType,
+        status_description: str,
+        location: Optional[str],
+        trust: TrustType,
+        last_login: Optional[datetime] = None,
+        current_avatar_thumbnail_image_url: Optional[str] = None,
+    ) -> None:
+        self.user_id = user_id
+        self.display_name = display_name
+        self.original_status = original_status
+        self.status_description = status_description
+        self.location = location
+        self.trust = trust
+        self.last_login = last_login
+        self.current_avatar_thumbnail_image_url = current_avatar_thumbnail_image_url
+        self.status: NormalizedStatusType = normalize_status(original_status, location)
+        self.trust_rank = TRUST_RANK[trust]
+
+    def __repr__(self) -> str:
+        return (
+            f"FriendRecord(user_id={self.user_id!r}, "
+            f"display_name={self.display_name!r}, status={self.status!r})"
+        )
+
+    @classmethod
+    def from_model(cls, user: "LimitedUserModel") -> "FriendRecord":
+        return cls(
+            user_id=user.user_id,
+            display_name=user.display_name,
+            original_status=user.original_status,
+            status_description=user.status_description,
+            location=user.location,
+            trust=user.trust,
+            last_login=user.last_login,
+            current_avatar_thumbnail_image_url=user.current_avatar_thumbnail_image_url,
+        )
+
+    def replace(self, **updates: Any) -> "FriendRecord":
+        """返回更新了部分字段的新记录，状态等派生字段会重新计算"""
+        kwargs = {
+            "user_id": self.user_id,
+            "display_name": self.display_name,
+            "original_status": self.original_status,
+            "status_description": self.status_description,
+            "location": self.location,
+            "trust": self.trust,
+            "last_login": self.last_login,
+            "current_avatar_thumbnail_image_url": (
+                self.current_avatar_thumbnail_image_url
+            ),
+        }
+        kwargs.update(updates)
+        return FriendRecord(**kwargs)
+
+
+class Badge(VRChatModel):
     """徽章"""
 
     assigned_at: Optional["datetime"] = None
@@ -183,7 +292,7 @@ class Badge(BaseModel):
     updated_at: Optional["datetime"] = None
 
 
-class UserModel(BaseModel):
+class UserModel(VRChatModel):
     """信任用户信息"""
 
     user_id: str = Field(alias="id")
@@ -248,7 +357,7 @@ class UserModel(BaseModel):
         return extract_trust_level(self.tags, self.developer_type)
 
 
-class GroupGalleryModel(BaseModel):
+class GroupGalleryModel(VRChatModel):
     """群组画廊信息"""
 
     gallery_id: str = Field(alias="id")
@@ -264,7 +373,7 @@ class GroupGalleryModel(BaseModel):
     members_only: bool = False
 
 
-class GroupMyMemberModel(BaseModel):
+class GroupMyMemberModel(VRChatModel):
     """我的群组成员信息"""
 
     my_member_id: str = Field(alias="id")
@@ -290,7 +399,7 @@ class GroupMyMemberModel(BaseModel):
     banned_at: Optional[str] = None
 
 
-class GroupRoleModel(BaseModel):
+class GroupRoleModel(VRChatModel):
     """群组角色信息"""
 
     role_id: str = Field(alias="id")
@@ -308,7 +417,7 @@ class GroupRoleModel(BaseModel):
     requires_purchase: bool = False
 
 
-class GroupModel(BaseModel):
+class GroupModel(VRChatModel):
     """群组信息"""
 
     group_id: str = Field(alias="id")
@@ -348,7 +457,7 @@ class GroupModel(BaseModel):
     badges: Optional[List[dict]] = None
 
 
-class GroupPermissionModel(BaseModel):
+class GroupPermissionModel(VRChatModel):
     """群组权限信息"""
 
     group_id: str = Field(alias="id")
@@ -359,14 +468,14 @@ class GroupPermissionModel(BaseModel):
     name: str
 
 
-class LimitedUnityPackage(BaseModel):
+class LimitedUnityPackage(VRChatModel):
     """一般 unity 相关信息"""
 
     platform: str
     unity_version: str
 
 
-class LimitedWorldModel(BaseModel):
+class LimitedWorldModel(VRChatModel):
     """一般世界信息"""
 
     world_id: str = Field(alias="id")
@@ -391,7 +500,7 @@ class LimitedWorldModel(BaseModel):
     release_status: ReleaseStatusType = "public"
 
 
-class UnityPackage(BaseModel):
+class UnityPackage(VRChatModel):
     """信任 unity 相关信息"""
 
     package_id: str = Field(alias="id")
@@ -407,7 +516,7 @@ class UnityPackage(BaseModel):
     unity_sort_number: Optional[int] = None
 
 
-class WorldModel(BaseModel):
+class WorldModel(VRChatModel):
     """信任世界信息"""
 
     world_id: str = Field(alias="id")
@@ -446,7 +555,7 @@ class WorldModel(BaseModel):
 # region Avatar Models
 
 
-class LimitedAvatarModel(BaseModel):
+class LimitedAvatarModel(VRChatModel):
     """一般头像信息"""
 
     avatar_id: str = Field(alias="id")
@@ -467,24 +576,24 @@ class LimitedAvatarModel(BaseModel):
     version: int = 0
 
 
-class AvatarModel(BaseModel):
+class AvatarModel(VRChatModel):
     """信任头像信息"""
 
     avatar_id: str = Field(alias="id")
     author_id: str
     author_name: str
-    capacity: int
     created_at: "datetime"
     description: str
     image_url: str
     name: str
-    publication_date: str
     release_status: ReleaseStatusType
     tags: List[str]
     thumbnail_image_url: str
     unity_packages: List[UnityPackage]
     updated_at: "datetime"
 
+    capacity: int = 0
+    publication_date: str = ""
     featured: bool = False
     favorites: int = 0
     heat: int = 0
@@ -497,7 +606,7 @@ class AvatarModel(BaseModel):
     preview_youtube_id: Optional[str] = None
 
 
-class AvatarStyleModel(BaseModel):
+class AvatarStyleModel(VRChatModel):
     """头像风格信息"""
 
     style_id: str = Field(alias="id")
@@ -513,7 +622,7 @@ class AvatarStyleModel(BaseModel):
 # region Instance Models
 
 
-class InstanceModel(BaseModel):
+class InstanceModel(VRChatModel):
     """实例信息"""
 
     instance_id: str = Field(alias="id")
@@ -546,7 +655,7 @@ class InstanceModel(BaseModel):
 # region Group Extended Models
 
 
-class LimitedGroupModel(BaseModel):
+class LimitedGroupModel(VRChatModel):
     """一般群组信息"""
 
     group_id: str = Field(alias="id")
@@ -569,19 +678,19 @@ class LimitedGroupModel(BaseModel):
     membership_status: Optional[str] = None
 
 
-class GroupMemberLimitedUserModel(BaseModel):
+class GroupMemberLimitedUserModel(VRChatModel):
     """群组成员中的用户信息"""
 
     member_id: str = Field(alias="id")
     current_avatar_tags: list[str] = []
-    current_avatar_thumbnail_image_url: str
+    current_avatar_thumbnail_image_url: str = ""
     display_name: str
     icon_url: str = ""
     profile_pic_override: str = ""
-    thumbnail_url: str
+    thumbnail_url: str = ""
 
 
-class GroupMemberModel(BaseModel):
+class GroupMemberModel(VRChatModel):
     """群组成员信息"""
 
     member_id: str = Field(alias="id")
@@ -606,7 +715,7 @@ class GroupMemberModel(BaseModel):
     user: GroupMemberLimitedUserModel
 
 
-class GroupAnnouncementModel(BaseModel):
+class GroupAnnouncementModel(VRChatModel):
     """群组公告信息"""
 
     announcement_id: Optional[str] = Field(None, alias="id")
@@ -621,7 +730,7 @@ class GroupAnnouncementModel(BaseModel):
     updated_at: Optional["datetime"] = None
 
 
-class GroupPostModel(BaseModel):
+class GroupPostModel(VRChatModel):
     """群组帖子信息"""
 
     post_id: str = Field(alias="id")
@@ -638,10 +747,10 @@ class GroupPostModel(BaseModel):
     updated_at: "datetime"
 
 
-class GroupInstanceModel(BaseModel):
+class GroupInstanceModel(VRChatModel):
     """群组实例信息"""
 
-    instance_id: str = Field(alias="id")
+    instance_id: str
     location: str
     member_count: int
     world: dict
@@ -659,7 +768,7 @@ class GroupInstanceModel(BaseModel):
     region: Optional[str] = None
 
 
-class GroupAuditLogEntryModel(BaseModel):
+class GroupAuditLogEntryModel(VRChatModel):
     """群组审计日志信息"""
 
     entry_id: str = Field(alias="id")
@@ -678,7 +787,7 @@ class GroupAuditLogEntryModel(BaseModel):
 # region Notification Models
 
 
-class NotificationModel(BaseModel):
+class NotificationModel(VRChatModel):
     """通知信息"""
 
     notification_id: str = Field(alias="id")
@@ -693,7 +802,7 @@ class NotificationModel(BaseModel):
     seen: bool = False
 
 
-class NotificationV2Model(BaseModel):
+class NotificationV2Model(VRChatModel):
     """V2 通知信息"""
 
     notification_id: str = Field(alias="id")
@@ -713,39 +822,50 @@ class NotificationV2Model(BaseModel):
 # region Favorite Models
 
 
-class FavoriteModel(BaseModel):
+class FavoriteModel(VRChatModel):
     """收藏信息"""
 
     favorite_id: str = Field(alias="id")
-    type: str
-    favorite_id_ref: str
-    tags: List[str]
-    created_at: "datetime"
-    updated_at: "datetime"
+    """收藏记录 ID，取消收藏时使用"""
+    target_id: str = Field(alias="favoriteId")
+    """被收藏的用户、世界或头像的 ID"""
+    type: FavoriteType
+    tags: List[str] = []
+    """所在收藏组的名称"""
 
-    group: str = ""
-    id: Optional[str] = None
 
-
-class FavoriteGroupModel(BaseModel):
+class FavoriteGroupModel(VRChatModel):
     """收藏组信息"""
 
+    favorite_group_id: str = Field(alias="id")
     owner_id: str
     name: str
     display_name: str
-    type: str
-    created_at: "datetime"
-    updated_at: "datetime"
+    type: FavoriteType
+
+    owner_display_name: str = ""
+    tags: List[str] = []
+    visibility: str = "private"
 
-    index: int = 0
-    id: Optional[str] = None
 
+class FavoriteGroupLimitsModel(VRChatModel):
+    """各类型收藏的数量限制"""
 
-class FavoriteLimitsModel(BaseModel):
+    avatar: int = 0
+    friend: int = 0
+    world: int = 0
+    vrc_plus_world: int = 0
+
+
+class FavoriteLimitsModel(VRChatModel):
     """收藏限制信息"""
 
-    total: int = 0
-    groups: int = 0
+    default_max_favorite_groups: int = 0
+    default_max_favorites_per_group: int = 0
+    max_favorite_groups: FavoriteGroupLimitsModel = FavoriteGroupLimitsModel()
+    """每种类型最多的收藏组数"""
+    max_favorites_per_group: FavoriteGroupLimitsModel = FavoriteGroupLimitsModel()
+    """每个收藏组最多的收藏数"""
 
 
 # endregion
@@ -754,35 +874,56 @@ class FavoriteLimitsModel(BaseModel):
 # region File Models
 
 
-class FileModel(BaseModel):
+class FileDataModel(VRChatModel):
+    """文件版本中某一部分（文件本体、签名或差量）的数据信息"""
+
+    category: str = "simple"
+    """上传方式，`simple` 或 `multipart`"""
+    file_name: str = ""
+    md5: Optional[str] = None
+    size_in_bytes: int = 0
+    status: str = "waiting"
+    upload_id: str = ""
+    url: str = ""
+
+
+class FileVersionModel(VRChatModel):
+    """文件版本信息"""
+
+    version: int
+    status: str
+    created_at: Optional["datetime"] = None
+    deleted: bool = False
+
+    file: Optional[FileDataModel] = None
+    signature: Optional[FileDataModel] = None
+    delta: Optional[FileDataModel] = None
+
+
+class FileModel(VRChatModel):
     """文件信息"""
 
     file_id: str = Field(alias="id")
     name: str
-    file_name: str
-    status: str
     owner_id: str
-    tags: List[str]
-    created_at: "datetime"
-    updated_at: "datetime"
-
-    file_size: Optional[int] = None
+    extension: str = ""
     mime_type: Optional[str] = None
-    version: int = 0
+    tags: List[str] = []
+    versions: List[FileVersionModel] = []
 
+    @property
+    def latest_version(self) -> Optional[FileVersionModel]:
+        return self.versions[-1] if self.versions else None
 
-class FileVersionModel(BaseModel):
-    """文件版本信息"""
 
-    version_id: str = Field(alias="id")
-    file_id: str
-    version: int
-    status: str
-    created_at: "datetime"
-    updated_at: "datetime"
+class FileUploadStatusModel(VRChatModel):
+    """分块上传状态"""
 
-    file_size: Optional[int] = None
-    download_url: Optional[str] = None
+    upload_id: str = ""
+    file_name: str = ""
+    next_part_number: int = 0
+    max_parts: int = 0
+    etags: List[str] = []
 
 
 # endregion
@@ -791,7 +932,7 @@ class FileVersionModel(BaseModel):
 # region Economy Models
 
 
-class BalanceModel(BaseModel):
+class BalanceModel(VRChatModel):
     """余额信息"""
 
     balance: int = 0
@@ -799,7 +940,7 @@ class BalanceModel(BaseModel):
     last_payout: Optional["datetime"] = None
 
 
-class EconomyAccountModel(BaseModel):
+class EconomyAccountModel(VRChatModel):
     """经济账户信息"""
 
     account_id: str = Field(alias="id")
@@ -809,7 +950,7 @@ class EconomyAccountModel(BaseModel):
     updated_at: "datetime"
 
 
-class ProductListingModel(BaseModel):
+class ProductListingModel(VRChatModel):
     """商品信息"""
 
     product_listing_id: str = Field(alias="id")
@@ -827,7 +968,7 @@ class ProductListingModel(BaseModel):
     sale_end: Optional["datetime"] = None
 
 
-class ProductPurchaseModel(BaseModel):
+class ProductPurchaseModel(VRChatModel):
     """商品购买信息"""
 
     purchase_id: str = Field(alias="id")
@@ -841,7 +982,7 @@ class ProductPurchaseModel(BaseModel):
     currency: str = ""
 
 
-class StoreModel(BaseModel):
+class StoreModel(VRChatModel):
     """商店信息"""
 
     store_id: str = Field(alias="id")
@@ -853,7 +994,7 @@ class StoreModel(BaseModel):
     shelves: List[str] = []
 
 
-class StoreShelfModel(BaseModel):
+class StoreShelfModel(VRChatModel):
     """商店货架信息"""
 
     shelf_id: str = Field(alias="id")
@@ -866,7 +1007,7 @@ class StoreShelfModel(BaseModel):
     products: List[str] = []
 
 
-class SubscriptionModel(BaseModel):
+class SubscriptionModel(VRChatModel):
     """订阅信息"""
 
     subscription_id: str = Field(alias="id")
@@ -879,7 +1020,7 @@ class SubscriptionModel(BaseModel):
     next_billing_date: Optional["datetime"] = None
 
 
-class TiliaStatusModel(BaseModel):
+class TiliaStatusModel(VRChatModel):
     """Tilia 状态信息"""
 
     user_id: str
@@ -888,7 +1029,7 @@ class TiliaStatusModel(BaseModel):
     updated_at: "datetime"
 
 
-class TokenBundleModel(BaseModel):
+class TokenBundleModel(VRChatModel):
     """代币包信息"""
 
     bundle_id: str = Field(alias="id")
@@ -907,7 +1048,7 @@ class TokenBundleModel(BaseModel):
 # region Inventory Models
 
 
-class InventoryModel(BaseModel):
+class InventoryModel(VRChatModel):
     """库存信息"""
 
     inventory_id: str = Field(alias="id")
@@ -918,7 +1059,7 @@ class InventoryModel(BaseModel):
     items: List[str] = []
 
 
-class InventoryItemModel(BaseModel):
+class InventoryItemModel(VRChatModel):
     """库存物品信息"""
 
     item_id: str = Field(alias="id")
@@ -932,7 +1073,7 @@ class InventoryItemModel(BaseModel):
     metadata: Optional[dict] = None
 
 
-class InventoryTemplateModel(BaseModel):
+class InventoryTemplateModel(VRChatModel):
     """库存模板信息"""
 
     template_id: str = Field(alias="id")
@@ -945,7 +1086,7 @@ class InventoryTemplateModel(BaseModel):
     image_url: Optional[str] = None
 
 
-class InventoryDropModel(BaseModel):
+class InventoryDropModel(VRChatModel):
     """库存掉落信息"""
 
     drop_id: str = Field(alias="id")
@@ -962,7 +1103,7 @@ class InventoryDropModel(BaseModel):
 # region User Note Models
 
 
-class UserNoteModel(BaseModel):
+class UserNoteModel(VRChatModel):
     """用户笔记信息"""
 
     note_id: str = Field(alias="id")
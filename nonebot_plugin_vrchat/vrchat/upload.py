@@ -0,0 +1,289 @@
+import asyncio
+import base64
+import hashlib
+import math
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import aiohttp
+from nonebot import logger
+from nonebot.utils import run_sync
+from vrchatapi import ApiClient
+
+from .files import (
+    FileDataType,
+    create_file_version,
+    finish_file_data_upload,
+    get_file,
+    get_file_data_upload_status,
+    start_file_data_upload,
+)
+from .types import FileDataModel, FileModel, FileVersionModel
+from .utils import user_agent
+
+HASH_CHUNK_SIZE = 1024 * 1024
+UPLOAD_PART_SIZE = 10 * 1024 * 1024
+"""分块上传时每块的大小，S3 要求除最后一块外不小于 5 MiB"""
+UPLOAD_CONCURRENCY = 4
+UPLOAD_RETRIES = 3
+
+
+class FileDigest(NamedTuple):
+    path: Path
+    size: int
+    md5: str
+    """base64 编码的 MD5，与 `Content-MD5` 头格式相同"""
+
+
+def _digest_file_sync(path: Path) -> FileDigest:
+    md5 = hashlib.md5()  # noqa: S324
+    size = 0
+    with path.open("rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            md5.update(chunk)
+            size += len(chunk)
+    return FileDigest(path, size, base64.b64encode(md5.digest()).decode())
+
+
+async def digest_file(path: Path) -> FileDigest:
+    """分块读取文件并计算 MD5 与大小，内存占用与文件大小无关"""
+    return await run_sync(_digest_file_sync)(path)
+
+
+def _read_part_sync(path: Path, offset: int, size: int) -> bytes:
+    with path.open("rb") as f:
+        f.seek(offset)
+        return f.read(size)
+
+
+class FileUploader:
+    """
+    文件版本上传流程
+
+    1. 计算文件与签名的 MD5，创建新版本（或沿用 MD5 相同且尚未完成的版本）
+    2. 按服务器指定的方式上传文件与签名，分块上传时多个分块并发上传
+    3. 通知服务器上传完成
+
+    中断后再次调用会通过 `get_file_data_upload_status` 跳过已上传的分块
+    """
+
+    def __init__(
+        self,
+        client: ApiClient,
+        part_size: int = UPLOAD_PART_SIZE,
+        concurrency: int = UPLOAD_CONCURRENCY,
+    ) -> None:
+        """
+        Args:
+            client: ApiClient 实例
+            part_size: 分块大小，单位字节
+            concurrency: 同时上传的分块数，内存占用约为 `part_size * concurrency`
+        """
+
+        self.client = client
+        self.part_size = part_size
+        self.concurrency = concurrency
+
+    async def _put(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        data: bytes,
+        content_md5: Optional[str] = None,
+    ) -> str:
+        headers = {"Content-Type": "application/octet-stream"}
+        if content_md5:
+            headers["Content-MD5"] = content_md5
+
+        attempt = 1
+        while True:
+            try:
+                async with session.put(url, data=data, headers=headers) as resp:
+                    resp.raise_for_status()
+                    return resp.headers.get("ETag", "")
+            except aiohttp.ClientError as e:
+                if attempt >= UPLOAD_RETRIES:
+                    raise
+                logger.warning(f"Upload attempt {attempt} failed: {e!r}")
+                await asyncio.sleep(2**attempt)
+                attempt += 1
+
+    async def _upload_simple(
+        self,
+        session: aiohttp.ClientSession,
+        file_id: str,
+        version: int,
+        file_type: FileDataType,
+        digest: FileDigest,
+    ):
+        url = await start_file_data_upload(self.client, file_id, version, file_type)
+        data = await run_sync(_read_part_sync)(digest.path, 0, digest.size)
+        await self._put(session, url, data, digest.md5)
+        await finish_file_data_upload(self.client, file_id, version, file_type)
+
+    async def _upload_multipart(
+        self,
+        session: aiohttp.ClientSession,
+        file_id: str,
+        version: int,
+        file_type: FileDataType,
+        digest: FileDigest,
+    ):
+        total = max(math.ceil(digest.size / self.part_size), 1)
+        etags: Dict[int, str] = {}
+
+        # 断点续传：之前已完成的连续分块不再上传
+        status = await get_file_data_upload_status(
+            self.client,
+            file_id,
+            version,
+            file_type,
+        )
+        done = min(max(status.next_part_number - 1, 0), len(status.etags))
+        etags.update({i + 1: etag for i, etag in enumerate(status.etags[:done])})
+        if done:
+            logger.info(f"Resuming {file_type} upload of {file_id} at part {done + 1}")
+
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def upload_part(part_number: int):
+            async with sem:
+                url = await start_file_data_upload(
+                    self.client,
+                    file_id,
+                    version,
+                    file_type,
+                    part_number,
+                )
+                data = await run_sync(_read_part_sync)(
+                    digest.path,
+                    (part_number - 1) * self.part_size,
+                    self.part_size,
+                )
+                etags[part_number] = await self._put(session, url, data)
+
+        await asyncio.gather(
+            *(upload_part(x) for x in range(1, total + 1) if x not in etags),
+        )
+        await finish_file_data_upload(
+            self.client,
+            file_id,
+            version,
+            file_type,
+            [etags[x] for x in range(1, total + 1)],
+        )
+
+    async def _upload_data(
+        self,
+        session: aiohttp.ClientSession,
+        file_id: str,
+        version: int,
+        file_type: FileDataType,
+        data: Optional[FileDataModel],
+        digest: FileDigest,
+    ):
+        if data and data.status == "complete":
+            return
+        if data and data.category == "multipart":
+            await self._upload_multipart(session, file_id, version, file_type, digest)
+        else:
+            await self._upload_simple(session, file_id, version, file_type, digest)
+
+    async def _prepare_version(
+        self,
+        file_id: str,
+        file: FileDigest,
+        signature: FileDigest,
+    ) -> FileVersionModel:
+        latest = (await get_file(self.client, file_id)).latest_version
+        if (
+            latest
+            and latest.status == "waiting"
+            and latest.file
+            and latest.file.md5 == file.md5
+            and latest.signature
+            and latest.signature.md5 == signature.md5
+        ):
+            logger.info(f"Resuming unfinished version {latest.version} of {file_id}")
+            return latest
+
+        created = await create_file_version(
+            self.client,
+            file_id,
+            {
+                "file_md5": file.md5,
+                "file_size_in_bytes": file.size,
+                "signature_md5": signature.md5,
+                "signature_size_in_bytes": signature.size,
+            },
+        )
+        if not created.latest_version:
+            raise ValueError(f"No version created for {file_id}")
+        return created.latest_version
+
+    async def upload(
+        self,
+        file_id: str,
+        file_path: Path,
+        signature_path: Path,
+    ) -> FileModel:
+        """
+        为已有文件上传一个新版本
+
+        Args:
+            file_id: 文件 ID，通过 `create_file` 创建
+            file_path: 要上传的文件，如头像或世界的资源包
+            signature_path: 文件的 librsync 签名文件，需要预先生成
+
+        Returns:
+            上传完成后的文件信息
+        """
+
+        file, signature = await asyncio.gather(
+            digest_file(file_path),
+            digest_file(signature_path),
+        )
+        version = await self._prepare_version(file_id, file, signature)
+
+        async with aiohttp.ClientSession(headers={"User-Agent": user_agent}) as session:
+            parts: List[Tuple[FileDataType, Optional[FileDataModel], FileDigest]] = [
+                ("file", version.file, file),
+                ("signature", version.signature, signature),
+            ]
+            for file_type, data, digest in parts:
+                await self._upload_data(
+                    session,
+                    file_id,
+                    version.version,
+                    file_type,
+                    data,
+                    digest,
+                )
+
+        return await get_file(self.client, file_id)
+
+
+async def upload_file_version(
+    client: ApiClient,
+    file_id: str,
+    file_path: Path,
+    signature_path: Path,
+    part_size: int = UPLOAD_PART_SIZE,
+    concurrency: int = UPLOAD_CONCURRENCY,
+) -> FileModel:
+    """
+    为已有文件上传一个新版本，见 `FileUploader`
+
+    Args:
+        client: ApiClient 实例
+        file_id: 文件 ID
+        file_path: 要上传的文件
+        signature_path: 文件的 librsync 签名文件
+        part_size: 分块大小，单位字节
+        concurrency: 同时上传的分块数
+    """
+    return await FileUploader(client, part_size, concurrency).upload(
+        file_id,
+        file_path,
+        signature_path,
+    )
@@ -1,11 +1,13 @@
-from collections.abc import AsyncIterable, Awaitable
-from typing import TYPE_CHECKING, Optional, cast
+from collections.abc import AsyncIterable, Awaitable, Iterable
+from typing import TYPE_CHECKING, Dict, Optional, cast
 from typing_extensions import Unpack
 
 from nonebot.utils import run_sync
 from vrchatapi import ApiClient, Group, UsersApi
 from vrchatapi.models import Feedback, User
 
+from .cache import EntityCache, search_cache
+from .name_index import user_index
 from .types import (
     GroupInstanceModel,
     GroupModel,
@@ -15,10 +17,13 @@ from .types import (
     UserNoteModel,
 )
 from .utils import (
+    HasDataProtocol,
     IterPFKwargs,
     auto_parse_iterator_return,
+    auto_parse_raw_return,
     auto_parse_return,
     iter_pagination_func,
+    parse_raw_models,
     user_agent,
 )
 
@@ -45,20 +50,26 @@ def search_users(
     client.user_agent = user_agent
     api = UsersApi(client)
 
-    @auto_parse_iterator_return(LimitedUserModel)
     @iter_pagination_func(**pf_kwargs)
+    @search_cache.cached_page("users", keyword)
+    @user_index.ingest_page(client)
     async def iterator(page_size: int, offset: int):
-        result = await cast(
-            "Awaitable[list]",
-            run_sync(api.search_users)(search=keyword, n=page_size, offset=offset),
+        resp = await cast(
+            "Awaitable[HasDataProtocol]",
+            run_sync(api.search_users)(
+                search=keyword,
+                n=page_size,
+                offset=offset,
+                _preload_content=False,
+            ),
         )
-        return result or []
+        return parse_raw_models(LimitedUserModel, resp)
 
     return iterator()
 
 
-@auto_parse_return(UserModel)
-async def get_user(client: ApiClient, user_id: str) -> User:
+@auto_parse_raw_return(UserModel)
+async def get_user(client: ApiClient, user_id: str) -> HasDataProtocol:
     """
     通过用户 ID 获取用户信息
 
@@ -72,11 +83,61 @@ async def get_user(client: ApiClient, user_id: str) -> User:
     client.user_agent = user_agent
     api = UsersApi(client)
     return await cast(
-        "Awaitable[User]",
-        run_sync(api.get_user)(user_id=user_id),
+        "Awaitable[HasDataProtocol]",
+        run_sync(api.get_user)(user_id=user_id, _preload_content=False),
     )
 
 
+GET_USERS_CONCURRENCY = 8
+
+user_cache: EntityCache[UserModel] = EntityCache(get_user, ttl=300, maxsize=2048)
+"""用户信息缓存，按查看者区分"""
+
+
+def invalidate_user(user_id: str):
+    """从所有查看者的缓存中移除用户"""
+    user_cache.invalidate(user_id)
+
+
+async def get_user_cached(client: ApiClient, user_id: str) -> UserModel:
+    """
+    通过用户 ID 获取用户信息，优先使用缓存
+
+    Args:
+        client: ApiClient 实例
+        user_id: 用户 ID
+
+    Returns:
+        用户信息
+
+    Raises:
+        NotFoundException: 用户不存在，此结果同样会被缓存
+    """
+    return await user_cache.get(client, user_id)
+
+
+async def get_users(
+    client: ApiClient,
+    user_ids: Iterable[str],
+    concurrency: int = GET_USERS_CONCURRENCY,
+) -> Dict[str, UserModel]:
+    """
+    批量获取用户信息，优先使用缓存，未命中的用户并发请求
+
+    Args:
+        client: ApiClient 实例
+        user_ids: 用户 ID，重复的 ID 只会请求一次
+        concurrency: 最大并发请求数
+
+    Returns:
+        用户 ID -> 用户信息，按传入顺序排列，不存在或获取失败的用户不会出现在结果中
+
+    Raises:
+        UnauthorizedException: 登录已失效
+    """
+    return await user_cache.get_many(client, user_ids, concurrency)
+
+
 @auto_parse_return(UserModel)
 async def get_user_by_name(client: ApiClient, username: str) -> User:
     """
@@ -118,13 +179,15 @@ async def update_user(
 
     client.user_agent = user_agent
     api = UsersApi(client)
-    return await cast(
+    result = await cast(
         "Awaitable[User]",
         run_sync(api.update_user)(
             user_id=user_id,
             update_user_request=UpdateUserRequest(**update_user_request),
         ),
     )
+    invalidate_user(user_id)
+    return result
 
 
 async def add_tags(
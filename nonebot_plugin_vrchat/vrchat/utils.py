@@ -1,10 +1,11 @@
 import asyncio
 from collections.abc import AsyncIterable, Awaitable
-from functools import wraps
+from functools import lru_cache, wraps
 from typing import (
     Any,
     Callable,
     Generic,
+    List,
     Optional,
     Protocol,
     TypedDict,
@@ -12,7 +13,7 @@ from typing import (
 )
 from typing_extensions import NotRequired, ParamSpec, Unpack
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 T = TypeVar("T")
 TM = TypeVar("TM", bound=BaseModel)
@@ -24,6 +25,13 @@ class HasToDictProtocol(Protocol):
     def to_dict(self) -> dict: ...
 
 
+class HasDataProtocol(Protocol):
+    """代表调用 API 时传入 `_preload_content=False` 返回的 `urllib3.HTTPResponse`"""
+
+    @property
+    def data(self) -> bytes: ...
+
+
 class PaginationCallable(Protocol, Generic[T]):
     async def __call__(self, page_size: int, offset: int) -> Optional[list[T]]: ...
 
@@ -47,6 +55,8 @@ class IterPFKwargs(TypedDict):
     """每次查询后的延迟时间，单位秒，默认为 `0`"""
     max_size: NotRequired[int]
     """最大结果数，返回的结果数永远不会超过这个值，默认为 `0`，即不限制"""
+    prefetch: NotRequired[bool]
+    """是否在返回本页结果的同时请求下一页，默认为 `False`"""
 
 
 TModelClass = TypeVar("TModelClass", bound=ApiModelClass)
@@ -65,32 +75,51 @@ def iter_pagination_func(**kwargs: Unpack[IterPFKwargs]):
     offset = kwargs.get("offset", 0)
     delay = kwargs.get("delay", 0.0)
     max_size = kwargs.get("max_size", 0)
+    prefetch = kwargs.get("prefetch", False)
     has_max_size = max_size > 0
 
     def decorator(func: PaginationCallable[T]) -> Callable[[], AsyncIterable[T]]:
+        async def fetch(now_offset: int, wait: float = 0) -> Optional[list[T]]:
+            if wait:
+                await asyncio.sleep(wait)
+            # 如果声明了最大结果数，
+            # 那么确保 本次查询的数量 不会超过 剩余的最大结果数
+            now_page_size = (
+                min(page_size, max_size - now_offset) if has_max_size else page_size
+            )
+            return await func(now_page_size, now_offset)
+
         @wraps(func)
         async def wrapper():
             now_offset = offset
-            while True:
-                # 如果声明了最大结果数，
-                # 那么确保 本次查询的数量 不会超过 剩余的最大结果数
-                now_page_size = (
-                    min(page_size, max_size - now_offset) if has_max_size else page_size
-                )
-
-                resp = await func(now_page_size, now_offset)
-                if not resp:
-                    break  # 本页无结果，结束迭代
-
-                for x in resp:
-                    yield x  # 将返回列表中的结果逐个返回
-
-                now_offset += page_size
-                if max_size > 0 and now_offset >= max_size:
-                    break  # 达到最大结果数，结束迭代
-
-                if delay:
-                    await asyncio.sleep(delay)
+            next_task: Optional["asyncio.Task[Optional[list[T]]]"] = None
+            try:
+                while True:
+                    if next_task:
+                        resp = await next_task
+                        next_task = None
+                    else:
+                        resp = await fetch(now_offset)
+                    if not resp:
+                        break  # 本页无结果，结束迭代
+
+                    now_offset += page_size
+                    has_next = not (has_max_size and now_offset >= max_size)
+                    if has_next and prefetch:
+                        # 在调用方处理本页结果时提前请求下一页
+                        next_task = asyncio.create_task(fetch(now_offset, delay))
+
+                    for x in resp:
+                        yield x  # 将返回列表中的结果逐个返回
+
+                    if not has_next:
+                        break  # 达到最大结果数，结束迭代
+
+                    if delay and not prefetch:
+                        await asyncio.sleep(delay)
+            finally:
+                if next_task:
+                    next_task.cancel()
 
         return wrapper
 
@@ -141,6 +170,61 @@ def auto_parse_return(model: type[TM]):
     return decorator
 
 
+@lru_cache(maxsize=None)
+def _list_adapter(model: type[TM]) -> TypeAdapter[List[TM]]:
+    return TypeAdapter(List[model])
+
+
+def parse_raw_model(model: type[TM], resp: HasDataProtocol) -> TM:
+    """
+    直接使用 pydantic 解析 API 返回的原始 JSON，
+    跳过 `vrchatapi` 的模型反序列化与 `.to_dict()`
+
+    Args:
+        model: 要解析为的 `BaseModel` 类型
+        resp: 调用 API 时传入 `_preload_content=False` 得到的响应
+
+    Returns:
+        解析后的模型
+    """
+    return model.model_validate_json(resp.data)
+
+
+def parse_raw_models(model: type[TM], resp: HasDataProtocol) -> List[TM]:
+    """
+    同 `parse_raw_model`，用于返回值为列表的 API
+
+    Args:
+        model: 列表元素要解析为的 `BaseModel` 类型
+        resp: 调用 API 时传入 `_preload_content=False` 得到的响应
+
+    Returns:
+        解析后的模型列表
+    """
+    return _list_adapter(model).validate_json(resp.data)
+
+
+def auto_parse_raw_return(model: type[TM]):
+    """
+    用于装饰返回 `HasDataProtocol` 的异步函数，
+    使用 `parse_raw_model` 将响应体一次性解析为指定的 `BaseModel`
+
+    Args:
+        model: 要解析为的 `BaseModel` 类型
+    """
+
+    def decorator(
+        func: Callable[P, Awaitable[HasDataProtocol]],
+    ) -> Callable[P, Awaitable[TM]]:
+        @wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs):
+            return parse_raw_model(model, await func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
 def patch_api_model_append_attr(
     cls: type[TModelClass],
     attr: str,
@@ -1,17 +1,21 @@
-from collections.abc import AsyncIterable, Awaitable
-from typing import cast
+from collections.abc import AsyncIterable, Awaitable, Iterable
+from typing import Dict, cast
 from typing_extensions import Unpack
 
 from nonebot.utils import run_sync
 from vrchatapi import ApiClient, WorldsApi
 from vrchatapi.models import World
 
+from .cache import EntityCache, search_cache
+from .name_index import world_index
 from .types import LimitedWorldModel, WorldModel
 from .utils import (
+    HasDataProtocol,
     IterPFKwargs,
-    auto_parse_iterator_return,
+    auto_parse_raw_return,
     auto_parse_return,
     iter_pagination_func,
+    parse_raw_models,
     user_agent,
 )
 
@@ -35,20 +39,26 @@ def search_worlds(
     client.user_agent = user_agent
     api = WorldsApi(client)
 
-    @auto_parse_iterator_return(LimitedWorldModel)
     @iter_pagination_func(**pf_kwargs)
+    @search_cache.cached_page("worlds", keyword)
+    @world_index.ingest_page(client)
     async def iterator(page_size: int, offset: int):
-        result = await cast(
-            "Awaitable[list]",
-            run_sync(api.search_worlds)(search=keyword, n=page_size, offset=offset),
+        resp = await cast(
+            "Awaitable[HasDataProtocol]",
+            run_sync(api.search_worlds)(
+                search=keyword,
+                n=page_size,
+                offset=offset,
+                _preload_content=False,
+            ),
         )
-        return result or []
+        return parse_raw_models(LimitedWorldModel, resp)
 
     return iterator()
 
 
-@auto_parse_return(WorldModel)
-async def get_world(client: ApiClient, world_id: str) -> World:
+@auto_parse_raw_return(WorldModel)
+async def get_world(client: ApiClient, world_id: str) -> HasDataProtocol:
     """
     通过世界 ID 获取世界信息
 
@@ -62,11 +72,53 @@ async def get_world(client: ApiClient, world_id: str) -> World:
     client.user_agent = user_agent
     api = WorldsApi(client)
     return await cast(
-        "Awaitable[World]",
-        run_sync(api.get_world)(world_id=world_id),
+        "Awaitable[HasDataProtocol]",
+        run_sync(api.get_world)(world_id=world_id, _preload_content=False),
     )
 
 
+GET_WORLDS_CONCURRENCY = 8
+
+world_cache: EntityCache[WorldModel] = EntityCache(get_world, ttl=600, maxsize=2048)
+"""世界信息缓存，在查询位置、最近访问等需要世界名称的地方共享"""
+
+
+async def get_world_cached(client: ApiClient, world_id: str) -> WorldModel:
+    """
+    通过世界 ID 获取世界信息，优先使用缓存
+
+    Args:
+        client: ApiClient 实例
+        world_id: 世界 ID
+
+    Returns:
+        世界信息
+
+    Raises:
+        NotFoundException: 世界不存在，此结果同样会被缓存
+    """
+    return await world_cache.get(client, world_id)
+
+
+async def get_worlds(
+    client: ApiClient,
+    world_ids: Iterable[str],
+    concurrency: int = GET_WORLDS_CONCURRENCY,
+) -> Dict[str, WorldModel]:
+    """
+    批量获取世界信息，优先使用缓存，未命中的世界并发请求
+
+    Args:
+        client: ApiClient 实例
+        world_ids: 世界 ID，重复的 ID 只会请求一次
+        concurrency: 最大并发请求数
+
+    Returns:
+        世界 ID -> 世界信息，按传入顺序排列，不存在或获取失败的世界不会出现在结果中
+    """
+    return await world_cache.get_many(client, world_ids, concurrency)
+
+
 @auto_parse_return(WorldModel)
 async def create_world(
     client: ApiClient,
@@ -115,13 +167,15 @@ async def update_world(
 
     client.user_agent = user_agent
     api = WorldsApi(client)
-    return await cast(
+    result = await cast(
         "Awaitable[World]",
         run_sync(api.update_world)(
             world_id=world_id,
             update_world_request=UpdateWorldRequest(**update_world_request),
         ),
     )
+    world_cache.invalidate(world_id)
+    return result
 
 
 async def delete_world(client: ApiClient, world_id: str) -> bool:
@@ -138,6 +192,7 @@ async def delete_world(client: ApiClient, world_id: str) -> bool:
     client.user_agent = user_agent
     api = WorldsApi(client)
     await run_sync(api.delete_world)(world_id=world_id)
+    world_cache.invalidate(world_id)
     return True
 
 